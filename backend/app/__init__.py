@@ -1,23 +1,38 @@
 """FastAPI application factory."""
 
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
 from app.api.routes.superlinked import router as superlinked_router
 from app.api.routes.cv_analysis import router as cv_analysis_router
+from app.llm_client import LLMClientManager
+from app.superlinked_client import SuperlinkedClientManager
+from app.utils import PDFExtractor, RequestSizeLimitMiddleware
 
 # Configure logging
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release pooled HTTP clients and worker processes on shutdown."""
+    yield
+    await LLMClientManager().aclose()
+    await SuperlinkedClientManager().aclose()
+    PDFExtractor.shutdown()
+
+
 def create_app() -> FastAPI:
     """Create and configure FastAPI application."""
     app = FastAPI(
         title=settings.APP_NAME,
         version=settings.APP_VERSION,
-        debug=settings.DEBUG
+        debug=settings.DEBUG,
+        lifespan=lifespan
     )
     
     # Add CORS middleware
@@ -29,6 +44,9 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
+    # Reject oversized uploads while the body is received, before it is fully spooled
+    app.add_middleware(RequestSizeLimitMiddleware, max_bytes=settings.MAX_UPLOAD_REQUEST_SIZE)
+    
     # Include routers
     app.include_router(
         superlinked_router,
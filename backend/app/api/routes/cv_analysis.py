@@ -3,6 +3,7 @@
 import logging
 from typing import Optional
 from fastapi import APIRouter, UploadFile, File, Form, Body, HTTPException
+from fastapi.responses import StreamingResponse
 
 from scripts.linkedin_scraper import LinkedInJobScraper
 from scripts.github_scraper import GitHubProfileScraper
@@ -12,6 +13,7 @@ from app.schemas import (
     CourseRecommendationResponse,
     LearningResource,
     CandidateProfileResponse,
+    ChatWithCandidateRequest,
 )
 from app.config import get_settings
 from app.llm_client import LLMOperations, LLMClientManager
@@ -19,8 +21,10 @@ from app.utils import (
     CVValidator,
     PDFExtractor,
     LLMResponseFormatter,
+    UploadReader,
     generate_profile_id,
 )
+from app.streaming import format_sse
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -43,6 +47,26 @@ except Exception as e:
 # In-memory storage for candidate profiles (use database in production)
 candidate_profiles: dict = {}
 
+# Keep proxies from buffering server-sent events
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _non_cv_analysis(cv_error: str) -> dict:
+    """Build the empty analysis returned when the upload is not a CV."""
+    return {
+        "analysis_results": {
+            "match_score": {"value": 0, "unit": "percentage"},
+            "target_role": "",
+            "strong_skills": [],
+            "strong_skills_comment": "",
+            "skills_to_develop": [],
+            "skills_to_develop_comment": ""
+        },
+        "suggested_learning_resources": [],
+        "is_cv": False,
+        "error_message": cv_error
+    }
+
 
 # ===== CV ANALYSIS ENDPOINTS =====
 
@@ -57,23 +81,12 @@ async def analyze_cv(
     if llm_ops is None:
         raise HTTPException(status_code=500, detail="LLM service is not available")
     
-    cv_content = await PDFExtractor.extract_text_from_pdf(await cv_file.read())
+    pdf_bytes, pdf_digest = await UploadReader.read_pdf(cv_file)
+    cv_content = await PDFExtractor.extract_text_from_pdf(pdf_bytes, pdf_digest)
     is_cv, cv_error = CVValidator.is_cv_document(cv_content)
     
     if not is_cv:
-        return {
-            "analysis_results": {
-                "match_score": {"value": 0, "unit": "percentage"},
-                "target_role": "",
-                "strong_skills": [],
-                "strong_skills_comment": "",
-                "skills_to_develop": [],
-                "skills_to_develop_comment": ""
-            },
-            "suggested_learning_resources": [],
-            "is_cv": False,
-            "error_message": cv_error
-        }
+        return _non_cv_analysis(cv_error)
     
     result = await llm_ops.analyze_cv_with_job(cv_content, job_posting, SYSTEM_PROMPT)
     result["is_cv"] = True
@@ -83,6 +96,41 @@ async def analyze_cv(
     return result
 
 
+@router.post("/analyze/stream")
+async def analyze_cv_stream(
+    cv_file: UploadFile = File(...),
+    job_posting: str = Form(...)
+) -> StreamingResponse:
+    """
+    Analyze CV against job posting, streamed as server-sent events.
+    
+    Emits a `field` event per analysis field as soon as the model has
+    finished writing it, then a `result` event with the full analysis.
+    """
+    if llm_ops is None:
+        raise HTTPException(status_code=500, detail="LLM service is not available")
+    
+    pdf_bytes, pdf_digest = await UploadReader.read_pdf(cv_file)
+    cv_content = await PDFExtractor.extract_text_from_pdf(pdf_bytes, pdf_digest)
+    is_cv, cv_error = CVValidator.is_cv_document(cv_content)
+    
+    async def events():
+        if not is_cv:
+            yield format_sse("result", _non_cv_analysis(cv_error))
+            return
+        try:
+            async for event, data in llm_ops.stream_analyze_cv_with_job(
+                cv_content, job_posting, SYSTEM_PROMPT
+            ):
+                if event == "result":
+                    data = {**data, "is_cv": True, "error_message": None}
+                yield format_sse(event, data)
+        except HTTPException as e:
+            yield format_sse("error", {"status_code": e.status_code, "detail": e.detail})
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 @router.post("/analyze_linkedin")
 async def analyze_linkedin(
     cv_file: UploadFile = File(...),
@@ -92,7 +140,8 @@ async def analyze_linkedin(
     if llm_ops is None:
         raise HTTPException(status_code=500, detail="LLM service is not available")
     
-    cv_content = await PDFExtractor.extract_text_from_pdf(await cv_file.read())
+    pdf_bytes, pdf_digest = await UploadReader.read_pdf(cv_file)
+    cv_content = await PDFExtractor.extract_text_from_pdf(pdf_bytes, pdf_digest)
     is_cv, cv_error = CVValidator.is_cv_document(cv_content)
     
     if not is_cv:
@@ -180,10 +229,12 @@ async def analyze_candidate(
     
     if cv_file:
         try:
-            cv_content = await cv_file.read()
-            cv_text = await PDFExtractor.extract_text_from_pdf(cv_content)
+            pdf_bytes, pdf_digest = await UploadReader.read_pdf(cv_file)
+            cv_text = await PDFExtractor.extract_text_from_pdf(pdf_bytes, pdf_digest)
             profile_data['cv_text'] = cv_text
             logger.info("Successfully extracted CV text")
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Failed to read CV: {e}")
             raise HTTPException(status_code=400, detail=f"Failed to read CV: {str(e)}")
@@ -231,3 +282,64 @@ async def analyze_candidate(
         linkedin_data=linkedin_data,
         cv_text=cv_text[:500] + "..." if len(cv_text) > 500 else cv_text
     )
+
+
+@router.post("/chat_with_candidate/stream")
+async def chat_with_candidate_stream(payload: ChatWithCandidateRequest) -> StreamingResponse:
+    """
+    Chat with a candidate AI profile, streamed as server-sent events.
+    
+    Emits `token` events as the answer is generated and a final `done`
+    event with the full answer.
+    """
+    if llm_ops is None:
+        raise HTTPException(status_code=500, detail="LLM service is not available")
+    
+    profile = candidate_profiles.get(payload.profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Candidate profile not found")
+    
+    context = LLMResponseFormatter.build_candidate_context(
+        profile.get('cv_text', ''),
+        profile.get('github_data'),
+        profile.get('linkedin_data')
+    )
+    
+    async def events():
+        answer = []
+        try:
+            async for token in llm_ops.stream_chat_with_candidate(context, payload.question):
+                answer.append(token)
+                yield format_sse("token", {"text": token})
+        except HTTPException as e:
+            yield format_sse("error", {"status_code": e.status_code, "detail": e.detail})
+            return
+        yield format_sse("done", {"answer": "".join(answer).strip(), "sources": []})
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+# ===== CACHE ENDPOINTS =====
+
+@router.get("/cache/stats")
+async def cache_stats() -> dict:
+    """Return hit/miss counters for the CV analysis response cache."""
+    if llm_ops is None or llm_ops.cache is None:
+        return {"enabled": False}
+    
+    return {"enabled": True, **(await llm_ops.cache.stats())}
+
+
+@router.get("/cache/pdf_stats")
+async def pdf_cache_stats() -> dict:
+    """Return hit/miss counters for the extracted PDF text cache."""
+    return await PDFExtractor.cache_stats()
+
+
+@router.get("/coalescing/stats")
+async def coalescing_stats() -> dict:
+    """Return counters for collapsed duplicate LLM calls."""
+    if llm_ops is None:
+        return {"enabled": False}
+    
+    return {"enabled": True, **llm_ops.coalescer.stats()}
@@ -1,24 +1,48 @@
 """Superlinked job search API endpoints."""
 
 import logging
+import time
 import httpx
 from typing import Optional
 from fastapi import APIRouter, HTTPException, UploadFile, File
 
+from app.cache import make_cache_key
+from app.coalesce import SingleFlight
 from app.config import get_settings
+from app.cv_digest import CVDigester
+from app.hybrid import HybridSearch
+from app.nlq_cache import NLQParseCache
+from app.option_index import get_option_hints
+from app.query_parser import FastPath
 from app.schemas import SearchRequest
-from app.utils import PDFExtractor, parse_request_dict
+from app.search_cache import SearchResultCache
+from app.superlinked_client import SuperlinkedClientManager
+from app.utils import PDFExtractor, UploadReader, normalize_search_payload
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+sl_client = SuperlinkedClientManager()
+nlq_cache = NLQParseCache()
+result_cache = SearchResultCache()
+hybrid_search = HybridSearch()
+
+# Collapses identical searches that arrive while one is already running
+search_coalescer = SingleFlight("Superlinked search")
+
 
 @router.post("/search")
 async def search_jobs(request: SearchRequest) -> dict:
     """
     Search jobs using natural language query.
     
+    Identical searches are served from the result cache until the next
+    ingest, concurrent ones share a single upstream call, and repeated or
+    simple queries use cached or rule-parsed parameters instead of the LLM.
+    In hybrid mode, BM25 matches on titles, summaries and skills are fused
+    with the vector results, so exact terms are not lost.
+    
     Args:
         request: Search request with query and optional filters
         
@@ -29,25 +53,50 @@ async def search_jobs(request: SearchRequest) -> dict:
         HTTPException: If search fails
     """
     try:
-        payload = parse_request_dict(request.model_dump())
+        payload = normalize_search_payload(request.model_dump())
+        mode = payload.pop('mode', None) or settings.SEARCH_MODE
+        hybrid = mode == "hybrid" and hybrid_search.available()
+        if mode == "hybrid" and not hybrid:
+            logger.warning("Hybrid search requested but no lexical index is available; using vector search")
+        limit = payload.get('limit', settings.DEFAULT_SEARCH_LIMIT)
+        if hybrid:
+            # More vector candidates so that fusion can reorder them
+            payload['limit'] = max(limit, settings.HYBRID_CANDIDATES)
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{settings.SUPERLINKED_URL}/api/v1/search/job",
-                json=payload,
+        async def post_search() -> dict:
+            # A cached NLQ extraction or a confident local parse lets Superlinked skip its LLM call
+            structured = await nlq_cache.lookup("job", payload) or FastPath.structured_payload(payload)
+            response = await sl_client.post(
+                "/api/v1/search/job",
+                json=structured or get_option_hints().with_hints(payload),
                 headers={"x-include-metadata": "true"},
-                timeout=settings.SUPERLINKED_TIMEOUT
+                timeout=settings.SUPERLINKED_SEARCH_TIMEOUT
             )
             
             if response.status_code == 200:
                 logger.info(f"Job search completed successfully")
-                return response.json()
+                result = response.json()
+                if structured is None:
+                    await nlq_cache.store("job", payload, result)
+                return result
             else:
                 logger.error(f"Superlinked search failed with status {response.status_code}")
                 raise HTTPException(
                     status_code=500,
                     detail=f"Search failed with status code {response.status_code}"
                 )
+        
+        start = time.perf_counter()
+        cache_key = result_cache.key("job", payload)
+        result = await result_cache.get(cache_key)
+        if result is None:
+            result = await search_coalescer.do(make_cache_key("search", payload), post_search)
+            await result_cache.set(cache_key, result)
+        
+        if hybrid:
+            vector_ms = (time.perf_counter() - start) * 1000
+            return await hybrid_search.fuse(result, payload, limit, vector_ms)
+        return result
     
     except httpx.RequestError as e:
         logger.error(f"Connection error to Superlinked: {e}")
@@ -73,6 +122,9 @@ async def search_jobs_by_cv(
     similar_description_weight: Optional[float] = None,
     title: Optional[str] = None,
     similar_title_weight: Optional[float] = None,
+    skills: Optional[list[str]] = None,
+    skills_weight: Optional[float] = None,
+    similar_skills_weight: Optional[float] = None,
     states_include: Optional[list[str]] = None,
     states_exclude: Optional[list[str]] = None,
     search_cities_include: Optional[list[str]] = None,
@@ -106,13 +158,15 @@ async def search_jobs_by_cv(
     """
     try:
         # Extract text from PDF
-        cv_content = await PDFExtractor.extract_text_from_pdf(await cv_file.read())
+        pdf_bytes, pdf_digest = await UploadReader.read_pdf(cv_file)
+        cv_content = await PDFExtractor.extract_text_from_pdf(pdf_bytes, pdf_digest)
         
         logger.info(f"Extracted {len(cv_content)} characters from CV")
         
-        # Build request payload
+        # Build request payload; the compact digest keeps the NLQ prompt short
+        natural_query = CVDigester.to_query(cv_content) if settings.CV_DIGEST_ENABLED else cv_content
         payload = {
-            'natural_query': cv_content,
+            'natural_query': natural_query,
             'limit': min(limit, settings.MAX_SEARCH_LIMIT)
         }
         
@@ -124,6 +178,9 @@ async def search_jobs_by_cv(
             'similar_description_weight': similar_description_weight,
             'title': title,
             'similar_title_weight': similar_title_weight,
+            'skills': skills,
+            'skills_weight': skills_weight,
+            'similar_skills_weight': similar_skills_weight,
             'states_include': states_include,
             'states_exclude': states_exclude,
             'search_cities_include': search_cities_include,
@@ -147,18 +204,24 @@ async def search_jobs_by_cv(
             if value is not None:
                 payload[key] = value
         
-        # Send to Superlinked
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{settings.SUPERLINKED_URL}/api/v1/search/cv-job",
-                json=payload,
+        # Send to Superlinked, sharing the call with identical in-flight uploads
+        async def post_search() -> dict:
+            # A cached NLQ extraction lets Superlinked skip its LLM call; otherwise the
+            # pruned company, city and skill options are hinted as for /search
+            structured = await nlq_cache.lookup("cv-job", payload)
+            response = await sl_client.post(
+                "/api/v1/search/cv-job",
+                json=structured or get_option_hints().with_hints(payload),
                 headers={"x-include-metadata": "true"},
-                timeout=settings.SUPERLINKED_TIMEOUT
+                timeout=settings.SUPERLINKED_CV_SEARCH_TIMEOUT
             )
             
             if response.status_code == 200:
                 logger.info(f"CV-based job search completed successfully")
-                return response.json()
+                result = response.json()
+                if structured is None:
+                    await nlq_cache.store("cv-job", payload, result)
+                return result
             else:
                 logger.error(
                     f"Superlinked CV search failed with status {response.status_code}: {response.text}"
@@ -167,10 +230,51 @@ async def search_jobs_by_cv(
                     status_code=500,
                     detail=f"CV search failed with status code {response.status_code}"
                 )
+        
+        cache_key = result_cache.key("cv-job", payload)
+        cached = await result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        result = await search_coalescer.do(make_cache_key("cv-search", payload), post_search)
+        await result_cache.set(cache_key, result)
+        return result
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"CV-based search error: {e}")
         raise HTTPException(
             status_code=500,
             detail=f"Internal error: {str(e)}"
         )
+
+
+@router.get("/coalescing/stats")
+async def coalescing_stats() -> dict:
+    """Return counters for collapsed duplicate searches."""
+    return search_coalescer.stats()
+
+
+@router.get("/nlq_cache/stats")
+async def nlq_cache_stats() -> dict:
+    """Return NLQ parse cache statistics."""
+    return await nlq_cache.stats()
+
+
+@router.get("/nlq_fast_path/stats")
+async def nlq_fast_path_stats() -> dict:
+    """Return how many searches were parsed without the LLM."""
+    return FastPath.stats()
+
+
+@router.get("/search_cache/stats")
+async def search_cache_stats() -> dict:
+    """Return search result cache statistics."""
+    return await result_cache.stats()
+
+
+@router.get("/pool/stats")
+async def pool_stats() -> dict:
+    """Return Superlinked connection pool usage."""
+    return sl_client.stats()
@@ -0,0 +1,274 @@
+"""Content-addressed response caches with pluggable storage backends."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    Build a stable SHA-256 key from JSON-serializable parts.
+
+    Args:
+        *parts: Values identifying the cached computation
+
+    Returns:
+        Hex digest of the canonical JSON encoding
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CacheBackend(ABC):
+    """Byte-oriented key/value store with LRU + TTL eviction and a size cap."""
+
+    # Whether calls may block and should run off the event loop
+    blocking: bool = False
+
+    def __init__(self, ttl: float, max_bytes: int):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.evictions = 0
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    @abstractmethod
+    def size(self) -> tuple[int, int]:
+        """Return (entry count, total bytes)."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process cache backed by an ordered dict."""
+
+    def __init__(self, ttl: float, max_bytes: int):
+        super().__init__(ttl, max_bytes)
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.time() + self.ttl, value)
+            self._total_bytes += len(value)
+            while self._total_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def size(self) -> tuple[int, int]:
+        return len(self._entries), self._total_bytes
+
+    def _remove(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self._total_bytes -= len(value)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """SQLite file cache shared across workers and restarts."""
+
+    blocking = True
+
+    def __init__(self, path: str, ttl: float, max_bytes: int):
+        super().__init__(ttl, max_bytes)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)")
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, size, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, value, len(value), now + self.ttl, now)
+                )
+                self._conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+                self._evict_over_budget()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+
+    def size(self) -> tuple[int, int]:
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache"
+            ).fetchone()
+        return count, total
+
+    def _evict_over_budget(self) -> None:
+        """Drop least recently used rows until the byte budget is met."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        doomed = []
+        for key, size in self._conn.execute("SELECT key, size FROM cache ORDER BY accessed_at"):
+            doomed.append((key,))
+            freed += size
+            if total - freed <= self.max_bytes:
+                break
+        self._conn.executemany("DELETE FROM cache WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+
+
+class ResponseCache:
+    """JSON response cache with hit/miss accounting."""
+
+    def __init__(self, backend: CacheBackend, name: str = "cache"):
+        self.backend = backend
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for `key`, or None on a miss."""
+        try:
+            raw = await self._call(self.backend.get, key)
+        except Exception as e:
+            logger.warning(f"{self.name} lookup failed: {e}")
+            raw = None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    async def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value under `key`."""
+        raw = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        try:
+            await self._call(self.backend.set, key, raw)
+        except Exception as e:
+            logger.warning(f"{self.name} store failed: {e}")
+
+    async def stats(self) -> dict:
+        """Return hit/miss counters and current occupancy."""
+        entries, total_bytes = await self._call(self.backend.size)
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.backend.evictions,
+            "entries": entries,
+            "bytes": total_bytes,
+            "max_bytes": self.backend.max_bytes,
+        }
+
+    async def _call(self, fn, *args):
+        if self.backend.blocking:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+
+def build_cache(
+    backend: str,
+    ttl: float,
+    max_bytes: int,
+    path: Optional[str] = None,
+    name: str = "cache"
+) -> Optional[ResponseCache]:
+    """
+    Create a response cache from configuration values.
+
+    Args:
+        backend: "memory", "sqlite" or "none"
+        ttl: Entry lifetime in seconds
+        max_bytes: Total size cap in bytes
+        path: SQLite file path (sqlite backend only)
+        name: Label used in logs
+
+    Returns:
+        Configured cache, or None if caching is disabled
+    """
+    backend = backend.lower()
+    if backend == "none":
+        return None
+    if backend == "sqlite":
+        if not path:
+            raise ValueError("SQLite cache backend requires a path")
+        store: CacheBackend = SQLiteCacheBackend(path, ttl, max_bytes)
+    elif backend == "memory":
+        store = MemoryCacheBackend(ttl, max_bytes)
+    else:
+        raise ValueError(f"Unknown cache backend: {backend}")
+    logger.info(f"{name} initialized with {type(store).__name__}")
+    return ResponseCache(store, name=name)
@@ -0,0 +1,66 @@
+"""Single-flight coalescing of identical in-flight requests."""
+
+import asyncio
+import copy
+import logging
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls that share a key onto one upstream call.
+
+    The first caller for a key starts the work; callers arriving while it is
+    still running await the same future. The upstream call is shielded, so a
+    disconnecting client does not cancel it for the other waiters.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.calls = 0
+        self.executions = 0
+        self.collapsed = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `fn` once per key among concurrent callers.
+
+        Args:
+            key: Normalized request identity
+            fn: Zero-argument coroutine function performing the upstream call
+
+        Returns:
+            Result of the shared call (followers receive a deep copy)
+        """
+        self.calls += 1
+        future = self._inflight.get(key)
+        if future is None:
+            self.executions += 1
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+            return await asyncio.shield(future)
+
+        self.collapsed += 1
+        logger.debug(f"{self.name}: joined in-flight call")
+        result = await asyncio.shield(future)
+        return copy.deepcopy(result)
+
+    def stats(self) -> dict:
+        """Return call counters."""
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "collapsed": self.collapsed,
+            "in_flight": len(self._inflight),
+        }
+
+    def _forget(self, key: str, done: asyncio.Future) -> None:
+        if self._inflight.get(key) is done:
+            del self._inflight[key]
+        # Mark the outcome as retrieved even if every waiter went away
+        if not done.cancelled():
+            done.exception()
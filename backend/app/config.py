@@ -23,6 +23,61 @@ class Settings(BaseModel):
     # Superlinked Configuration
     SUPERLINKED_URL: str = os.getenv("SUPERLINKED_URL", "http://superlinked:8080")
     SUPERLINKED_TIMEOUT: float = float(os.getenv("SUPERLINKED_TIMEOUT", "60.0"))
+    SUPERLINKED_SEARCH_TIMEOUT: float = float(os.getenv("SUPERLINKED_SEARCH_TIMEOUT", str(SUPERLINKED_TIMEOUT)))
+    SUPERLINKED_CV_SEARCH_TIMEOUT: float = float(os.getenv("SUPERLINKED_CV_SEARCH_TIMEOUT", str(SUPERLINKED_TIMEOUT)))
+    SUPERLINKED_MAX_CONNECTIONS: int = int(os.getenv("SUPERLINKED_MAX_CONNECTIONS", "64"))
+    SUPERLINKED_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("SUPERLINKED_MAX_KEEPALIVE_CONNECTIONS", "32"))
+    SUPERLINKED_KEEPALIVE_EXPIRY: float = float(os.getenv("SUPERLINKED_KEEPALIVE_EXPIRY", "30.0"))
+    SUPERLINKED_HTTP2: bool = os.getenv("SUPERLINKED_HTTP2", "false").lower() == "true"
+    
+    # NLQ Parse Cache Configuration
+    NLQ_CACHE_BACKEND: str = os.getenv("NLQ_CACHE_BACKEND", "memory")  # memory, sqlite or none
+    NLQ_CACHE_PATH: str = os.getenv("NLQ_CACHE_PATH", "cache/nlq_params.sqlite3")
+    NLQ_CACHE_TTL: int = int(os.getenv("NLQ_CACHE_TTL", str(7 * 24 * 60 * 60)))
+    NLQ_CACHE_MAX_BYTES: int = int(os.getenv("NLQ_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+    NLQ_PROMPT_PATH: str = os.getenv(
+        "NLQ_PROMPT_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "superlinked_app", "nlq.py")
+    )
+    NLQ_PROMPT_VERSION: str = os.getenv("NLQ_PROMPT_VERSION", "")  # overrides the prompt hash
+    
+    # Search Result Cache Configuration
+    SEARCH_CACHE_BACKEND: str = os.getenv("SEARCH_CACHE_BACKEND", "memory")  # memory, sqlite or none
+    SEARCH_CACHE_PATH: str = os.getenv("SEARCH_CACHE_PATH", "cache/search_results.sqlite3")
+    SEARCH_CACHE_TTL: int = int(os.getenv("SEARCH_CACHE_TTL", str(60 * 60)))
+    SEARCH_CACHE_MAX_BYTES: int = int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    # Written by the Superlinked server on every ingest (shared volume)
+    INDEX_GENERATION_PATH: str = os.getenv("INDEX_GENERATION_PATH", "state/index_generation")
+    
+    # Hybrid Search Configuration
+    SEARCH_MODE: str = os.getenv("SEARCH_MODE", "vector")  # default mode: vector or hybrid
+    # BM25 index written by the Superlinked server on every ingest (shared volume)
+    LEXICAL_INDEX_PATH: str = os.getenv("LEXICAL_INDEX_PATH", "state/lexical")
+    HYBRID_CANDIDATES: int = int(os.getenv("HYBRID_CANDIDATES", "50"))
+    HYBRID_RRF_K: int = 60
+    
+    # NLQ Fast Path Configuration
+    NLQ_FAST_PATH_ENABLED: bool = os.getenv("NLQ_FAST_PATH_ENABLED", "true").lower() == "true"
+    NLQ_FAST_PATH_MIN_CONFIDENCE: float = float(os.getenv("NLQ_FAST_PATH_MIN_CONFIDENCE", "0.85"))
+    # Must match the Superlinked server (SKILLS_SPACE_SIZE > 0): parsed skills are also sent
+    # as the `skills` param, which ranks jobs by skill overlap
+    SKILLS_SPACE_ENABLED: bool = os.getenv("SKILLS_SPACE_ENABLED", "true").lower() == "true"
+    
+    # NLQ Option Hints Configuration
+    # Must match the Superlinked server: longer option lists are left out of its NLQ prompt
+    NLQ_MAX_FILTER_OPTIONS: int = int(os.getenv("NLQ_MAX_FILTER_OPTIONS", "50"))
+    NLQ_OPTION_CANDIDATES: int = 5
+    NLQ_OPTION_MIN_SIMILARITY: float = 0.75
+    
+    # CV Digest Configuration
+    CV_DIGEST_ENABLED: bool = os.getenv("CV_DIGEST_ENABLED", "true").lower() == "true"
+    CV_DIGEST_MAX_SKILLS: int = 30
+    CV_DIGEST_SUMMARY_CHARS: int = 400
+    CV_DIGEST_FALLBACK_CHARS: int = 2000
+    JOB_SCHEMA_PATH: str = os.getenv(
+        "JOB_SCHEMA_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "schema.json")
+    )
     
     # Request Configuration
     DEFAULT_SEARCH_LIMIT: int = 25
@@ -32,11 +87,34 @@ class Settings(BaseModel):
     # File Upload Configuration
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
     ALLOWED_FILE_TYPES: list[str] = ["application/pdf"]
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024
+    # Whole multipart request cap: one file plus form-field overhead
+    MAX_UPLOAD_REQUEST_SIZE: int = MAX_FILE_SIZE + 64 * 1024
+    
+    # PDF Extraction Configuration
+    PDF_MAX_WORKERS: int = int(os.getenv("PDF_MAX_WORKERS", "2"))
+    PDF_MAX_PAGES: int = int(os.getenv("PDF_MAX_PAGES", "20"))
+    PDF_EXTRACTION_TIMEOUT: float = float(os.getenv("PDF_EXTRACTION_TIMEOUT", "15.0"))
+    PDF_TEXT_CACHE_BACKEND: str = os.getenv("PDF_TEXT_CACHE_BACKEND", "memory")  # memory, sqlite or none
+    PDF_TEXT_CACHE_PATH: str = os.getenv("PDF_TEXT_CACHE_PATH", "cache/pdf_text.sqlite3")
+    PDF_TEXT_CACHE_TTL: int = int(os.getenv("PDF_TEXT_CACHE_TTL", str(24 * 60 * 60)))
+    PDF_TEXT_CACHE_MAX_BYTES: int = int(os.getenv("PDF_TEXT_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
     
     # LLM Configuration
     LLM_TEMPERATURE: float = 0.7
     LLM_COURSE_TEMPERATURE: float = 0.4
     MAX_TOKENS: int = 800
+    LLM_TIMEOUT: float = float(os.getenv("LLM_TIMEOUT", "60.0"))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+    LLM_MAX_CONNECTIONS: int = int(os.getenv("LLM_MAX_CONNECTIONS", "32"))
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "16"))
+    LLM_KEEPALIVE_EXPIRY: float = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "30.0"))
+    
+    # LLM Response Cache Configuration
+    LLM_CACHE_BACKEND: str = os.getenv("LLM_CACHE_BACKEND", "memory")  # memory, sqlite or none
+    LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", "cache/llm_responses.sqlite3")
+    LLM_CACHE_TTL: int = int(os.getenv("LLM_CACHE_TTL", str(24 * 60 * 60)))
+    LLM_CACHE_MAX_BYTES: int = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
     
     # CV Analysis Configuration
     CV_MIN_LENGTH: int = 200
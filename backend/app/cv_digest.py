@@ -0,0 +1,256 @@
+"""Compact CV digest used as the NLQ input for CV-based job search."""
+
+import re
+from datetime import date
+from typing import Optional
+
+from app.config import get_settings
+from app.vocabulary import get_skill_matcher
+
+settings = get_settings()
+
+# Canonical section name -> headings that introduce it
+SECTION_HEADINGS = {
+    "summary": ["summary", "profile", "professional summary", "about me", "objective", "career objective"],
+    "experience": [
+        "experience", "work experience", "professional experience", "employment",
+        "employment history", "work history", "career history",
+    ],
+    "skills": [
+        "skills", "technical skills", "core skills", "key skills", "core competencies",
+        "competencies", "technologies", "tech stack", "tools",
+    ],
+    "education": ["education", "academic background", "qualifications"],
+    "projects": ["projects", "personal projects", "selected projects"],
+    "certifications": ["certifications", "certificates", "licenses & certifications", "courses"],
+}
+_HEADING_TO_SECTION = {
+    heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings
+}
+
+TITLE_KEYWORDS = (
+    "engineer", "developer", "analyst", "scientist", "architect", "manager", "consultant",
+    "programmer", "administrator", "designer", "researcher", "specialist", "intern", "lead",
+)
+SENIOR_MARKERS = ("senior", "sr.", "lead", "principal", "staff", "head of", "manager", "director")
+JUNIOR_MARKERS = ("junior", "jr.", "intern", "graduate", "trainee", "entry level", "apprentice")
+
+_MONTH_NUMBERS = {
+    month: number for number, month in enumerate(
+        ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1
+    )
+}
+_MONTHS = "|".join(_MONTH_NUMBERS)
+_DATE_RANGE = re.compile(
+    rf"(?:(?P<m1>{_MONTHS})[a-z]*\.?\s+|(?P<n1>\d{{1,2}})/)?(?P<y1>(?:19|20)\d{{2}})"
+    rf"\s*(?:-|–|—|to)\s*"
+    rf"(?:(?:(?P<m2>{_MONTHS})[a-z]*\.?\s+|(?P<n2>\d{{1,2}})/)?(?P<y2>(?:19|20)\d{{2}})|(?P<open>present|current|now|today))",
+    re.IGNORECASE
+)
+_YEARS_STATED = re.compile(r"(\d{1,2})\+?\s*(?:years|yrs)(?:\s+of)?\s+(?:\w+\s+){0,3}?experience", re.IGNORECASE)
+_TITLE_SEPARATORS = re.compile(r"\s+(?:at|@)\s+|\s*[|,(•·]\s*|\s+[-–—]\s+")
+
+
+def detect_sections(text: str) -> dict[str, str]:
+    """
+    Split CV text into sections by recognizing heading lines.
+
+    Args:
+        text: Extracted CV text
+
+    Returns:
+        Mapping of canonical section name to its text; text before the
+        first heading is stored under "header"
+    """
+    sections: dict[str, list[str]] = {"header": []}
+    current = "header"
+    for line in text.splitlines():
+        stripped = line.strip()
+        key = stripped.rstrip(":").strip().casefold()
+        if len(key.split()) <= 4 and key in _HEADING_TO_SECTION:
+            current = _HEADING_TO_SECTION[key]
+            sections.setdefault(current, [])
+            continue
+        if stripped:
+            sections.setdefault(current, []).append(stripped)
+    return {name: "\n".join(lines) for name, lines in sections.items() if lines}
+
+
+def _month_index(month: Optional[str], number: Optional[str], default: int) -> int:
+    if month:
+        return _MONTH_NUMBERS[month[:3].lower()]
+    if number and 1 <= int(number) <= 12:
+        return int(number)
+    return default
+
+
+def estimate_years_of_experience(text: str) -> Optional[float]:
+    """
+    Estimate total years of experience from date ranges, merging overlaps.
+
+    Falls back to an explicitly stated "N years of experience".
+
+    Args:
+        text: Experience section (or whole CV) text
+
+    Returns:
+        Years of experience, or None if no evidence was found
+    """
+    spans = []
+    for match in _DATE_RANGE.finditer(text):
+        start, end = _date_span(match)
+        if start <= end:
+            spans.append((start, end))
+
+    if spans:
+        spans.sort()
+        months = 0
+        current_start, current_end = spans[0]
+        for start, end in spans[1:]:
+            if start > current_end:
+                months += current_end - current_start
+                current_start, current_end = start, end
+            else:
+                current_end = max(current_end, end)
+        months += current_end - current_start
+        return round(months / 12, 1)
+
+    stated = [int(m.group(1)) for m in _YEARS_STATED.finditer(text)]
+    return float(max(stated)) if stated else None
+
+
+def _title_candidate(line: str) -> Optional[str]:
+    candidate = _TITLE_SEPARATORS.split(line, maxsplit=1)[0].strip(" -–—:")
+    lowered = candidate.casefold()
+    if (
+        0 < len(candidate.split()) <= 6
+        and any(re.search(rf"\b{keyword}\b", lowered) for keyword in TITLE_KEYWORDS)
+    ):
+        return candidate
+    return None
+
+
+def _date_span(match: re.Match) -> tuple[int, int]:
+    start = int(match["y1"]) * 12 + _month_index(match["m1"], match["n1"], 1)
+    if match["open"]:
+        today = date.today()
+        return start, today.year * 12 + today.month
+    return start, int(match["y2"]) * 12 + _month_index(match["m2"], match["n2"], 12)
+
+
+def find_recent_title(sections: dict[str, str]) -> Optional[str]:
+    """
+    Return the most recent job title.
+
+    In the experience section each title is paired with the first date
+    range that follows it and the one with the latest dates wins, so both
+    newest-first and oldest-first CVs work. Without dates, the first
+    title-like line of the experience section, header or summary is used.
+
+    Args:
+        sections: Output of detect_sections
+
+    Returns:
+        Job title, or None if none was recognized
+    """
+    dated: list[tuple[tuple[int, int], str]] = []
+    title = None
+    for line in sections.get("experience", "").splitlines():
+        title = _title_candidate(line) or title
+        match = _DATE_RANGE.search(line)
+        if match and title:
+            end, start = _date_span(match)[::-1]
+            dated.append(((end, start), title))
+            title = None
+    if dated:
+        return max(dated, key=lambda item: item[0])[1]
+
+    for name in ("experience", "header", "summary"):
+        for line in sections.get(name, "").splitlines():
+            candidate = _title_candidate(line)
+            if candidate:
+                return candidate
+    return None
+
+
+def estimate_seniority(title: Optional[str], years: Optional[float]) -> Optional[str]:
+    """
+    Map title markers or years of experience onto the dataset's job levels.
+
+    Args:
+        title: Most recent job title
+        years: Estimated years of experience
+
+    Returns:
+        "Mid Senior", "Associate" or None if unknown
+    """
+    lowered = (title or "").casefold()
+    if any(marker in lowered for marker in SENIOR_MARKERS):
+        return "Mid Senior"
+    if any(marker in lowered for marker in JUNIOR_MARKERS):
+        return "Associate"
+    if years is None:
+        return None
+    return "Mid Senior" if years >= 3 else "Associate"
+
+
+class CVDigester:
+    """Utility class that condenses a CV into a short NLQ input."""
+
+    @staticmethod
+    def digest(text: str) -> dict:
+        """
+        Extract the search-relevant facts from a CV.
+
+        Args:
+            text: Extracted CV text
+
+        Returns:
+            Dictionary with title, seniority, years_of_experience, skills,
+            summary and the detected section names
+        """
+        sections = detect_sections(text)
+        title = find_recent_title(sections)
+        years = estimate_years_of_experience(sections.get("experience") or text)
+        summary = " ".join(sections.get("summary", "").split())
+        return {
+            "title": title,
+            "seniority": estimate_seniority(title, years),
+            "years_of_experience": years,
+            "skills": get_skill_matcher().find(text),
+            "summary": summary[:settings.CV_DIGEST_SUMMARY_CHARS],
+            "sections": [name for name in sections if name != "header"],
+        }
+
+    @staticmethod
+    def to_query(text: str) -> str:
+        """
+        Build the compact natural query for the cv-job search.
+
+        Falls back to the beginning of the raw text when nothing useful
+        could be extracted.
+
+        Args:
+            text: Extracted CV text
+
+        Returns:
+            Digest text to send as `natural_query`
+        """
+        digest = CVDigester.digest(text)
+        lines = []
+        if digest["title"]:
+            lines.append(f"Most recent title: {digest['title']}")
+        if digest["seniority"]:
+            experience = (
+                f" ({digest['years_of_experience']:g} years of experience)"
+                if digest["years_of_experience"] is not None else ""
+            )
+            lines.append(f"Seniority: {digest['seniority']}{experience}")
+        if digest["skills"]:
+            lines.append(f"Skills: {', '.join(digest['skills'][:settings.CV_DIGEST_MAX_SKILLS])}")
+        if digest["summary"]:
+            lines.append(f"Summary: {digest['summary']}")
+
+        if not digest["title"] and not digest["skills"]:
+            return " ".join(text.split())[:settings.CV_DIGEST_FALLBACK_CHARS]
+        return "\n".join(lines)
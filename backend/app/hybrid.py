@@ -0,0 +1,177 @@
+"""Hybrid search: BM25 keyword matches fused with Superlinked vector results."""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from app.config import get_settings
+from app.lexical_index import LexicalIndex
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Filter param prefix -> stored field and the single-valued field it falls back to,
+# matching the operators of superlinked_app/filters.py
+FILTER_FIELDS = {
+    "states": ("states", "state"),
+    "search_cities": ("search_cities", "search_city"),
+    "search_countries": ("search_countries", "search_country"),
+    "companies": ("company", None),
+    "job_levels": ("job_level", None),
+    "job_types": ("job_type", None),
+    "job_categories": ("job_category", None),
+    "job_skills": ("job_skills", None),
+}
+
+
+def field_values(fields: dict, name: str, fallback: Optional[str]) -> set:
+    """Values of a stored field as a set, using the fallback field when it is empty."""
+    value = fields.get(name)
+    if not value and fallback:
+        value = fields.get(fallback)
+    if isinstance(value, list):
+        return set(value)
+    return {value} if value else set()
+
+
+def build_filter(params: dict):
+    """
+    Build a predicate applying the include/exclude filters of a search.
+
+    Args:
+        params: Search parameters (explicit or extracted by the NLQ)
+
+    Returns:
+        Function of a document's stored fields, or None without filters
+    """
+    conditions = []
+    for prefix, (name, fallback) in FILTER_FIELDS.items():
+        for suffix, include in (("_include", True), ("_exclude", False)):
+            wanted = params.get(prefix + suffix)
+            if wanted:
+                conditions.append((name, fallback, set(wanted), include))
+    if not conditions:
+        return None
+
+    def accept(fields: dict) -> bool:
+        return all(
+            bool(field_values(fields, name, fallback) & wanted) == include
+            for name, fallback, wanted, include in conditions
+        )
+
+    return accept
+
+
+def lexical_query_text(payload: dict, params: dict) -> str:
+    """The user's own words, so exact terms like "Kafka" or "C#" are matched."""
+    parts = [payload.get("natural_query") or ""]
+    if not parts[0]:
+        parts += [params.get("title") or "", params.get("description") or ""]
+    parts += params.get("skills") or []
+    return " ".join(part for part in parts if part)
+
+
+def reciprocal_rank_fusion(rankings: list[list[str]], k: int) -> dict[str, float]:
+    """
+    Fuse ranked id lists with reciprocal rank fusion.
+
+    Args:
+        rankings: Ids per retriever, best first
+        k: RRF constant damping the weight of the top ranks
+
+    Returns:
+        Fused score per id
+    """
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, entry_id in enumerate(ranking, start=1):
+            scores[entry_id] = scores.get(entry_id, 0.0) + 1.0 / (k + rank)
+    return scores
+
+
+class HybridSearch:
+    """Adds a BM25 leg to Superlinked search results and fuses both rankings."""
+
+    def __init__(self, index: Optional[LexicalIndex] = None):
+        self.index = index or LexicalIndex(settings.LEXICAL_INDEX_PATH)
+
+    def available(self) -> bool:
+        """Whether the lexical index has been written by the Superlinked server."""
+        return self.index.available()
+
+    async def fuse(self, result: dict, payload: dict, limit: int, vector_ms: Optional[float] = None) -> dict:
+        """
+        Fuse a Superlinked search result with BM25 matches of the same search.
+
+        The BM25 leg applies the filters Superlinked used, including those the
+        NLQ extracted, so fused results respect them as well.
+
+        Args:
+            result: Superlinked response (not modified; it may be cached)
+            payload: Search payload sent to Superlinked
+            limit: Number of entries to return
+            vector_ms: Time the vector leg took, reported next to the lexical one
+
+        Returns:
+            Response with fused entries and lexical timings in `metadata.hybrid`
+        """
+        metadata = result.get("metadata") or {}
+        params = {**payload, **(metadata.get("search_params") or {})}
+        text = lexical_query_text(payload, params)
+
+        start = time.perf_counter()
+        hits = await asyncio.to_thread(
+            self.index.search, text, settings.HYBRID_CANDIDATES, build_filter(params)
+        ) if text else []
+        lexical_ms = (time.perf_counter() - start) * 1000
+
+        entries = {entry["id"]: entry for entry in result.get("entries", [])}
+        lexical = {hit["id"]: hit for hit in hits}
+        vector_ranking = list(entries)
+        lexical_ranking = list(lexical)
+        fused = reciprocal_rank_fusion([vector_ranking, lexical_ranking], settings.HYBRID_RRF_K)
+        # A keyword-only posting is not among the vector candidates, so its vector score is
+        # at most the last candidate's; it is shown with that score rather than none (0%)
+        vector_scores = [
+            entry["metadata"]["score"] for entry in entries.values()
+            if isinstance((entry.get("metadata") or {}).get("score"), (int, float))
+        ]
+        score_bound = min(vector_scores) if vector_scores else None
+
+        fused_entries = []
+        for entry_id in sorted(fused, key=fused.get, reverse=True)[:limit]:
+            if entry_id in entries:
+                entry = dict(entries[entry_id])
+                entry_metadata = dict(entry.get("metadata") or {})
+            else:
+                # Found by keywords only; it has no vector score
+                entry = {"id": entry_id, "fields": lexical[entry_id]["fields"]}
+                entry_metadata = {"score": score_bound, "score_estimated": True} if score_bound is not None else {}
+            entry_metadata["rrf_score"] = round(fused[entry_id], 6)
+            if entry_id in lexical:
+                entry_metadata["lexical_score"] = round(lexical[entry_id]["score"], 4)
+                entry_metadata["lexical_rank"] = lexical_ranking.index(entry_id) + 1
+            if entry_id in entries:
+                entry_metadata["vector_rank"] = vector_ranking.index(entry_id) + 1
+            entry["metadata"] = entry_metadata
+            fused_entries.append(entry)
+
+        logger.info(
+            f"Hybrid search: {len(hits)} lexical and {len(entries)} vector candidates, "
+            f"lexical leg {lexical_ms:.1f}ms"
+        )
+        return {
+            **result,
+            "entries": fused_entries,
+            "metadata": {
+                **metadata,
+                "hybrid": {
+                    "vector_ms": round(vector_ms, 2) if vector_ms is not None else None,
+                    "lexical_ms": round(lexical_ms, 2),
+                    "lexical_candidates": len(hits),
+                    "vector_candidates": len(entries),
+                    "rrf_k": settings.HYBRID_RRF_K,
+                },
+            },
+        }
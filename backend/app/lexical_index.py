@@ -0,0 +1,223 @@
+"""Read side of the BM25 index the Superlinked server writes on every ingest."""
+
+import fcntl
+import hashlib
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import time
+from typing import Callable, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+MANIFEST = "segments.json"
+
+
+def hash64(values: list[str]) -> np.ndarray:
+    """8-byte term/id hashes, as superlinked_app/lexical.py computes them."""
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "little") for value in values],
+        dtype=np.uint64,
+    )
+
+
+class LexicalSegment:
+    """One immutable segment: memory-mapped postings, lengths and stored documents."""
+
+    def __init__(self, directory: str):
+        self.terms = self._load(directory, "terms.u64", np.uint64)
+        self.offsets = self._load(directory, "offsets.u64", np.uint64)
+        self.postings_doc = self._load(directory, "postings_doc.u32", np.uint32)
+        self.postings_tf = self._load(directory, "postings_tf.u16", np.uint16)
+        self.doc_len = self._load(directory, "doc_len.u32", np.uint32)
+        self.ids = self._load(directory, "ids.u64", np.uint64)
+        self.docs_offsets = self._load(directory, "docs_offsets.u64", np.uint64)
+        # Ids this segment removes from older segments (tombstones)
+        self.deletes = self._load(directory, "deletes.u64", np.uint64, optional=True)
+        with open(os.path.join(directory, "docs.jsonl"), "rb") as f:
+            self.docs = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b""
+        # Documents repeated by a newer segment are cleared by LexicalIndex
+        self.live = np.ones(len(self.ids), dtype=bool)
+
+    @staticmethod
+    def _load(directory: str, name: str, dtype, optional: bool = False) -> np.ndarray:
+        path = os.path.join(directory, name)
+        if (optional and not os.path.exists(path)) or os.path.getsize(path) == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r")
+
+    def postings(self, term: int) -> tuple[np.ndarray, np.ndarray]:
+        """Document numbers and weighted term frequencies of one term hash."""
+        i = int(np.searchsorted(self.terms, np.uint64(term)))
+        if i == len(self.terms) or self.terms[i] != term:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        start, end = int(self.offsets[i]), int(self.offsets[i + 1])
+        return self.postings_doc[start:end].astype(np.int64), self.postings_tf[start:end].astype(np.float64)
+
+    def document(self, doc: int) -> dict:
+        return json.loads(self.docs[int(self.docs_offsets[doc]):int(self.docs_offsets[doc + 1])])
+
+
+class LexicalIndex:
+    """
+    BM25 search over job titles, summaries and skills.
+
+    The index is written by superlinked_app/lexical.py to the volume shared
+    with the Superlinked server; segments are memory-mapped and reloaded when
+    its segment list changes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.segments: list[LexicalSegment] = []
+        self.token_pattern: Optional[re.Pattern] = None
+        self.k1 = 1.2
+        self.b = 0.75
+        self.documents = 0
+        self.average_length = 0.0
+        self._manifest_mtime: Optional[int] = None
+
+    def available(self) -> bool:
+        """Whether an index with documents is present (reloading it if it changed)."""
+        self._refresh()
+        return self.documents > 0
+
+    def _refresh(self) -> None:
+        manifest_path = os.path.join(self.path, MANIFEST)
+        try:
+            mtime = os.stat(manifest_path).st_mtime_ns
+        except OSError:
+            self.segments, self.documents, self._manifest_mtime = [], 0, None
+            return
+        if mtime == self._manifest_mtime:
+            return
+        try:
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") != FORMAT_VERSION:
+                logger.warning(f"Lexical index at {self.path} has format {manifest.get('version')}, expected {FORMAT_VERSION}")
+                return
+            segments = [LexicalSegment(os.path.join(self.path, item["name"])) for item in manifest["segments"]]
+        except (OSError, ValueError, KeyError) as e:
+            # A segment removed by a merge in between; the next search retries with the new list
+            logger.warning(f"Lexical index reload failed: {e}")
+            return
+
+        # Newer segments replace the documents they repeat or delete
+        seen = np.empty(0, dtype=np.uint64)
+        for segment in reversed(segments):
+            if len(seen):
+                positions = np.searchsorted(seen, segment.ids).clip(max=len(seen) - 1)
+                segment.live = seen[positions] != segment.ids
+            seen = np.sort(np.concatenate([seen, segment.ids, segment.deletes]))
+        self.segments = segments
+        self.token_pattern = re.compile(manifest["token_pattern"])
+        self.k1, self.b = manifest["k1"], manifest["b"]
+        self.documents = int(sum(segment.live.sum() for segment in segments))
+        total_length = sum(float(segment.doc_len[segment.live].sum()) for segment in segments)
+        self.average_length = total_length / self.documents if self.documents else 0.0
+        self._manifest_mtime = mtime
+        logger.info(f"Lexical index loaded: {self.documents} documents in {len(segments)} segments")
+
+    def search(self, text: str, k: int, accept: Optional[Callable[[dict], bool]] = None) -> list[dict]:
+        """
+        Return the k best BM25 matches for a query text.
+
+        Args:
+            text: Query text, tokenized like the indexed fields
+            k: Number of documents to return
+            accept: Optional predicate on a document's stored fields (search filters)
+
+        Returns:
+            Documents as {"id", "fields", "score"}, best first
+        """
+        self._refresh()
+        if not self.documents or self.token_pattern is None:
+            return []
+        terms = hash64(list(dict.fromkeys(self.token_pattern.findall(text.lower()))))
+        if not len(terms):
+            return []
+
+        postings = [[segment.postings(term) for term in terms] for segment in self.segments]
+        scores = [np.zeros(len(segment.ids)) for segment in self.segments]
+        for t in range(len(terms)):
+            df = sum(int(segment.live[per_term[t][0]].sum()) for segment, per_term in zip(self.segments, postings))
+            if not df:
+                continue
+            idf = math.log(1 + (self.documents - df + 0.5) / (df + 0.5))
+            for segment, per_term, segment_scores in zip(self.segments, postings, scores):
+                docs, tf = per_term[t]
+                if not len(docs):
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * segment.doc_len[docs] / self.average_length)
+                segment_scores += np.bincount(docs, weights=idf * tf * (self.k1 + 1) / (tf + norm), minlength=len(segment_scores))
+
+        for segment, segment_scores in zip(self.segments, scores):
+            segment_scores[~segment.live] = 0
+        all_scores = np.concatenate(scores)
+        starts = np.cumsum([0] + [len(segment_scores) for segment_scores in scores])
+        matched = np.flatnonzero(all_scores)
+        results = []
+        for position in matched[np.argsort(-all_scores[matched], kind="stable")]:
+            s = int(np.searchsorted(starts, position, side="right")) - 1
+            fields = self.segments[s].document(int(position - starts[s]))
+            if accept is None or accept(fields):
+                results.append({"id": fields.pop("id"), "fields": fields, "score": float(all_scores[position])})
+                if len(results) == k:
+                    break
+        return results
+
+
+def delete_documents(path: str, ids: list[str]) -> int:
+    """
+    Remove documents from the index by appending a tombstone segment.
+
+    The Superlinked server only adds documents on ingest; postings deleted
+    from Qdrant directly (scripts/ingest_delta.py) are removed here. Readers
+    drop them on their next reload, and the server's writer folds the
+    tombstone into its next merge.
+
+    Args:
+        path: Index directory (LEXICAL_INDEX_PATH)
+        ids: Ids of the deleted documents
+
+    Returns:
+        Number of ids written, 0 when there is no index to delete from
+    """
+    if not ids:
+        return 0
+    manifest_path = os.path.join(path, MANIFEST)
+    # The writer's lock, so a concurrent ingest never loses the tombstone
+    with open(os.path.join(path, ".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        if manifest.get("version") != FORMAT_VERSION or not manifest["segments"]:
+            return 0
+        name = f"seg-{time.time_ns()}-{os.getpid()}"
+        directory = os.path.join(path, name)
+        os.makedirs(directory)
+        empty = np.empty(0, dtype=np.uint64)
+        for file_name, array in {
+            "terms.u64": empty, "offsets.u64": np.zeros(1, dtype=np.uint64),
+            "postings_doc.u32": empty.astype(np.uint32), "postings_tf.u16": empty.astype(np.uint16),
+            "doc_len.u32": empty.astype(np.uint32), "ids.u64": empty,
+            "docs_offsets.u64": np.zeros(1, dtype=np.uint64), "deletes.u64": np.unique(hash64(ids)),
+        }.items():
+            array.tofile(os.path.join(directory, file_name))
+        open(os.path.join(directory, "docs.jsonl"), "wb").close()
+        manifest["segments"].append({"name": name, "docs": 0, "deletes": len(set(ids))})
+        tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, manifest_path)
+    return len(set(ids))
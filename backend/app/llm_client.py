@@ -1,24 +1,31 @@
 """LLM client management and operations."""
 
+import asyncio
 import logging
 import json
-from typing import Optional, Any
+from typing import AsyncIterator, Optional, Any
+import httpx
 from fastapi import HTTPException
-from openai import OpenAI
-from groq import Groq
+from openai import AsyncOpenAI
+from groq import AsyncGroq
 
+from app.cache import ResponseCache, build_cache, make_cache_key
+from app.coalesce import SingleFlight
 from app.config import get_settings
+from app.streaming import IncrementalJSONParser
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
 class LLMClientManager:
-    """Singleton manager for LLM clients."""
+    """Singleton manager for async LLM clients sharing one pooled HTTP transport."""
     
     _instance = None
-    _openai_client: Optional[OpenAI] = None
-    _groq_client: Optional[Groq] = None
+    _http_client: Optional[httpx.AsyncClient] = None
+    _openai_client: Optional[AsyncOpenAI] = None
+    _groq_client: Optional[AsyncGroq] = None
+    _semaphore: Optional[asyncio.Semaphore] = None
     
     def __new__(cls):
         """Implement singleton pattern."""
@@ -29,11 +36,23 @@ class LLMClientManager:
     
     def _initialize_clients(self) -> None:
         """Initialize LLM clients."""
+        # Keep-alive connection pool shared by both SDK clients
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(settings.LLM_TIMEOUT, connect=10.0),
+        )
+        self._semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+        
         # OpenAI-compatible client (Groq)
         try:
-            self._openai_client = OpenAI(
+            self._openai_client = AsyncOpenAI(
                 api_key=settings.GROQ_API_KEY,
-                base_url=settings.GROQ_BASE_URL
+                base_url=settings.GROQ_BASE_URL,
+                http_client=self._http_client
             )
             logger.info("OpenAI-compatible client initialized successfully")
         except Exception as e:
@@ -42,14 +61,17 @@ class LLMClientManager:
         
         # Native Groq client
         try:
-            self._groq_client = Groq(api_key=settings.GROQ_API_KEY)
+            self._groq_client = AsyncGroq(
+                api_key=settings.GROQ_API_KEY,
+                http_client=self._http_client
+            )
             logger.info("Groq client initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize Groq client: {e}")
             self._groq_client = None
     
     @property
-    def openai_client(self) -> OpenAI:
+    def openai_client(self) -> AsyncOpenAI:
         """Get OpenAI-compatible client."""
         if self._openai_client is None:
             raise HTTPException(
@@ -59,7 +81,7 @@ class LLMClientManager:
         return self._openai_client
     
     @property
-    def groq_client(self) -> Groq:
+    def groq_client(self) -> AsyncGroq:
         """Get Groq client."""
         if self._groq_client is None:
             raise HTTPException(
@@ -68,17 +90,41 @@ class LLMClientManager:
             )
         return self._groq_client
     
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """Get semaphore capping concurrent LLM requests per worker."""
+        return self._semaphore
+    
     def is_available(self) -> bool:
         """Check if any client is available."""
         return self._openai_client is not None or self._groq_client is not None
+    
+    async def aclose(self) -> None:
+        """Close the shared HTTP transport."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            logger.info("LLM HTTP client closed")
 
 
 class LLMOperations:
     """High-level LLM operations."""
     
-    def __init__(self):
-        """Initialize with client manager."""
+    def __init__(self, cache: Optional[ResponseCache] = None):
+        """Initialize with client manager and optional response cache."""
         self.manager = LLMClientManager()
+        self.cache = cache if cache is not None else build_cache(
+            settings.LLM_CACHE_BACKEND,
+            ttl=settings.LLM_CACHE_TTL,
+            max_bytes=settings.LLM_CACHE_MAX_BYTES,
+            path=settings.LLM_CACHE_PATH,
+            name="LLM response cache"
+        )
+        self.coalescer = SingleFlight("LLM operations")
+    
+    async def _create_completion(self, client: Any, **kwargs: Any) -> Any:
+        """Run a chat completion within the manager's concurrency cap."""
+        async with self.manager.semaphore:
+            return await client.chat.completions.create(**kwargs)
     
     async def analyze_cv_with_job(
         self,
@@ -89,6 +135,10 @@ class LLMOperations:
         """
         Analyze CV against job posting using LLM.
         
+        Results are cached by a hash of the inputs, prompt, model and
+        temperature, so identical re-submissions skip the completion.
+        Identical requests already in flight share one completion.
+        
         Args:
             cv_content: CV text
             job_posting: Job posting text
@@ -100,7 +150,55 @@ class LLMOperations:
         Raises:
             HTTPException: If LLM request fails
         """
-        prompt = f"""
+        prompt = self._build_analysis_prompt(cv_content, job_posting)
+        cache_key = self._analysis_cache_key(cv_content, job_posting, system_prompt)
+        if self.cache is not None:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                logger.info("CV analysis served from cache")
+                return cached
+        
+        async def complete() -> dict:
+            try:
+                response = await self._create_completion(
+                    self.manager.openai_client,
+                    model=settings.GROQ_MODEL,
+                    messages=[
+                        {'role': 'system', 'content': system_prompt},
+                        {'role': 'user', 'content': prompt}
+                    ],
+                    response_format={"type": "json_object"},
+                    temperature=settings.LLM_TEMPERATURE,
+                )
+                
+                result = json.loads(response.choices[0].message.content)
+                if self.cache is not None:
+                    await self.cache.set(cache_key, result)
+                return result
+                
+            except json.JSONDecodeError as e:
+                logger.error(f"Failed to parse LLM response: {e}")
+                raise HTTPException(
+                    status_code=502,
+                    detail="Invalid response format from LLM"
+                )
+            except Exception as e:
+                logger.error(f"LLM analysis failed: {e}")
+                raise HTTPException(
+                    status_code=502,
+                    detail={
+                        'message': 'Failed to analyze CV',
+                        'api_base_url': settings.GROQ_BASE_URL,
+                        'model': settings.GROQ_MODEL,
+                        'error': str(e)
+                    }
+                )
+        
+        return await self.coalescer.do(cache_key, complete)
+    
+    def _build_analysis_prompt(self, cv_content: str, job_posting: str) -> str:
+        """Build the user prompt for CV-vs-job analysis."""
+        return f"""
 Compare the user's CV with the job posting. For strong_skills_comment and skills_to_develop_comment, 
 provide detailed advice including specific recommendations for improvement or how to leverage the skills. 
 Provide a response in the following JSON schema:
@@ -115,29 +213,83 @@ Job Posting:
 
 Provide only the JSON response.
 """
+    
+    @staticmethod
+    def _analysis_cache_key(cv_content: str, job_posting: str, system_prompt: str) -> str:
+        """Build the content hash identifying a CV-vs-job analysis."""
+        return make_cache_key(
+            "analyze_cv_with_job", cv_content, job_posting, system_prompt,
+            settings.GROQ_MODEL, settings.LLM_TEMPERATURE
+        )
+    
+    async def stream_analyze_cv_with_job(
+        self,
+        cv_content: str,
+        job_posting: str,
+        system_prompt: str
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """
+        Stream CV analysis, reporting each field as soon as it is complete.
         
-        try:
-            response = self.manager.openai_client.chat.completions.create(
-                model=settings.GROQ_MODEL,
-                messages=[
-                    {'role': 'system', 'content': system_prompt},
-                    {'role': 'user', 'content': prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=settings.LLM_TEMPERATURE,
-            )
+        Args:
+            cv_content: CV text
+            job_posting: Job posting text
+            system_prompt: System prompt for the model
+            
+        Yields:
+            ("field", {"name", "value"}) for every analysis field and the
+            learning resource list, then ("result", full analysis dict)
             
-            result = json.loads(response.choices[0].message.content)
-            return result
+        Raises:
+            HTTPException: If LLM request fails
+        """
+        cache_key = self._analysis_cache_key(cv_content, job_posting, system_prompt)
+        if self.cache is not None:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                logger.info("CV analysis stream served from cache")
+                for name, value in cached.get("analysis_results", {}).items():
+                    yield "field", {"name": name, "value": value}
+                yield "field", {
+                    "name": "suggested_learning_resources",
+                    "value": cached.get("suggested_learning_resources", [])
+                }
+                yield "result", cached
+                return
+        
+        parser = IncrementalJSONParser(max_depth=2)
+        try:
+            async with self.manager.semaphore:
+                stream = await self.manager.openai_client.chat.completions.create(
+                    model=settings.GROQ_MODEL,
+                    messages=[
+                        {'role': 'system', 'content': system_prompt},
+                        {'role': 'user', 'content': self._build_analysis_prompt(cv_content, job_posting)}
+                    ],
+                    response_format={"type": "json_object"},
+                    temperature=settings.LLM_TEMPERATURE,
+                    stream=True,
+                )
+                async for chunk in stream:
+                    if not chunk.choices or not chunk.choices[0].delta.content:
+                        continue
+                    for path, value in parser.feed(chunk.choices[0].delta.content):
+                        if len(path) == 2 and path[0] == "analysis_results":
+                            yield "field", {"name": path[1], "value": value}
+                        elif path == ("suggested_learning_resources",):
+                            yield "field", {"name": path[0], "value": value}
             
+            result = json.loads(parser.text)
         except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse LLM response: {e}")
+            logger.error(f"Failed to parse streamed LLM response: {e}")
             raise HTTPException(
                 status_code=502,
                 detail="Invalid response format from LLM"
             )
+        except HTTPException:
+            raise
         except Exception as e:
-            logger.error(f"LLM analysis failed: {e}")
+            logger.error(f"Streaming LLM analysis failed: {e}")
             raise HTTPException(
                 status_code=502,
                 detail={
@@ -147,6 +299,10 @@ Provide only the JSON response.
                     'error': str(e)
                 }
             )
+        
+        if self.cache is not None:
+            await self.cache.set(cache_key, result)
+        yield "result", result
     
     async def generate_candidate_summary(
         self,
@@ -179,7 +335,8 @@ LinkedIn Profile:
 Provide a professional summary highlighting key strengths, experience, and technical skills."""
         
         try:
-            response = self.manager.groq_client.chat.completions.create(
+            response = await self._create_completion(
+                self.manager.groq_client,
                 model=settings.GROQ_MODEL,
                 messages=[
                     {
@@ -250,34 +407,39 @@ Only return valid JSON, no markdown or explanations."""
             "Return strictly valid JSON matching the provided schema. Ensure links are accessible and public."
         )
         
-        try:
-            response = self.manager.groq_client.chat.completions.create(
-                model=settings.GROQ_MODEL,
-                messages=[
-                    {"role": "system", "content": sys_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=settings.LLM_COURSE_TEMPERATURE,
-                response_format={"type": "json_object"},
-            )
-            
-            return json.loads(response.choices[0].message.content)
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse course recommendations: {e}")
-            raise HTTPException(
-                status_code=502,
-                detail="Invalid response format from LLM"
-            )
-        except Exception as e:
-            logger.error(f"Course recommendation failed: {e}")
-            raise HTTPException(
-                status_code=502,
-                detail={
-                    "message": "Failed to generate course recommendations",
-                    "model": settings.GROQ_MODEL,
-                    "error": str(e)
-                }
-            )
+        async def complete() -> dict:
+            try:
+                response = await self._create_completion(
+                    self.manager.groq_client,
+                    model=settings.GROQ_MODEL,
+                    messages=[
+                        {"role": "system", "content": sys_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=settings.LLM_COURSE_TEMPERATURE,
+                    response_format={"type": "json_object"},
+                )
+                
+                return json.loads(response.choices[0].message.content)
+            except json.JSONDecodeError as e:
+                logger.error(f"Failed to parse course recommendations: {e}")
+                raise HTTPException(
+                    status_code=502,
+                    detail="Invalid response format from LLM"
+                )
+            except Exception as e:
+                logger.error(f"Course recommendation failed: {e}")
+                raise HTTPException(
+                    status_code=502,
+                    detail={
+                        "message": "Failed to generate course recommendations",
+                        "model": settings.GROQ_MODEL,
+                        "error": str(e)
+                    }
+                )
+        
+        key = make_cache_key("recommend_courses", target_role, skills, level, count)
+        return await self.coalescer.do(key, complete)
     
     async def chat_with_candidate(
         self,
@@ -304,7 +466,8 @@ Only return valid JSON, no markdown or explanations."""
         sources = []
         
         try:
-            response = self.manager.groq_client.chat.completions.create(
+            response = await self._create_completion(
+                self.manager.groq_client,
                 model=settings.GROQ_MODEL,
                 messages=messages,
                 temperature=settings.LLM_TEMPERATURE,
@@ -323,6 +486,49 @@ Only return valid JSON, no markdown or explanations."""
                 }
             )
     
+    async def stream_chat_with_candidate(
+        self,
+        context: str,
+        question: str
+    ) -> AsyncIterator[str]:
+        """
+        Stream an answer from the candidate AI profile token by token.
+        
+        Args:
+            context: Candidate profile context
+            question: Question from employer
+            
+        Yields:
+            Answer text fragments as they arrive
+            
+        Raises:
+            HTTPException: If LLM request fails
+        """
+        try:
+            async with self.manager.semaphore:
+                stream = await self.manager.groq_client.chat.completions.create(
+                    model=settings.GROQ_MODEL,
+                    messages=[
+                        {"role": "system", "content": context},
+                        {"role": "user", "content": question}
+                    ],
+                    temperature=settings.LLM_TEMPERATURE,
+                    max_tokens=settings.MAX_TOKENS,
+                    stream=True,
+                )
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+        except Exception as e:
+            logger.error(f"Candidate chat stream failed: {e}")
+            raise HTTPException(
+                status_code=502,
+                detail={
+                    "message": "Failed to generate response",
+                    "error": str(e)
+                }
+            )
+    
     @staticmethod
     def _get_response_schema() -> dict:
         """Get JSON schema for CV analysis response."""
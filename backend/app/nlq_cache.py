@@ -0,0 +1,134 @@
+"""Cache of natural-language-query parameter extractions."""
+
+import ast
+import hashlib
+import logging
+from typing import Optional
+
+from app.cache import ResponseCache, build_cache, make_cache_key
+from app.config import get_settings
+from app.schemas import SearchRequest
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Parameters that come from the request itself and must never be replayed from cache
+_REQUEST_ONLY_PARAMS = {"natural_query", "limit"}
+
+
+def compute_prompt_version(path: str) -> Optional[str]:
+    """
+    Hash the NLQ prompt text defined in the Superlinked app.
+
+    Only module-level string constants are hashed, so reformatting code
+    around them does not change the version, while any prompt edit does.
+
+    Args:
+        path: Path to superlinked_app/nlq.py
+
+    Returns:
+        Short hex digest, or None if the file cannot be read
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+    except (OSError, SyntaxError) as e:
+        logger.warning(f"Could not read NLQ prompts from {path}: {e}")
+        return None
+
+    digest = hashlib.sha256()
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            try:
+                value = ast.literal_eval(node.value)
+            except ValueError:
+                continue
+            if isinstance(value, str):
+                digest.update(node.targets[0].id.encode("utf-8"))
+                digest.update(value.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def normalize_query(text: str) -> str:
+    """Case-fold and collapse whitespace so trivially different queries share an entry."""
+    return " ".join(text.casefold().split())
+
+
+class NLQParseCache:
+    """
+    Map a natural query to the parameters Superlinked's NLQ step extracted for it.
+
+    Entries are keyed by the normalized query, the explicitly supplied
+    parameters (NLQ only fills the ones left unset) and the prompt version,
+    so editing the prompts invalidates every earlier extraction.
+    """
+
+    def __init__(self, cache: Optional[ResponseCache] = None):
+        """Initialize with an optional backing cache."""
+        self.prompt_version = settings.NLQ_PROMPT_VERSION or compute_prompt_version(settings.NLQ_PROMPT_PATH)
+        if self.prompt_version is None:
+            logger.warning("NLQ prompt version unknown, NLQ parse cache disabled")
+            self.cache = None
+            return
+        self.cache = cache if cache is not None else build_cache(
+            settings.NLQ_CACHE_BACKEND,
+            ttl=settings.NLQ_CACHE_TTL,
+            max_bytes=settings.NLQ_CACHE_MAX_BYTES,
+            path=settings.NLQ_CACHE_PATH,
+            name="NLQ parse cache"
+        )
+
+    async def lookup(self, route: str, payload: dict) -> Optional[dict]:
+        """
+        Build a structured payload from a cached extraction.
+
+        Args:
+            route: Superlinked query name (each has its own system prompt)
+            payload: Normalized request payload containing `natural_query`
+
+        Returns:
+            Payload with the cached parameters and no `natural_query`,
+            or None on a miss
+        """
+        if self.cache is None or not payload.get("natural_query"):
+            return None
+        params = await self.cache.get(self._key(route, payload))
+        if params is None:
+            return None
+        structured = {**params, **payload}
+        structured.pop("natural_query")
+        return structured
+
+    async def store(self, route: str, payload: dict, result: dict) -> None:
+        """
+        Remember the parameters Superlinked extracted for a request.
+
+        Args:
+            route: Superlinked query name
+            payload: Normalized request payload that was sent
+            result: Search response including `metadata.search_params`
+        """
+        if self.cache is None or not payload.get("natural_query"):
+            return
+        search_params = (result.get("metadata") or {}).get("search_params")
+        if not isinstance(search_params, dict):
+            return
+        params = {
+            name: value for name, value in search_params.items()
+            if name in SearchRequest.model_fields
+            and name not in _REQUEST_ONLY_PARAMS
+            and name not in payload
+            and value is not None
+        }
+        await self.cache.set(self._key(route, payload), params)
+
+    async def stats(self) -> dict:
+        """Return cache counters and the active prompt version."""
+        stats = await self.cache.stats() if self.cache is not None else {"backend": None}
+        return {"prompt_version": self.prompt_version, **stats}
+
+    def _key(self, route: str, payload: dict) -> str:
+        explicit = {k: v for k, v in payload.items() if k not in _REQUEST_ONLY_PARAMS}
+        return make_cache_key(
+            "nlq", route, self.prompt_version, normalize_query(payload["natural_query"]), explicit
+        )
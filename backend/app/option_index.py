@@ -0,0 +1,214 @@
+"""Candidate lookup over high-cardinality filter vocabularies."""
+
+import bisect
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Iterable
+
+from app.config import get_settings
+from app.query_parser import (
+    COUNTRY_ALIASES,
+    FILLER_WORDS,
+    JOB_LEVEL_ALIASES,
+    JOB_TYPE_ALIASES,
+    TITLE_ALIASES,
+)
+from app.vocabulary import DEFAULT_SKILLS, get_skill_matcher, load_job_schema
+
+settings = get_settings()
+
+# schema.json field -> field name used by the Superlinked filter param descriptions
+FILTER_FIELDS = {
+    "state": "state", "search_city": "search_city", "search_country": "search_country",
+    "company": "company", "job_level": "job_level", "job_type": "job_type",
+    "job_category": "job_category", "skills_list": "job_skills",
+}
+# Trigrams shared by more values than this are too common to select candidates
+MAX_POSTINGS = 500
+# Candidates re-scored exactly per fuzzy lookup
+MAX_CANDIDATES = 50
+MAX_NGRAM_WORDS = 4
+
+_NON_WORD = re.compile(r"[^\w&+#]+")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_NON_WORD.sub(" ", text.casefold()).split())
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Exact, word-prefix and trigram-similarity lookup over a vocabulary."""
+
+    def __init__(self, values: Iterable[str]):
+        """Index every distinct non-empty value."""
+        self.values = list(dict.fromkeys(v for v in values if v and v.strip()))
+        normalized = [_normalize(v) for v in self.values]
+        self._sorted = sorted((key, i) for i, key in enumerate(normalized))
+        self._grams = [_trigrams(key) for key in normalized]
+        postings: defaultdict[str, list[int]] = defaultdict(list)
+        for i, grams in enumerate(self._grams):
+            for gram in grams:
+                postings[gram].append(i)
+        self._postings = {gram: ids for gram, ids in postings.items() if len(ids) <= MAX_POSTINGS}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def prefix(self, text: str, limit: int) -> list[str]:
+        """
+        Return values equal to `text` or starting with it as whole words.
+
+        Args:
+            text: Lookup text
+            limit: Maximum number of values
+
+        Returns:
+            Matching values, exact match first
+        """
+        key = _normalize(text)
+        if not key:
+            return []
+        found = []
+        start = bisect.bisect_left(self._sorted, (key, -1))
+        for candidate, i in self._sorted[start:]:
+            if candidate != key and not candidate.startswith(key + " "):
+                if not candidate.startswith(key):
+                    break
+                continue
+            found.append(self.values[i])
+            if len(found) >= limit:
+                break
+        return found
+
+    def search(self, text: str, limit: int, min_similarity: float) -> list[tuple[str, float]]:
+        """
+        Return values whose trigram Dice similarity to `text` is high enough.
+
+        Args:
+            text: Lookup text (typos allowed)
+            limit: Maximum number of values
+            min_similarity: Similarity threshold in [0, 1]
+
+        Returns:
+            (value, similarity) pairs, best first
+        """
+        grams = _trigrams(_normalize(text))
+        hits = Counter()
+        for gram in grams:
+            hits.update(self._postings.get(gram, ()))
+        scored = []
+        for i, _ in hits.most_common(MAX_CANDIDATES):
+            similarity = 2 * len(grams & self._grams[i]) / (len(grams) + len(self._grams[i]))
+            if similarity >= min_similarity:
+                scored.append((similarity, i))
+        scored.sort(reverse=True)
+        return [(self.values[i], round(similarity, 3)) for similarity, i in scored[:limit]]
+
+
+class OptionHints:
+    """
+    Point the NLQ model at the few vocabulary values a query mentions.
+
+    Superlinked leaves option lists longer than NLQ_MAX_FILTER_OPTIONS out
+    of the NLQ prompt. For those fields, values matching the query are
+    appended to the query text instead, so the model can still return
+    exact dataset spellings.
+    """
+
+    def __init__(self, schema: dict):
+        """Index the filter fields whose option lists are pruned from the prompt."""
+        self.indexes = {
+            name: TrigramIndex(schema.get(name, []))
+            for name in FILTER_FIELDS
+            if name != "skills_list" and len(schema.get(name, [])) > settings.NLQ_MAX_FILTER_OPTIONS
+        }
+        # Skills are found by the shared skill matcher rather than a trigram index
+        self.hint_skills = len(schema.get("skills_list", [])) > settings.NLQ_MAX_FILTER_OPTIONS
+        # Words handled by other params; they never start an entity lookup
+        self.common_words = set(FILLER_WORDS)
+        for table in (TITLE_ALIASES, JOB_TYPE_ALIASES, JOB_LEVEL_ALIASES, COUNTRY_ALIASES):
+            for phrase in table:
+                self.common_words.update(_normalize(phrase).split())
+        for skill in schema.get("skills_list") or DEFAULT_SKILLS:
+            self.common_words.update(_normalize(skill).split())
+
+    def candidates(self, query: str) -> dict[str, list[str]]:
+        """
+        Find vocabulary values mentioned in a query.
+
+        Args:
+            query: Natural language query
+
+        Returns:
+            Mapping of schema field name to matching values
+        """
+        limit = settings.NLQ_OPTION_CANDIDATES
+        found: dict[str, dict[str, None]] = {name: {} for name in self.indexes}
+        if self.hint_skills:
+            found["skills_list"] = dict.fromkeys(get_skill_matcher().find(query))
+        words = _normalize(query).split()
+        # Only runs of uncommon words can name a company or a city
+        runs, run = [], []
+        for word in words:
+            if word in self.common_words:
+                if run:
+                    runs.append(run)
+                run = []
+            else:
+                run.append(word)
+        if run:
+            runs.append(run)
+
+        for run in runs:
+            for name, index in self.indexes.items():
+                matched = [False] * len(run)
+                for size in range(min(MAX_NGRAM_WORDS, len(run)), 0, -1):
+                    for i in range(len(run) - size + 1):
+                        if any(matched[i:i + size]):
+                            continue
+                        phrase = " ".join(run[i:i + size])
+                        values = index.prefix(phrase, limit)
+                        if not values and len(phrase) >= 4:
+                            values = [
+                                value for value, _ in
+                                index.search(phrase, limit, settings.NLQ_OPTION_MIN_SIMILARITY)
+                            ]
+                        if values:
+                            matched[i:i + size] = [True] * size
+                            for value in values:
+                                found[name].setdefault(value, None)
+        return {name: list(values)[:limit] for name, values in found.items() if values}
+
+    def with_hints(self, payload: dict) -> dict:
+        """
+        Append matching vocabulary values to the payload's natural query.
+
+        Args:
+            payload: Normalized request payload
+
+        Returns:
+            Payload to send (unchanged if nothing matched)
+        """
+        query = payload.get("natural_query")
+        if not query:
+            return payload
+        candidates = self.candidates(query)
+        if not candidates:
+            return payload
+        hints = "\n".join(
+            f"Matching {FILTER_FIELDS[name]} values: {', '.join(values)}"
+            for name, values in candidates.items()
+        )
+        return {**payload, "natural_query": f"{query}\n\n{hints}"}
+
+
+@lru_cache(maxsize=1)
+def get_option_hints() -> OptionHints:
+    """Return option hints built over data/schema.json."""
+    return OptionHints(load_job_schema())
@@ -0,0 +1,264 @@
+"""Deterministic parser for simple job search queries (NLQ fast path)."""
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional
+
+from app.config import get_settings
+from app.vocabulary import SkillMatcher, get_skill_matcher, load_job_schema
+
+settings = get_settings()
+
+# Alias tables follow the mapping rules written in superlinked_app/nlq.py
+COUNTRY_ALIASES = {
+    "united states": "United States", "usa": "United States", "us": "United States",
+    "u.s.": "United States", "u.s.a.": "United States", "america": "United States",
+    "united kingdom": "United Kingdom", "uk": "United Kingdom", "u.k.": "United Kingdom",
+    "britain": "United Kingdom", "great britain": "United Kingdom", "england": "United Kingdom",
+    "canada": "Canada", "australia": "Australia",
+}
+
+US_STATES = {
+    "alabama": "AL", "alaska": "AK", "arizona": "AZ", "arkansas": "AR", "california": "CA",
+    "colorado": "CO", "connecticut": "CT", "delaware": "DE", "florida": "FL", "georgia": "GA",
+    "hawaii": "HI", "idaho": "ID", "illinois": "IL", "indiana": "IN", "iowa": "IA",
+    "kansas": "KS", "kentucky": "KY", "louisiana": "LA", "maine": "ME", "maryland": "MD",
+    "massachusetts": "MA", "michigan": "MI", "minnesota": "MN", "mississippi": "MS",
+    "missouri": "MO", "montana": "MT", "nebraska": "NE", "nevada": "NV", "new hampshire": "NH",
+    "new jersey": "NJ", "new mexico": "NM", "new york state": "NY", "north carolina": "NC",
+    "north dakota": "ND", "ohio": "OH", "oklahoma": "OK", "oregon": "OR", "pennsylvania": "PA",
+    "rhode island": "RI", "south carolina": "SC", "south dakota": "SD", "tennessee": "TN",
+    "texas": "TX", "utah": "UT", "vermont": "VT", "virginia": "VA", "washington state": "WA",
+    "west virginia": "WV", "wisconsin": "WI", "wyoming": "WY", "district of columbia": "DC",
+}
+# Abbreviations that are also common English words are only trusted after a comma ("Austin, IN")
+AMBIGUOUS_STATE_CODES = {"IN", "OR", "ME", "OK", "HI", "ID", "LA", "AL", "DE", "MA", "PA", "CO", "OH"}
+
+JOB_TYPE_ALIASES = {
+    "remote": "Remote", "fully remote": "Remote", "work from home": "Remote", "wfh": "Remote",
+    "telecommute": "Remote", "hybrid": "Hybrid", "part remote": "Hybrid",
+    "onsite": "Onsite", "on-site": "Onsite", "on site": "Onsite", "in-office": "Onsite",
+    "in office": "Onsite", "in-person": "Onsite", "in person": "Onsite", "office-based": "Onsite",
+}
+
+JOB_LEVEL_ALIASES = {
+    "junior": "Associate", "entry level": "Associate", "entry-level": "Associate",
+    "associate": "Associate", "graduate": "Associate",
+    "senior": "Mid Senior", "mid senior": "Mid Senior", "mid-senior": "Mid Senior",
+    "mid level": "Mid Senior", "mid-level": "Mid Senior", "experienced": "Mid Senior",
+}
+
+# Title alias -> (canonical title, job category)
+TITLE_ALIASES = {
+    "data analyst": ("Data Analyst", "data_analyst"),
+    "data analysts": ("Data Analyst", "data_analyst"),
+    "analyst": ("Data Analyst", "data_analyst"),
+    "software engineer": ("Software Engineer", "software_engineer"),
+    "software engineers": ("Software Engineer", "software_engineer"),
+    "software developer": ("Software Engineer", "software_engineer"),
+    "developer": ("Software Engineer", "software_engineer"),
+    "programmer": ("Software Engineer", "software_engineer"),
+    "data scientist": ("Data Scientist", "data_scientist"),
+    "data scientists": ("Data Scientist", "data_scientist"),
+    "ml engineer": ("Data Scientist", "data_scientist"),
+    "machine learning engineer": ("Data Scientist", "data_scientist"),
+    "data engineer": ("Data Engineer", "data_engineer"),
+    "data engineers": ("Data Engineer", "data_engineer"),
+    "etl developer": ("Data Engineer", "data_engineer"),
+}
+
+# Words that carry no search intent of their own
+FILLER_WORDS = {
+    "a", "an", "the", "and", "or", "in", "at", "on", "for", "with", "of", "near", "around",
+    "based", "job", "jobs", "position", "positions", "role", "roles", "opening", "openings",
+    "opportunity", "opportunities", "vacancy", "vacancies", "work", "working", "looking",
+    "find", "me", "show", "any", "some", "using", "experience", "skills", "skill", "knowledge",
+    "level", "title", "type",
+}
+
+# Constructs the rules cannot express; these always go to the LLM
+LLM_ONLY_PATTERN = re.compile(
+    r"\b(?:not|except|excluding|exclude|without|but|no|other than|outside|salary|pay|paid|"
+    r"compensation|benefits|startup|company|companies|like)\b|[$€£]",
+    re.IGNORECASE
+)
+_TOKEN = re.compile(r"[\w+#.'-]+")
+
+
+@dataclass
+class ParsedQuery:
+    """Outcome of rule-based query parsing."""
+    params: dict = field(default_factory=dict)
+    field_confidence: dict = field(default_factory=dict)
+    coverage: float = 0.0
+    confidence: float = 0.0
+    unparsed: list = field(default_factory=list)
+
+    @property
+    def confident(self) -> bool:
+        """Whether the parse is good enough to skip the LLM."""
+        return bool(self.params) and self.confidence >= settings.NLQ_FAST_PATH_MIN_CONFIDENCE
+
+
+class _Phrases:
+    """Case-insensitive phrase table matched over token n-grams."""
+
+    def __init__(self, table: dict, confidence: float):
+        self.table = {key.casefold(): value for key, value in table.items() if key}
+        self.max_words = max((len(key.split()) for key in self.table), default=0)
+        self.confidence = confidence
+
+
+class QueryParser:
+    """Match a query against the dataset vocabularies and score the result."""
+
+    def __init__(self, schema: dict, skill_matcher: SkillMatcher):
+        """Build phrase tables for every vocabulary."""
+        countries = dict(COUNTRY_ALIASES)
+        countries.update({country: country for country in schema.get("search_country", [])})
+        self.state_codes = set(schema.get("state", [])) or set(US_STATES.values())
+        job_types = {**{t: t for t in schema.get("job_type", [])}, **JOB_TYPE_ALIASES}
+        job_levels = {**{l: l for l in schema.get("job_level", [])}, **JOB_LEVEL_ALIASES}
+
+        # Matched in this order; earlier tables claim tokens first
+        self.phrases = {
+            "job_levels_include": _Phrases(job_levels, 0.9),
+            "title": _Phrases(TITLE_ALIASES, 0.95),
+            "search_cities_include": _Phrases({c: c for c in schema.get("search_city", [])}, 1.0),
+            "search_countries_include": _Phrases(countries, 1.0),
+            "states_include": _Phrases(
+                {name: code for name, code in US_STATES.items() if code in self.state_codes}, 1.0
+            ),
+            "job_types_include": _Phrases(job_types, 0.95),
+        }
+        self.skill_matcher = skill_matcher
+
+    def parse(self, query: str) -> ParsedQuery:
+        """
+        Extract search parameters from a query.
+
+        Args:
+            query: Natural language search query
+
+        Returns:
+            Parameters in SearchRequest naming, per-field confidence and
+            an overall confidence in [0, 1]
+        """
+        result = ParsedQuery()
+        if LLM_ONLY_PATTERN.search(query):
+            return result
+
+        tokens = list(_TOKEN.finditer(query))
+        keys = [token.group(0).casefold() for token in tokens]
+        consumed = [False] * len(tokens)
+        found: dict[str, dict] = {name: {} for name in self.phrases}
+
+        for name, phrases in self.phrases.items():
+            # Longest phrases first so "New York" is not read as "York"
+            for size in range(phrases.max_words, 0, -1):
+                for i in range(len(tokens) - size + 1):
+                    if any(consumed[i:i + size]):
+                        continue
+                    phrase = " ".join(keys[i:i + size])
+                    value = phrases.table.get(phrase) or phrases.table.get(phrase.rstrip("."))
+                    if value is None:
+                        continue
+                    consumed[i:i + size] = [True] * size
+                    found[name].setdefault(value, None)
+                    result.field_confidence[name] = phrases.confidence
+
+        # State codes are matched case-sensitively; ambiguous ones only after a comma
+        for i, token in enumerate(tokens):
+            code = token.group(0).rstrip(".")
+            if consumed[i] or code not in self.state_codes or not code.isupper():
+                continue
+            if code in AMBIGUOUS_STATE_CODES and not query[:token.start()].rstrip().endswith(","):
+                continue
+            consumed[i] = True
+            found["states_include"].setdefault(code, None)
+            result.field_confidence["states_include"] = min(result.field_confidence.get("states_include", 1.0), 0.85)
+
+        skills: dict[str, None] = {}
+        for skill, start, end in self.skill_matcher.matches(query):
+            covered = [i for i, token in enumerate(tokens) if token.start() < end and token.end() > start]
+            if covered and not any(consumed[i] for i in covered):
+                for i in covered:
+                    consumed[i] = True
+                skills.setdefault(skill, None)
+                result.field_confidence["skills"] = 0.9
+
+        titles = list(found.pop("title"))
+        if titles:
+            title, _ = titles[0]
+            levels = found["job_levels_include"]
+            if "Mid Senior" in levels and "senior" in keys and "mid" not in keys:
+                title = f"Senior {title}"
+            result.params["title"] = title
+            result.params["job_categories_include"] = sorted({category for _, category in titles})
+            if len(titles) > 1:
+                # Several roles in one query are better left to the LLM
+                result.field_confidence["title"] = 0.5
+        for name, values in found.items():
+            if values:
+                result.params[name] = sorted(values)
+        if skills:
+            result.params["description"] = f"Experience with {', '.join(skills)}."
+            if settings.SKILLS_SPACE_ENABLED:
+                result.params["skills"] = list(skills)
+
+        meaningful = [i for i, key in enumerate(keys) if key.rstrip(".") not in FILLER_WORDS]
+        result.unparsed = [tokens[i].group(0) for i in meaningful if not consumed[i]]
+        if meaningful:
+            result.coverage = round(1 - len(result.unparsed) / len(meaningful), 3)
+        if result.params:
+            result.confidence = round(result.coverage * min(result.field_confidence.values()), 3)
+        return result
+
+
+@lru_cache(maxsize=1)
+def get_query_parser() -> QueryParser:
+    """Return the parser built over data/schema.json vocabularies."""
+    return QueryParser(load_job_schema(), get_skill_matcher())
+
+
+class FastPath:
+    """Replace `natural_query` with rule-parsed parameters when the parse is confident."""
+
+    served = 0
+    fallbacks = 0
+
+    @classmethod
+    def structured_payload(cls, payload: dict) -> Optional[dict]:
+        """
+        Build a structured search payload without calling the LLM.
+
+        Explicitly supplied parameters take precedence over parsed ones.
+
+        Args:
+            payload: Normalized request payload containing `natural_query`
+
+        Returns:
+            Payload without `natural_query`, or None to fall back to NLQ
+        """
+        if not settings.NLQ_FAST_PATH_ENABLED or not payload.get("natural_query"):
+            return None
+        parsed = get_query_parser().parse(payload["natural_query"])
+        if not parsed.confident:
+            cls.fallbacks += 1
+            return None
+        cls.served += 1
+        structured = {**parsed.params, **payload}
+        structured.pop("natural_query")
+        return structured
+
+    @classmethod
+    def stats(cls) -> dict:
+        """Return how often the fast path was used."""
+        total = cls.served + cls.fallbacks
+        return {
+            "served": cls.served,
+            "fallbacks": cls.fallbacks,
+            "served_rate": round(cls.served / total, 4) if total else 0.0,
+            "min_confidence": settings.NLQ_FAST_PATH_MIN_CONFIDENCE,
+        }
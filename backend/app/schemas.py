@@ -1,7 +1,7 @@
 """Pydantic models and schemas for API responses and requests."""
 
 from pydantic import BaseModel, Field, HttpUrl
-from typing import Optional
+from typing import Literal, Optional
 
 
 # ===== CV Analysis Models =====
@@ -109,6 +109,9 @@ class SearchRequest(BaseModel):
     similar_description_weight: Optional[float] = None
     title: Optional[str] = None
     similar_title_weight: Optional[float] = None
+    skills: Optional[list[str]] = None
+    skills_weight: Optional[float] = None
+    similar_skills_weight: Optional[float] = None
     states_include: Optional[list[str]] = None
     states_exclude: Optional[list[str]] = None
     search_cities_include: Optional[list[str]] = None
@@ -125,6 +128,7 @@ class SearchRequest(BaseModel):
     job_categories_exclude: Optional[list[str]] = None
     job_skills_include: Optional[list[str]] = None
     job_skills_exclude: Optional[list[str]] = None
+    mode: Optional[Literal["vector", "hybrid"]] = None
 
 
 class ErrorResponse(BaseModel):
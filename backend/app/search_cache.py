@@ -0,0 +1,88 @@
+"""Search result cache invalidated by Superlinked index writes."""
+
+import logging
+from typing import Any, Optional
+
+from app.cache import ResponseCache, build_cache, make_cache_key
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def read_index_generation(path: str) -> Optional[str]:
+    """
+    Read the index generation published by the Superlinked server.
+
+    Args:
+        path: Generation file on the volume shared with Superlinked
+
+    Returns:
+        Current generation, or None if it cannot be read
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+class SearchResultCache:
+    """
+    Cache complete search responses per canonical request and index generation.
+
+    Superlinked bumps the generation before and after every ingest, so
+    entries written before an ingest can no longer be looked up after it.
+    When the generation is unknown, nothing is cached at all rather than
+    risking stale results.
+    """
+
+    def __init__(self, cache: Optional[ResponseCache] = None):
+        """Initialize with an optional backing cache."""
+        self.cache = cache if cache is not None else build_cache(
+            settings.SEARCH_CACHE_BACKEND,
+            ttl=settings.SEARCH_CACHE_TTL,
+            max_bytes=settings.SEARCH_CACHE_MAX_BYTES,
+            path=settings.SEARCH_CACHE_PATH,
+            name="Search result cache"
+        )
+        self.uncacheable = 0
+
+    def key(self, route: str, payload: dict) -> Optional[str]:
+        """
+        Build the cache key for a normalized request under the current generation.
+
+        Args:
+            route: Superlinked query name
+            payload: Normalized request payload
+
+        Returns:
+            Cache key, or None if results must not be cached
+        """
+        if self.cache is None:
+            return None
+        generation = read_index_generation(settings.INDEX_GENERATION_PATH)
+        if generation is None:
+            self.uncacheable += 1
+            return None
+        return make_cache_key("search", route, generation, payload)
+
+    async def get(self, key: Optional[str]) -> Optional[Any]:
+        """Return the cached response for `key`, or None."""
+        if key is None:
+            return None
+        return await self.cache.get(key)
+
+    async def set(self, key: Optional[str], result: Any) -> None:
+        """Store a response under `key`."""
+        if key is not None:
+            await self.cache.set(key, result)
+
+    async def stats(self) -> dict:
+        """Return cache counters and the current index generation."""
+        stats = await self.cache.stats() if self.cache is not None else {"backend": None}
+        return {
+            "index_generation": read_index_generation(settings.INDEX_GENERATION_PATH),
+            "uncacheable": self.uncacheable,
+            **stats,
+        }
@@ -0,0 +1,134 @@
+"""Helpers for streaming LLM output as server-sent events."""
+
+import json
+from typing import Any, Optional
+
+
+def format_sse(event: str, data: Any) -> str:
+    """
+    Encode one server-sent event.
+
+    Args:
+        event: Event name
+        data: JSON-serializable payload
+
+    Returns:
+        SSE frame terminated by a blank line
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+class _Frame:
+    """Open JSON container while scanning."""
+
+    __slots__ = ("is_object", "start", "child", "expect_key")
+
+    def __init__(self, is_object: bool, start: int):
+        self.is_object = is_object
+        self.start = start
+        self.child: Any = None if is_object else 0
+        self.expect_key = is_object
+
+
+class IncrementalJSONParser:
+    """
+    Scan a JSON document as it arrives and report values as soon as they close.
+
+    Each call to `feed` returns `(path, value)` pairs for values that were
+    completed by the new text, where `path` is the tuple of object keys and
+    array indices leading to the value. Only values at depth 1 to `max_depth`
+    are reported, so a long comment string does not delay a score that was
+    already fully written before it.
+    """
+
+    _DELIMITERS = ",}] \t\r\n"
+
+    def __init__(self, max_depth: int = 2):
+        self.max_depth = max_depth
+        self._text = ""
+        self._pos = 0
+        self._stack: list[_Frame] = []
+        self._in_string = False
+        self._escape = False
+        self._token_start: Optional[int] = None
+        self._scalar_start: Optional[int] = None
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return self._text
+
+    def feed(self, chunk: str) -> list[tuple[tuple, Any]]:
+        """
+        Consume the next chunk of the document.
+
+        Args:
+            chunk: Newly received text
+
+        Returns:
+            Completed (path, value) pairs in document order
+        """
+        self._text += chunk
+        text = self._text
+        events: list[tuple[tuple, Any]] = []
+
+        while self._pos < len(text):
+            ch = text[self._pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._close_string(events)
+                self._pos += 1
+                continue
+
+            if self._scalar_start is not None:
+                if ch not in self._DELIMITERS:
+                    self._pos += 1
+                    continue
+                self._close_value(self._scalar_start, self._pos, events)
+                self._scalar_start = None
+
+            if ch == '"':
+                self._in_string = True
+                self._token_start = self._pos
+            elif ch in "{[":
+                self._stack.append(_Frame(ch == "{", self._pos))
+            elif ch in "}]":
+                if self._stack:
+                    frame = self._stack.pop()
+                    self._close_value(frame.start, self._pos + 1, events)
+            elif ch == ":":
+                if self._stack:
+                    self._stack[-1].expect_key = False
+            elif ch == ",":
+                if self._stack:
+                    frame = self._stack[-1]
+                    if frame.is_object:
+                        frame.expect_key = True
+                    else:
+                        frame.child += 1
+            elif not ch.isspace():
+                self._scalar_start = self._pos
+            self._pos += 1
+
+        return events
+
+    def _close_string(self, events: list) -> None:
+        start, end = self._token_start, self._pos + 1
+        if self._stack and self._stack[-1].is_object and self._stack[-1].expect_key:
+            self._stack[-1].child = json.loads(self._text[start:end])
+            return
+        self._close_value(start, end, events)
+
+    def _close_value(self, start: int, end: int, events: list) -> None:
+        path = tuple(frame.child for frame in self._stack)
+        if 1 <= len(path) <= self.max_depth:
+            try:
+                events.append((path, json.loads(self._text[start:end])))
+            except json.JSONDecodeError:
+                pass
@@ -0,0 +1,123 @@
+"""Pooled HTTP client for the Superlinked server."""
+
+import importlib.util
+import logging
+import time
+from typing import Any, Optional
+import httpx
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class SuperlinkedClientManager:
+    """Singleton manager for one keep-alive HTTP client to the Superlinked server."""
+
+    _instance = None
+    _http_client: Optional[httpx.AsyncClient] = None
+
+    def __new__(cls):
+        """Implement singleton pattern."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialize_client()
+        return cls._instance
+
+    def _initialize_client(self) -> None:
+        """Initialize the pooled client and usage counters."""
+        # HTTP/2 needs the optional `h2` package; fall back to HTTP/1.1 without it
+        http2 = settings.SUPERLINKED_HTTP2 and importlib.util.find_spec("h2") is not None
+        if settings.SUPERLINKED_HTTP2 and not http2:
+            logger.warning("SUPERLINKED_HTTP2 is set but the h2 package is missing, using HTTP/1.1")
+
+        self._http_client = httpx.AsyncClient(
+            base_url=settings.SUPERLINKED_URL,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.SUPERLINKED_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SUPERLINKED_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.SUPERLINKED_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(settings.SUPERLINKED_TIMEOUT, connect=10.0),
+        )
+        self.http2 = http2
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.connections_opened = 0
+        self.total_latency = 0.0
+        logger.info(f"Superlinked client initialized (http2={http2})")
+
+    async def post(
+        self,
+        path: str,
+        json: Any,
+        timeout: Optional[float] = None,
+        headers: Optional[dict] = None
+    ) -> httpx.Response:
+        """
+        Send a POST request over the shared connection pool.
+
+        Args:
+            path: Path relative to SUPERLINKED_URL
+            json: JSON request body
+            timeout: Read/write/pool timeout in seconds (defaults to SUPERLINKED_TIMEOUT)
+            headers: Extra request headers
+
+        Returns:
+            Upstream response
+
+        Raises:
+            httpx.RequestError: If the request cannot be completed
+        """
+        request_timeout = httpx.Timeout(
+            timeout if timeout is not None else settings.SUPERLINKED_TIMEOUT,
+            connect=10.0
+        )
+
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        start = time.perf_counter()
+        try:
+            return await self._http_client.post(
+                path,
+                json=json,
+                headers=headers,
+                timeout=request_timeout,
+                extensions={"trace": self._trace}
+            )
+        except httpx.RequestError:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self.total_latency += time.perf_counter() - start
+
+    def stats(self) -> dict:
+        """Return pool usage counters."""
+        return {
+            "http2": self.http2,
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "connections_opened": self.connections_opened,
+            "reuse_rate": round(1 - self.connections_opened / self.requests, 4) if self.requests else 0.0,
+            "avg_latency_ms": round(1000 * self.total_latency / self.requests, 2) if self.requests else 0.0,
+            "max_connections": settings.SUPERLINKED_MAX_CONNECTIONS,
+        }
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP transport."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            logger.info("Superlinked HTTP client closed")
+
+    async def _trace(self, event: str, info: dict) -> None:
+        # httpcore reports every new TCP connection; reused ones skip this step
+        if event == "connection.connect_tcp.complete":
+            self.connections_opened += 1
@@ -1,13 +1,20 @@
 """Utility functions for common operations."""
 
+import asyncio
 import json
 import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from io import BytesIO
 from typing import Optional, Tuple
 import hashlib
 import pdfplumber
-from fastapi import HTTPException
+from pdfplumber.utils.exceptions import PdfminerException
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
 
+from app.cache import ResponseCache, build_cache
 from app.config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -43,16 +50,189 @@ class CVValidator:
         return False, "Document does not appear to contain CV/resume content"
 
 
+class RequestSizeLimitMiddleware:
+    """ASGI middleware capping request bodies, whether or not a Content-Length is sent."""
+    
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+    
+    def _too_large(self) -> HTTPException:
+        return HTTPException(
+            status_code=413,
+            detail=f"Request exceeds maximum size of {self.max_bytes} bytes"
+        )
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        # A declared size is rejected before any of the body is read
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > self.max_bytes:
+            error = self._too_large()
+            response = JSONResponse(status_code=error.status_code, content={"detail": error.detail})
+            await response(scope, receive, send)
+            return
+        
+        # Chunked bodies are counted as they arrive, so multipart parsing stops
+        # spooling at the limit instead of after the whole upload
+        received = 0
+        
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise self._too_large()
+            return message
+        
+        await self.app(scope, limited_receive, send)
+
+
+class UploadReader:
+    """Utility class for validated, chunked upload ingestion."""
+    
+    PDF_MAGIC = b"%PDF-"
+    
+    @staticmethod
+    async def read_pdf(upload: UploadFile) -> Tuple[bytes, str]:
+        """
+        Read an uploaded PDF in chunks, rejecting bad input as early as possible.
+        
+        Starlette has already spooled the multipart body by the time this runs;
+        the request itself is capped while it is received by
+        RequestSizeLimitMiddleware. Here the declared content type and size are
+        checked before reading, the PDF signature is checked on the first chunk,
+        and reading stops as soon as the file size limit is passed. The file is
+        hashed while streaming.
+        
+        Args:
+            upload: Uploaded file
+            
+        Returns:
+            (content: bytes, sha256 hex digest: str)
+            
+        Raises:
+            HTTPException: If the file is empty, too large or not a PDF
+        """
+        if upload.content_type and upload.content_type not in settings.ALLOWED_FILE_TYPES:
+            raise HTTPException(
+                status_code=415,
+                detail=f"Unsupported file type: {upload.content_type}"
+            )
+        if upload.size is not None and upload.size > settings.MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File exceeds maximum size of {settings.MAX_FILE_SIZE} bytes"
+            )
+        
+        digest = hashlib.sha256()
+        chunks = []
+        total = 0
+        while chunk := await upload.read(settings.UPLOAD_CHUNK_SIZE):
+            if total == 0 and UploadReader.PDF_MAGIC not in chunk[:1024]:
+                raise HTTPException(status_code=415, detail="Uploaded file is not a PDF")
+            total += len(chunk)
+            if total > settings.MAX_FILE_SIZE:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File exceeds maximum size of {settings.MAX_FILE_SIZE} bytes"
+                )
+            digest.update(chunk)
+            chunks.append(chunk)
+        
+        if total == 0:
+            raise HTTPException(status_code=400, detail="Uploaded file is empty")
+        
+        return b"".join(chunks), digest.hexdigest()
+
+
+def _extract_pdf_text(file_content: bytes, max_pages: int, timeout: float) -> str:
+    """
+    Extract text from PDF bytes inside a worker process.
+    
+    Args:
+        file_content: Raw bytes of PDF file
+        max_pages: Maximum number of pages to read
+        timeout: Seconds after which no further pages are started
+        
+    Returns:
+        Extracted text, one newline-terminated block per page
+    """
+    deadline = time.monotonic() + timeout
+    parts = []
+    with pdfplumber.open(BytesIO(file_content)) as pdf:
+        if len(pdf.pages) > max_pages:
+            logger.warning(f"PDF has {len(pdf.pages)} pages, reading first {max_pages}")
+        for page in pdf.pages[:max_pages]:
+            if time.monotonic() > deadline:
+                raise TimeoutError("PDF extraction timed out")
+            extracted = page.extract_text()
+            if extracted:
+                parts.append(extracted)
+                parts.append("\n")
+    return "".join(parts)
+
+
 class PDFExtractor:
     """Utility class for PDF extraction."""
     
-    @staticmethod
-    async def extract_text_from_pdf(file_content: bytes) -> str:
+    _executor: Optional[ProcessPoolExecutor] = None
+    _text_cache: Optional[ResponseCache] = build_cache(
+        settings.PDF_TEXT_CACHE_BACKEND,
+        ttl=settings.PDF_TEXT_CACHE_TTL,
+        max_bytes=settings.PDF_TEXT_CACHE_MAX_BYTES,
+        path=settings.PDF_TEXT_CACHE_PATH,
+        name="PDF text cache"
+    )
+    
+    @classmethod
+    def _get_executor(cls) -> ProcessPoolExecutor:
+        """Get the bounded process pool, creating it on first use."""
+        if cls._executor is None:
+            cls._executor = ProcessPoolExecutor(max_workers=settings.PDF_MAX_WORKERS)
+        return cls._executor
+    
+    @classmethod
+    def shutdown(cls) -> None:
+        """Stop the extraction worker processes."""
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+    
+    @classmethod
+    def terminate(cls, executor: ProcessPoolExecutor) -> None:
+        """Kill the worker processes of a pool, including any still parsing, and drop it."""
+        if cls._executor is executor:
+            cls._executor = None
+        # shutdown() alone lets a running task finish; the next call creates a fresh pool
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+    
+    @classmethod
+    async def cache_stats(cls) -> dict:
+        """Return hit/miss counters for the extracted-text cache."""
+        if cls._text_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **(await cls._text_cache.stats())}
+    
+    @classmethod
+    async def extract_text_from_pdf(cls, file_content: bytes, digest: Optional[str] = None) -> str:
         """
         Extract text from PDF file.
         
+        Parsing runs in a bounded process pool with a per-document timeout
+        and page cap. Text is cached by the SHA-256 of the file, so the same
+        CV uploaded to several endpoints is parsed once.
+        
         Args:
             file_content: Raw bytes of PDF file
+            digest: SHA-256 hex digest of the bytes, if already computed
             
         Returns:
             Extracted text from all pages
@@ -60,23 +240,69 @@ class PDFExtractor:
         Raises:
             HTTPException: If PDF cannot be read or has invalid format
         """
+        digest = digest or hashlib.sha256(file_content).hexdigest()
+        cache_key = f"pdf:{digest}:{settings.PDF_MAX_PAGES}"
+        
+        text = None
+        if cls._text_cache is not None:
+            text = await cls._text_cache.get(cache_key)
+        
+        if text is None:
+            text = await cls._extract_in_pool(file_content)
+            if text.strip() and cls._text_cache is not None:
+                await cls._text_cache.set(cache_key, text)
+        
+        if not text.strip():
+            logger.warning("PDF file is empty or contains no text")
+            raise HTTPException(
+                status_code=400,
+                detail="Could not extract text from PDF"
+            )
+        
+        return text
+    
+    @classmethod
+    async def _extract_in_pool(cls, file_content: bytes) -> str:
+        """Run pdfplumber in a worker process."""
+        loop = asyncio.get_running_loop()
+        executor = cls._get_executor()
         try:
-            with pdfplumber.open(BytesIO(file_content)) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    extracted = page.extract_text()
-                    if extracted:
-                        text += extracted + "\n"
-                
-                if not text.strip():
-                    logger.warning("PDF file is empty or contains no text")
-                    raise HTTPException(
-                        status_code=400,
-                        detail="Could not extract text from PDF"
-                    )
-                
-                return text
-        except pdfplumber.exceptions.PDFException as e:
+            future = loop.run_in_executor(
+                executor,
+                _extract_pdf_text,
+                file_content,
+                settings.PDF_MAX_PAGES,
+                settings.PDF_EXTRACTION_TIMEOUT
+            )
+            done, _ = await asyncio.wait({future}, timeout=settings.PDF_EXTRACTION_TIMEOUT + 1.0)
+            if not done:
+                # Stuck inside a single page; the worker would keep parsing after we give up.
+                # Other extractions running in the pool fail with BrokenProcessPool.
+                logger.error("PDF extraction timed out, restarting the worker pool")
+                future.add_done_callback(lambda f: f.cancelled() or f.exception())
+                cls.terminate(executor)
+                raise HTTPException(
+                    status_code=400,
+                    detail="PDF is too complex to process"
+                )
+            return future.result()
+        except HTTPException:
+            raise
+        except TimeoutError:
+            # Page deadline inside the worker; the worker is free again
+            logger.error("PDF extraction timed out")
+            raise HTTPException(
+                status_code=400,
+                detail="PDF is too complex to process"
+            )
+        except BrokenProcessPool as e:
+            logger.error(f"PDF worker pool crashed: {e}")
+            cls.terminate(executor)
+            raise HTTPException(
+                status_code=400,
+                detail="Failed to process PDF"
+            )
+        except PdfminerException as e:
             logger.error(f"PDF parsing error: {e}")
             raise HTTPException(
                 status_code=400,
@@ -206,3 +432,25 @@ def parse_request_dict(data: dict) -> dict:
         Cleaned dictionary with non-None values
     """
     return {k: v for k, v in data.items() if v is not None}
+
+
+def normalize_search_payload(data: dict) -> dict:
+    """
+    Canonicalize a search payload so equivalent requests compare equal.
+    
+    Drops None values, collapses whitespace in the natural query and
+    sorts list-valued filters.
+    
+    Args:
+        data: Raw request data
+        
+    Returns:
+        Normalized payload dictionary
+    """
+    payload = parse_request_dict(data)
+    if isinstance(payload.get('natural_query'), str):
+        payload['natural_query'] = " ".join(payload['natural_query'].split())
+    for key, value in payload.items():
+        if isinstance(value, list):
+            payload[key] = sorted(value)
+    return payload
@@ -0,0 +1,104 @@
+"""Job dataset vocabularies shared by the local CV and query parsers."""
+
+import json
+import logging
+import re
+from functools import lru_cache
+from typing import Iterable
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Skills listed in the Superlinked NLQ prompt, used when schema.json has no skills_list
+DEFAULT_SKILLS = [
+    "SQL", "Python", "AWS", "Java", "Data Analysis", "Communication", "Tableau", "Agile",
+    "JavaScript", "Power BI", "Data Visualization", "Machine Learning", "Azure", "Excel",
+    "Git", "Kubernetes", "Docker", "C#", "Project Management", "ETL", "C++", "Spark",
+    "Linux", "Data Science", "Reporting", "Data Analytics", "Snowflake", "Problem Solving",
+    "Statistics", "Data Engineering", "Teamwork", "React", "Kafka", "DevOps", "Collaboration",
+    "Software Development", "Software Engineering", "Scrum", "Business Intelligence",
+    "Data Modeling", "Scala", "GCP", "Business Analysis", "Computer Science", "NoSQL",
+    "HTML", "Data Warehousing",
+]
+
+
+@lru_cache(maxsize=1)
+def load_job_schema() -> dict:
+    """
+    Load categorical field options produced by scripts/normalize_jobs.py.
+
+    Returns:
+        Mapping of field name to its list of values (empty if unavailable)
+    """
+    try:
+        with open(settings.JOB_SCHEMA_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Job schema not available at {settings.JOB_SCHEMA_PATH}: {e}")
+        return {}
+
+
+class SkillMatcher:
+    """Find vocabulary skills mentioned in free text."""
+
+    def __init__(self, skills: Iterable[str]):
+        """Compile one pattern over the vocabulary, longest skills first."""
+        self.canonical: dict[str, str] = {}
+        for skill in skills:
+            skill = skill.strip()
+            if skill:
+                # Keep the first spelling of case variants ('Machine Learning' / 'Machine learning')
+                self.canonical.setdefault(skill.casefold(), skill)
+
+        alternatives = sorted(self.canonical.values(), key=len, reverse=True)
+        # Very short skills ('R', 'Go') are only matched with their exact casing
+        long_skills = [re.escape(s) for s in alternatives if len(s) > 2]
+        short_skills = [re.escape(s) for s in alternatives if len(s) <= 2]
+        parts = []
+        if long_skills:
+            parts.append(f"(?i:{'|'.join(long_skills)})")
+        if short_skills:
+            parts.append("|".join(short_skills))
+        self._pattern = (
+            re.compile(rf"(?<![\w+#.])(?:{'|'.join(parts)})(?![\w+#])") if parts else None
+        )
+
+    def find(self, text: str) -> list[str]:
+        """
+        Return vocabulary skills found in `text`, in order of first mention.
+
+        Args:
+            text: Free text to scan
+
+        Returns:
+            Canonical skill names without duplicates
+        """
+        found: dict[str, None] = {}
+        for skill, _, _ in self.matches(text):
+            found.setdefault(skill, None)
+        return list(found)
+
+    def matches(self, text: str) -> list[tuple[str, int, int]]:
+        """
+        Return every skill mention with its character span.
+
+        Args:
+            text: Free text to scan
+
+        Returns:
+            (canonical skill, start, end) tuples in text order
+        """
+        if self._pattern is None:
+            return []
+        return [
+            (self.canonical[match.group(0).casefold()], match.start(), match.end())
+            for match in self._pattern.finditer(text)
+        ]
+
+
+@lru_cache(maxsize=1)
+def get_skill_matcher() -> SkillMatcher:
+    """Return the matcher over schema.json skills, falling back to DEFAULT_SKILLS."""
+    return SkillMatcher(load_job_schema().get("skills_list") or DEFAULT_SKILLS)
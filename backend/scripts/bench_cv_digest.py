@@ -0,0 +1,146 @@
+"""Benchmark NLQ input size and latency for raw CV text vs the compact CV digest.
+
+For every CV in the fixture directory (.txt or .pdf) this prints the size of
+the raw text and of the digest, with token estimates and digest build time.
+
+With --superlinked-url, each variant is also sent to the cv-job search
+endpoint of a running Superlinked server, which measures the real NLQ
+latency. With --llm, the Superlinked CV system prompt is sent straight to
+the OpenAI-compatible NLQ model and prompt tokens are taken from its usage.
+
+Usage (from the backend directory):
+    python -m scripts.bench_cv_digest
+    python -m scripts.bench_cv_digest --superlinked-url http://localhost:8080
+    python -m scripts.bench_cv_digest --llm --model meta-llama/llama-4-maverick-17b-128e-instruct
+"""
+
+import argparse
+import ast
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "cvs")
+NLQ_PATH = os.path.join(os.path.dirname(__file__), "..", "superlinked_app", "nlq.py")
+
+
+def load_cvs(directory: str) -> dict[str, str]:
+    """Read fixture CVs as text."""
+    from app.utils import _extract_pdf_text
+
+    cvs = {}
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if name.endswith(".txt"):
+            with open(path, encoding="utf-8") as f:
+                cvs[name] = f.read()
+        elif name.endswith(".pdf"):
+            with open(path, "rb") as f:
+                cvs[name] = _extract_pdf_text(f.read(), max_pages=20, timeout=30.0)
+    return cvs
+
+
+def load_cv_system_prompt() -> str:
+    """Read `cv_system_prompt` from superlinked_app/nlq.py without importing superlinked."""
+    with open(NLQ_PATH, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and getattr(node.targets[0], "id", None) == "cv_system_prompt":
+            return ast.literal_eval(node.value)
+    raise RuntimeError("cv_system_prompt not found in nlq.py")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English text)."""
+    return max(1, len(text) // 4)
+
+
+async def time_superlinked(client: httpx.AsyncClient, url: str, query: str) -> float:
+    start = time.perf_counter()
+    response = await client.post(
+        f"{url}/api/v1/search/cv-job",
+        json={"natural_query": query, "limit": 10},
+        headers={"x-include-metadata": "true"}
+    )
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def time_llm(client, model: str, system_prompt: str, query: str) -> tuple[float, int]:
+    start = time.perf_counter()
+    completion = await client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": query}
+        ],
+        temperature=0,
+        max_tokens=300
+    )
+    return time.perf_counter() - start, completion.usage.prompt_tokens
+
+
+async def main(args: argparse.Namespace) -> None:
+    from app.cv_digest import CVDigester
+
+    cvs = load_cvs(args.cv_dir)
+    if not cvs:
+        raise SystemExit(f"No .txt or .pdf CVs found in {args.cv_dir}")
+
+    rows = []
+    for name, text in cvs.items():
+        start = time.perf_counter()
+        digest = CVDigester.to_query(text)
+        digest_ms = 1000 * (time.perf_counter() - start)
+        rows.append({"name": name, "raw": text, "digest": digest, "digest_ms": digest_ms})
+
+    print(f"{'cv':<32} {'raw chars':>9} {'~tokens':>8} {'digest chars':>12} {'~tokens':>8} {'build ms':>8}")
+    for row in rows:
+        print(
+            f"{row['name']:<32} {len(row['raw']):>9} {estimate_tokens(row['raw']):>8} "
+            f"{len(row['digest']):>12} {estimate_tokens(row['digest']):>8} {row['digest_ms']:>8.2f}"
+        )
+    raw_tokens = sum(estimate_tokens(row["raw"]) for row in rows)
+    digest_tokens = sum(estimate_tokens(row["digest"]) for row in rows)
+    print(f"Input tokens reduced by {100 * (1 - digest_tokens / raw_tokens):.1f}% overall")
+
+    if args.superlinked_url:
+        async with httpx.AsyncClient(timeout=120.0) as client:
+            for variant in ("raw", "digest"):
+                latencies = []
+                for row in rows:
+                    for _ in range(args.repeat):
+                        latencies.append(await time_superlinked(client, args.superlinked_url, row[variant]))
+                print(f"Superlinked cv-job {variant:<6} median latency: {1000 * statistics.median(latencies):8.1f}ms")
+
+    if args.llm:
+        from openai import AsyncOpenAI
+        from app.config import get_settings
+
+        settings = get_settings()
+        client = AsyncOpenAI(api_key=settings.GROQ_API_KEY, base_url=settings.GROQ_BASE_URL)
+        system_prompt = load_cv_system_prompt()
+        for variant in ("raw", "digest"):
+            latencies, tokens = [], []
+            for row in rows:
+                for _ in range(args.repeat):
+                    latency, prompt_tokens = await time_llm(client, args.model, system_prompt, row[variant])
+                    latencies.append(latency)
+                    tokens.append(prompt_tokens)
+            print(
+                f"LLM {variant:<6} median latency: {1000 * statistics.median(latencies):8.1f}ms  "
+                f"mean prompt tokens: {statistics.mean(tokens):8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cv-dir", default=FIXTURE_DIR)
+    parser.add_argument("--superlinked-url", default=None, help="Running Superlinked server to time cv-job searches")
+    parser.add_argument("--llm", action="store_true", help="Time the NLQ model directly")
+    parser.add_argument("--model", default="meta-llama/llama-4-maverick-17b-128e-instruct")
+    parser.add_argument("--repeat", type=int, default=3)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,133 @@
+"""Benchmark dataset load time and peak memory: jobs.csv vs jobs.parquet.
+
+Each variant is read the way a loader consumes it, in a fresh subprocess so
+peak RSS is measured in isolation:
+- csv: chunked pd.read_csv with the job_skills converter (Superlinked CSV loader)
+- parquet: whole pd.read_parquet, then chunk_size slices (Superlinked Parquet loader)
+- parquet-row-groups: pyarrow row-group streaming (scripts/ingest_delta.py)
+
+Usage (from the backend directory):
+    python -m scripts.bench_dataset_formats --dataset data/jobs.csv
+    python -m scripts.bench_dataset_formats --synthetic 200000
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+CHUNK_SIZE = 1000
+VARIANTS = ["csv", "parquet", "parquet-row-groups"]
+WORDS = (
+    "data pipeline analytics team build scalable models stakeholders reporting cloud platform "
+    "experience design develop maintain business insights customers product engineering quality"
+).split()
+SKILLS = ["SQL", "Python", "AWS", "Java", "Tableau", "Excel", "Spark", "Docker", "Kubernetes", "Git", "Azure", "ETL"]
+
+
+def make_synthetic_csv(rows: int, path: str) -> None:
+    """Write a jobs.csv-shaped file with realistic text and category sizes."""
+    random.seed(0)
+    cities = [f"City {i}" for i in range(3000)]
+    companies = [f"Company {i}" for i in range(20000)]
+    pd.DataFrame({
+        "job_link": [f"https://www.linkedin.com/jobs/view/{i}" for i in range(rows)],
+        "id": [str(i) for i in range(rows)],
+        "job_title": [random.choice(["Data Analyst", "Senior Data Engineer", "Software Engineer"]) for _ in range(rows)],
+        "job_summary": [" ".join(random.choices(WORDS, k=300)) for _ in range(rows)],
+        "company": [random.choice(companies) for _ in range(rows)],
+        "job_skills": [", ".join(random.sample(SKILLS, 6)) for _ in range(rows)],
+        "job_location": [random.choice(cities) for _ in range(rows)],
+        "search_city": [random.choice(cities) for _ in range(rows)],
+        "search_country": [random.choice(["United States", "United Kingdom", "Canada", "Australia"]) for _ in range(rows)],
+        "job_level": [random.choice(["Associate", "Mid Senior"]) for _ in range(rows)],
+        "job_type": [random.choice(["Onsite", "Hybrid", "Remote"]) for _ in range(rows)],
+        "job_category": [random.choice(["data_analyst", "data_engineer", "software_engineer"]) for _ in range(rows)],
+    }).to_csv(path, index=False)
+
+
+def load(variant: str, path: str) -> int:
+    """Read the whole dataset the way `variant` does and return the row count."""
+    rows = 0
+    if variant == "csv":
+        converters = {
+            "job_skills": lambda x: [skill.strip() for skill in str(x).split(',')] if x and str(x) != 'nan' else []
+        }
+        for chunk in pd.read_csv(path, chunksize=CHUNK_SIZE, converters=converters):
+            rows += len(chunk)
+    elif variant == "parquet":
+        df = pd.read_parquet(path, engine="pyarrow")
+        for start in range(0, len(df), CHUNK_SIZE):
+            rows += len(df.iloc[start:start + CHUNK_SIZE])
+    else:
+        from scripts.jobs_parquet import iter_jobs_parquet
+        for chunk in iter_jobs_parquet(path, CHUNK_SIZE):
+            rows += len(chunk)
+    return rows
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process (ru_maxrss would include the parent's peak across exec)."""
+    with open("/proc/self/status", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def run_worker(variant: str, path: str) -> None:
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    rows = load(variant, path)
+    elapsed = time.perf_counter() - start
+    peak = peak_rss_mb()
+    print(json.dumps({"rows": rows, "seconds": elapsed, "peak_mb": peak, "added_mb": peak - baseline}))
+
+
+def main(args: argparse.Namespace) -> None:
+    if args.worker:
+        run_worker(args.worker, args.dataset)
+        return
+
+    from scripts.jobs_parquet import write_jobs_parquet
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = args.dataset
+        if args.synthetic:
+            csv_path = os.path.join(tmp, "jobs.csv")
+            make_synthetic_csv(args.synthetic, csv_path)
+        parquet_path = os.path.join(tmp, "jobs.parquet")
+        start = time.perf_counter()
+        write_jobs_parquet(pd.read_csv(csv_path), parquet_path, CHUNK_SIZE)
+        print(f"Wrote Parquet copy in {time.perf_counter() - start:.1f}s")
+        print(
+            f"File size: csv {os.path.getsize(csv_path) / 2**20:.1f} MB, "
+            f"parquet {os.path.getsize(parquet_path) / 2**20:.1f} MB"
+        )
+
+        print(f"{'variant':<20} {'rows':>9} {'seconds':>8} {'rows/s':>10} {'peak RSS MB':>12} {'added MB':>9}")
+        for variant in VARIANTS:
+            path = csv_path if variant == "csv" else parquet_path
+            completed = subprocess.run(
+                [sys.executable, "-m", "scripts.bench_dataset_formats", "--worker", variant, "--dataset", path],
+                capture_output=True, text=True, check=True
+            )
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            print(
+                f"{variant:<20} {result['rows']:>9} {result['seconds']:>8.2f} "
+                f"{result['rows'] / result['seconds']:>10.0f} {result['peak_mb']:>12.1f} {result['added_mb']:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", default=os.path.join(os.path.dirname(__file__), "..", "data", "jobs.csv"))
+    parser.add_argument("--synthetic", type=int, default=0, help="Benchmark a generated dataset with this many rows")
+    parser.add_argument("--worker", choices=VARIANTS, help=argparse.SUPPRESS)
+    main(parser.parse_args())
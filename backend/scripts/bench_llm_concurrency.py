@@ -0,0 +1,105 @@
+"""Benchmark LLMOperations throughput against a local stand-in LLM server.
+
+Starts an OpenAI-compatible server that answers every chat completion after a
+fixed delay, then fires batches of concurrent CV analyses through
+LLMOperations. With non-blocking clients, throughput should grow with the
+number of concurrent requests instead of staying at one request per delay.
+
+Usage (from the backend directory):
+    python -m scripts.bench_llm_concurrency --requests 50 --delay 0.5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import threading
+import time
+
+import uvicorn
+from fastapi import FastAPI
+
+
+def build_stub_app(delay: float) -> FastAPI:
+    """Create a stand-in OpenAI-compatible completion server."""
+    stub = FastAPI()
+    content = json.dumps({
+        "analysis_results": {
+            "match_score": {"value": 72, "unit": "percentage"},
+            "target_role": "Data Analyst",
+            "strong_skills": ["SQL", "Python"],
+            "strong_skills_comment": "Solid querying skills.",
+            "skills_to_develop": ["Tableau"],
+            "skills_to_develop_comment": "Build a dashboard portfolio."
+        },
+        "suggested_learning_resources": []
+    })
+
+    @stub.post("/chat/completions")
+    async def chat_completions(body: dict) -> dict:
+        await asyncio.sleep(delay)
+        return {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        }
+
+    return stub
+
+
+def start_stub_server(delay: float) -> str:
+    """Run the stand-in server in a background thread and return its base URL."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    config = uvicorn.Config(build_stub_app(delay), host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+async def run_batch(llm_ops, total: int, concurrency: int) -> float:
+    """Send `total` analyses with at most `concurrency` in flight; return req/s."""
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with gate:
+            await llm_ops.analyze_cv_with_job(f"CV {i}", f"Job posting {i}", "system")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return total / (time.perf_counter() - start)
+
+
+async def main(args: argparse.Namespace) -> None:
+    # Settings are read at import time, so point them at the stub first
+    os.environ["GROQ_BASE_URL"] = start_stub_server(args.delay)
+    os.environ.setdefault("GROQ_API_KEY", "bench")
+
+    from app.llm_client import LLMOperations, LLMClientManager
+
+    llm_ops = LLMOperations()
+    print(f"Stub latency: {args.delay:.2f}s, requests per run: {args.requests}")
+    for concurrency in args.concurrency:
+        throughput = await run_batch(llm_ops, args.requests, concurrency)
+        print(f"concurrency={concurrency:>3}  throughput={throughput:7.2f} req/s")
+    await LLMClientManager().aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.5, help="Stub completion latency in seconds")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    asyncio.run(main(parser.parse_args()))
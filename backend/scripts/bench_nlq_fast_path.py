@@ -0,0 +1,144 @@
+"""Benchmark the rule-based NLQ fast path for speed, coverage and accuracy.
+
+Parses every query in the query set locally and reports how many would skip
+the LLM, plus parse latency percentiles. If a recorded set of LLM parses
+exists, each confident local parse is compared field by field with the
+parameters Superlinked's NLQ step produced for the same query.
+
+Recording queries the NLQ model through a running Superlinked server and
+stores `metadata.search_params` for every query:
+    python -m scripts.bench_nlq_fast_path --record --superlinked-url http://localhost:8080
+
+Usage (from the backend directory):
+    python -m scripts.bench_nlq_fast_path
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+
+import httpx
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+QUERIES_PATH = os.path.join(FIXTURE_DIR, "nlq_queries.txt")
+RECORDED_PATH = os.path.join(FIXTURE_DIR, "nlq_queries.recorded.jsonl")
+
+# Fields the local parser fills, compared against the LLM parse
+COMPARED_FIELDS = [
+    "title",
+    "job_categories_include",
+    "job_levels_include",
+    "job_types_include",
+    "search_countries_include",
+    "states_include",
+    "search_cities_include",
+]
+
+
+def load_queries(path: str) -> list[str]:
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def record(queries: list[str], url: str, path: str) -> None:
+    """Store the LLM parse of every query."""
+    with httpx.Client(timeout=120.0) as client, open(path, "w", encoding="utf-8") as out:
+        for query in queries:
+            response = client.post(
+                f"{url}/api/v1/search/job",
+                json={"natural_query": query, "limit": 1},
+                headers={"x-include-metadata": "true"}
+            )
+            response.raise_for_status()
+            params = response.json().get("metadata", {}).get("search_params", {})
+            out.write(json.dumps({"query": query, "llm_params": params}, ensure_ascii=False) + "\n")
+            print(f"recorded: {query}")
+
+
+def normalize(value):
+    """Treat empty values alike and compare case-insensitively."""
+    if value in (None, "", []):
+        return None
+    if isinstance(value, list):
+        return frozenset(str(v).casefold() for v in value)
+    return str(value).casefold()
+
+
+def main(args: argparse.Namespace) -> None:
+    from app.query_parser import get_query_parser
+
+    queries = load_queries(args.queries)
+    if args.record:
+        if not args.superlinked_url:
+            raise SystemExit("--record needs --superlinked-url")
+        record(queries, args.superlinked_url, args.recorded)
+
+    parser = get_query_parser()
+    parses = {}
+    latencies = []
+    for query in queries:
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            parsed = parser.parse(query)
+            latencies.append(time.perf_counter() - start)
+        parses[query] = parsed
+
+    confident = [q for q, p in parses.items() if p.confident]
+    latencies.sort()
+    print(f"Queries: {len(queries)}, served locally: {len(confident)} ({100 * len(confident) / len(queries):.1f}%)")
+    print(
+        f"Parse latency: p50={1e6 * statistics.median(latencies):.1f}us  "
+        f"p99={1e6 * latencies[int(0.99 * (len(latencies) - 1))]:.1f}us"
+    )
+    if args.verbose:
+        for query, parsed in parses.items():
+            mark = "FAST" if parsed.confident else "LLM "
+            print(f"  [{mark}] {parsed.confidence:.2f} {query} -> {parsed.params} unparsed={parsed.unparsed}")
+
+    if not os.path.exists(args.recorded):
+        print(f"No recorded LLM parses at {args.recorded}; run with --record to measure accuracy")
+        return
+
+    with open(args.recorded, encoding="utf-8") as f:
+        recorded = {row["query"]: row["llm_params"] for row in map(json.loads, f)}
+
+    agree = {name: 0 for name in COMPARED_FIELDS}
+    exact = 0
+    compared = 0
+    for query in confident:
+        if query not in recorded:
+            continue
+        compared += 1
+        local, llm = parses[query].params, recorded[query]
+        matches = [normalize(local.get(name)) == normalize(llm.get(name)) for name in COMPARED_FIELDS]
+        for name, ok in zip(COMPARED_FIELDS, matches):
+            agree[name] += ok
+        if all(matches):
+            exact += 1
+        elif args.verbose:
+            diff = {
+                name: (local.get(name), llm.get(name))
+                for name, ok in zip(COMPARED_FIELDS, matches) if not ok
+            }
+            print(f"  mismatch: {query} -> {diff}")
+
+    if not compared:
+        print("No confident queries have a recorded LLM parse")
+        return
+    print(f"Accuracy on {compared} locally served queries (agreement with the LLM parse):")
+    for name in COMPARED_FIELDS:
+        print(f"  {name:<26} {100 * agree[name] / compared:6.1f}%")
+    print(f"  {'all fields':<26} {100 * exact / compared:6.1f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", default=QUERIES_PATH)
+    parser.add_argument("--recorded", default=RECORDED_PATH)
+    parser.add_argument("--record", action="store_true", help="Record LLM parses before comparing")
+    parser.add_argument("--superlinked-url", default=None)
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    main(parser.parse_args())
@@ -0,0 +1,175 @@
+"""Benchmark kNN latency of a global index against one partitioned by country and category.
+
+A synthetic job collection, --scale times the --base-points of
+bench_qdrant_filters (10x by default), is loaded into Qdrant twice:
+- global: keyword payload indexes only; country and category are plain filters
+- partitioned: plus the `partitions` tenant index (PARTITIONED_INDEX=true), and
+  searches routed like superlinked_app/partitions.py does: one partition gets a
+  partition condition, a few are searched as one batch request and merged
+The workload mirrors real traffic: mostly one country and one category, some
+searches over two categories, and a few without either filter. For each setup
+and query kind it reports p50/p95/p99 latency, and recall@10 against exact
+search on the global collection.
+
+Usage (from the backend directory, against a scratch Qdrant):
+    python -m scripts.bench_partitions --qdrant-url http://localhost:6333
+    python -m scripts.bench_partitions --base-points 50000 --scale 10 --dim 384
+"""
+
+import argparse
+import heapq
+import random
+import statistics
+import time
+
+import httpx
+import numpy as np
+
+from scripts.bench_qdrant_filters import CARDINALITY, field, make_payload, resident_mb, wait_green
+
+VECTOR = "index"
+PARTITIONS = field("partitions")
+# Share of each query kind in the workload
+QUERY_KINDS = {"1 partition": 0.8, "2 partitions": 0.15, "unrouted": 0.05}
+
+
+def value(rng: random.Random, name: str) -> str:
+    return f"{name}_{min(int(rng.paretovariate(1.2)) - 1, CARDINALITY[name] - 1)}"
+
+
+def partition_key(country: str, category: str) -> str:
+    return f"{country}|{category}"
+
+
+def load(client: httpx.Client, name: str, args: argparse.Namespace, partitioned: bool) -> None:
+    client.delete(f"/collections/{name}")
+    client.put(f"/collections/{name}", json={
+        "vectors": {VECTOR: {"size": args.dim, "distance": "Dot"}},
+    }).raise_for_status()
+    # Indexes exist before the upload, so the tenant index groups points as segments are built
+    for payload_field in [*CARDINALITY, "job_skills"]:
+        client.put(f"/collections/{name}/index", params={"wait": "true"},
+                   json={"field_name": field(payload_field), "field_schema": "keyword"}).raise_for_status()
+    if partitioned:
+        client.put(f"/collections/{name}/index", params={"wait": "true"}, json={
+            "field_name": PARTITIONS, "field_schema": {"type": "keyword", "is_tenant": True},
+        }).raise_for_status()
+    rng = random.Random(0)
+    np_rng = np.random.default_rng(0)
+    points = args.base_points * args.scale
+    for start in range(0, points, args.batch_size):
+        count = min(args.batch_size, points - start)
+        vectors = np_rng.standard_normal((count, args.dim), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        batch = []
+        for i, vector in enumerate(vectors):
+            payload = make_payload(rng)
+            if partitioned:
+                payload[PARTITIONS] = [partition_key(payload[field("search_country")], payload[field("job_category")])]
+            batch.append({"id": start + i, "vector": {VECTOR: vector.tolist()}, "payload": payload})
+        client.put(f"/collections/{name}/points", params={"wait": "true"},
+                   json={"points": batch}).raise_for_status()
+    wait_green(client, name)
+
+
+def make_workload(args: argparse.Namespace) -> list[tuple[str, list[float], list[str], list[str]]]:
+    rng = random.Random(1)
+    np_rng = np.random.default_rng(1)
+    workload = []
+    for _ in range(args.queries):
+        kind = rng.choices(list(QUERY_KINDS), weights=list(QUERY_KINDS.values()))[0]
+        vector = np_rng.standard_normal(args.dim, dtype=np.float32)
+        countries, categories = [], []
+        if kind != "unrouted":
+            countries = [value(rng, "search_country")]
+            categories = [value(rng, "job_category")]
+            while kind == "2 partitions" and len(categories) < 2:
+                categories = list(dict.fromkeys([*categories, value(rng, "job_category")]))
+        workload.append((kind, (vector / np.linalg.norm(vector)).tolist(), countries, categories))
+    return workload
+
+
+def base_filter(countries: list[str], categories: list[str]) -> dict | None:
+    conditions = []
+    if countries:
+        conditions.append({"key": field("search_country"), "match": {"any": countries}})
+    if categories:
+        conditions.append({"key": field("job_category"), "match": {"any": categories}})
+    return {"must": conditions} if conditions else None
+
+
+def search(client: httpx.Client, name: str, vector: list[float], countries: list[str], categories: list[str],
+           routed: bool, exact: bool) -> list[int]:
+    query_filter = base_filter(countries, categories)
+    partitions = [partition_key(country, category) for country in countries for category in categories]
+    request = {"query": vector, "using": VECTOR, "limit": 10, "params": {"exact": exact}, "with_payload": False}
+    if not routed or not partitions:
+        response = client.post(f"/collections/{name}/points/query", json={**request, "filter": query_filter})
+        return [point["id"] for point in response.raise_for_status().json()["result"]["points"]]
+    searches = [
+        {**request, "filter": {"must": [*query_filter["must"], {"key": PARTITIONS, "match": {"value": partition}}]}}
+        for partition in partitions
+    ]
+    if len(searches) == 1:
+        response = client.post(f"/collections/{name}/points/query", json=searches[0])
+        return [point["id"] for point in response.raise_for_status().json()["result"]["points"]]
+    response = client.post(f"/collections/{name}/points/query/batch", json={"searches": searches})
+    results = [result["points"] for result in response.raise_for_status().json()["result"]]
+    merged = heapq.merge(*results, key=lambda point: -point["score"])
+    return list(dict.fromkeys(point["id"] for point in merged))[:10]
+
+
+def run(client: httpx.Client, name: str, workload: list, routed: bool, exact: bool = False) -> tuple[dict, list]:
+    latencies = {kind: [] for kind in QUERY_KINDS}
+    results = []
+    for kind, vector, countries, categories in workload:
+        start = time.perf_counter()
+        results.append(search(client, name, vector, countries, categories, routed, exact))
+        latencies[kind].append((time.perf_counter() - start) * 1000)
+    return latencies, results
+
+
+def main(args: argparse.Namespace) -> None:
+    workload = make_workload(args)
+    truth = None
+    print(f"{args.base_points * args.scale} points ({args.scale}x {args.base_points}), {args.dim}-d, "
+          f"{len(workload)} queries")
+    print(f"{'setup':<12} {'queries':<13} {'n':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'recall@10':>10} "
+          f"{'Qdrant RSS MB':>14}")
+    with httpx.Client(base_url=args.qdrant_url, timeout=httpx.Timeout(60.0, read=None)) as client:
+        for setup, partitioned in [("global", False), ("partitioned", True)]:
+            name = f"bench_partitions_{setup}"
+            baseline_mb = resident_mb(client)
+            start = time.perf_counter()
+            load(client, name, args, partitioned)
+            print(f"Loaded {setup} in {time.perf_counter() - start:.0f}s")
+            memory = resident_mb(client)
+            if truth is None:
+                _, truth = run(client, name, workload, routed=False, exact=True)
+            run(client, name, workload[:50], partitioned)  # warm-up
+            latencies, results = run(client, name, workload, partitioned)
+            memory_text = f"{memory - baseline_mb:.0f}" if memory is not None and baseline_mb is not None else "n/a"
+            for kind, values in latencies.items():
+                if len(values) < 2:
+                    continue
+                recall = statistics.mean(
+                    len(set(found) & set(expected)) / len(expected) if expected else 1.0
+                    for (query_kind, *_), found, expected in zip(workload, results, truth) if query_kind == kind
+                )
+                quantiles = statistics.quantiles(values, n=100)
+                print(f"{setup:<12} {kind:<13} {len(values):>5} {statistics.median(values):>8.2f} "
+                      f"{quantiles[94]:>8.2f} {quantiles[98]:>8.2f} {recall:>10.3f} {memory_text:>14}")
+            if not args.keep:
+                client.delete(f"/collections/{name}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--qdrant-url", default="http://localhost:6333")
+    parser.add_argument("--base-points", type=int, default=100000, help="Size of the unscaled dataset")
+    parser.add_argument("--scale", type=int, default=10, help="Dataset scale factor")
+    parser.add_argument("--dim", type=int, default=768, help="Index vector size (two 384-d text spaces)")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch collections")
+    main(parser.parse_args())
@@ -0,0 +1,166 @@
+"""Benchmark filtered kNN latency and memory in Qdrant under the collection tunings.
+
+A scratch collection shaped like the Superlinked job index is searched with the
+filter combinations the NLQ produces. The same workload runs under four setups:
+- flat: exact search, no payload indexes (the previous server setup)
+- flat+index: exact search with keyword payload indexes
+- hnsw+index: HNSW search (QDRANT_SEARCH_ALGORITHM=hnsw)
+- hnsw+index+int8: plus scalar quantization (QDRANT_QUANTIZATION=true)
+For each setup it reports p50/p95 latency, recall@10 against exact search, and
+Qdrant's resident memory (from /metrics).
+
+Usage (from the backend directory, against a scratch Qdrant):
+    python -m scripts.bench_qdrant_filters --qdrant-url http://localhost:6333
+    python -m scripts.bench_qdrant_filters --points 300000 --queries 500
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+import httpx
+import numpy as np
+
+COLLECTION = "bench_filters"
+VECTOR = "index"
+# Payload keys as Superlinked names them, with value counts close to the job dataset
+FIELD_PREFIX = "__schema_field__JobPosting_"
+CARDINALITY = {
+    "search_country": 4, "job_type": 3, "job_level": 2, "job_category": 5,
+    "state": 50, "search_city": 1000, "company": 20000,
+}
+SKILLS = 500
+
+
+def field(name: str) -> str:
+    return FIELD_PREFIX + name
+
+
+def make_payload(rng: random.Random) -> dict:
+    payload = {field(name): f"{name}_{min(int(rng.paretovariate(1.2)) - 1, count - 1)}" for name, count in CARDINALITY.items()}
+    payload[field("job_skills")] = [f"skill_{int(rng.paretovariate(1.1)) % SKILLS}" for _ in range(rng.randint(3, 10))]
+    return payload
+
+
+def make_filter(rng: random.Random) -> dict:
+    """One to three conditions, like the include filters the NLQ fills in."""
+    names = rng.sample([*CARDINALITY, "job_skills"], rng.randint(1, 3))
+    conditions = []
+    for name in names:
+        count = SKILLS if name == "job_skills" else CARDINALITY[name]
+        values = [f"{'skill' if name == 'job_skills' else name}_{min(int(rng.paretovariate(1.2)) - 1, count - 1)}"
+                  for _ in range(rng.randint(1, 2))]
+        conditions.append({"key": field(name), "match": {"any": values}})
+    return {"must": conditions}
+
+
+def wait_green(client: httpx.Client, collection: str = COLLECTION) -> None:
+    """Wait until Qdrant has finished indexing/optimizing the collection."""
+    while True:
+        info = client.get(f"/collections/{collection}").raise_for_status().json()["result"]
+        if info["status"] == "green" and info.get("optimizer_status") == "ok":
+            return
+        time.sleep(1)
+
+
+def resident_mb(client: httpx.Client) -> float | None:
+    for line in client.get("/metrics").text.splitlines():
+        if line.startswith("memory_resident_bytes"):
+            return float(line.split()[-1]) / 2**20
+    return None
+
+
+def load(client: httpx.Client, points: int, dim: int, batch_size: int) -> None:
+    client.delete(f"/collections/{COLLECTION}")
+    client.put(f"/collections/{COLLECTION}", json={
+        "vectors": {VECTOR: {"size": dim, "distance": "Dot"}},
+    }).raise_for_status()
+    rng = random.Random(0)
+    np_rng = np.random.default_rng(0)
+    for start in range(0, points, batch_size):
+        count = min(batch_size, points - start)
+        vectors = np_rng.standard_normal((count, dim), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        client.put(f"/collections/{COLLECTION}/points", params={"wait": "true"}, json={"points": [
+            {"id": start + i, "vector": {VECTOR: vector.tolist()}, "payload": make_payload(rng)}
+            for i, vector in enumerate(vectors)
+        ]}).raise_for_status()
+    wait_green(client)
+
+
+def run_queries(client: httpx.Client, workload: list[tuple[list[float], dict]], exact: bool) -> tuple[list[float], list[list[int]]]:
+    latencies, results = [], []
+    for vector, query_filter in workload:
+        start = time.perf_counter()
+        response = client.post(f"/collections/{COLLECTION}/points/query", json={
+            "query": vector, "using": VECTOR, "filter": query_filter, "limit": 10,
+            "params": {"exact": exact}, "with_payload": False,
+        }).raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append([point["id"] for point in response.json()["result"]["points"]])
+    return latencies, results
+
+
+def main(args: argparse.Namespace) -> None:
+    with httpx.Client(base_url=args.qdrant_url, timeout=httpx.Timeout(60.0, read=None)) as client:
+        baseline_mb = resident_mb(client)
+        start = time.perf_counter()
+        load(client, args.points, args.dim, args.batch_size)
+        print(f"Loaded {args.points} points ({args.dim}-d) in {time.perf_counter() - start:.1f}s")
+
+        rng = random.Random(1)
+        np_rng = np.random.default_rng(1)
+        workload = []
+        for _ in range(args.queries):
+            vector = np_rng.standard_normal(args.dim, dtype=np.float32)
+            workload.append(((vector / np.linalg.norm(vector)).tolist(), make_filter(rng)))
+
+        def create_payload_indexes() -> None:
+            for name in [*CARDINALITY, "job_skills"]:
+                client.put(f"/collections/{COLLECTION}/index", params={"wait": "true"},
+                           json={"field_name": field(name), "field_schema": "keyword"}).raise_for_status()
+
+        def enable_int8() -> None:
+            client.patch(f"/collections/{COLLECTION}", json={
+                "quantization_config": {"scalar": {"type": "int8", "quantile": 0.99, "always_ram": True}},
+            }).raise_for_status()
+
+        setups = [
+            ("flat", None, True),
+            ("flat+index", create_payload_indexes, True),
+            ("hnsw+index", None, False),
+            ("hnsw+index+int8", enable_int8, False),
+        ]
+        truth = None
+        print(f"{'setup':<18} {'p50 ms':>8} {'p95 ms':>8} {'recall@10':>10} {'Qdrant RSS MB':>14}")
+        for name, prepare, exact in setups:
+            if prepare:
+                prepare()
+                wait_green(client)
+            run_queries(client, workload[:20], exact)  # warm-up
+            latencies, results = run_queries(client, workload, exact)
+            if truth is None:
+                truth = results
+            recall = statistics.mean(
+                len(set(found) & set(expected)) / len(expected) if expected else 1.0
+                for found, expected in zip(results, truth)
+            )
+            p95 = statistics.quantiles(latencies, n=20)[-1]
+            memory = resident_mb(client)
+            memory_text = f"{memory - (baseline_mb or 0):.0f}" if memory is not None else "n/a"
+            print(f"{name:<18} {statistics.median(latencies):>8.2f} {p95:>8.2f} {recall:>10.3f} {memory_text:>14}")
+
+        if not args.keep:
+            client.delete(f"/collections/{COLLECTION}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--qdrant-url", default="http://localhost:6333")
+    parser.add_argument("--points", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=768, help="Index vector size (two 384-d text spaces)")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch collection")
+    main(parser.parse_args())
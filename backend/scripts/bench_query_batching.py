@@ -0,0 +1,100 @@
+"""Benchmark search throughput and tail latency under concurrent clients.
+
+Each client sends job searches with a description and a title (no natural
+query, so no LLM call) to a running Superlinked server, back to back, for a
+fixed number of requests. For 1, 16 and 64 concurrent clients it reports
+requests/sec, p50 and p99 latency. Run it once with the query micro-batcher
+(QUERY_BATCH_WINDOW_MS=5) and once with only Superlinked's own embedding
+batching (QUERY_BATCH_WINDOW_MS=0) to compare; --repeat-share sends that share of searches with an already used
+text, which the batcher encodes once per batch.
+
+Usage (from the backend directory):
+    python -m scripts.bench_query_batching --superlinked-url http://localhost:8080
+    python -m scripts.bench_query_batching --clients 1 16 64 --requests 640
+"""
+
+import argparse
+import asyncio
+import csv
+import random
+import statistics
+import sys
+import time
+
+import httpx
+
+SEARCH_PATH = "/api/v1/search/job"
+FALLBACK_TITLES = [
+    "Data Engineer", "Senior Data Scientist", "Machine Learning Engineer", "Data Analyst",
+    "Backend Software Engineer", "Analytics Engineer", "Business Intelligence Analyst",
+]
+
+
+def load_texts(path: str, count: int) -> list[tuple[str, str]]:
+    """(description, title) pairs from the dataset; falls back to generated ones without it."""
+    csv.field_size_limit(sys.maxsize)
+    pairs = []
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                title = row.get("job_title") or ""
+                if title:
+                    pairs.append(((row.get("job_summary") or title)[:1000], title))
+                if len(pairs) >= count:
+                    break
+    except OSError:
+        pass
+    while len(pairs) < count:
+        title = f"{random.choice(FALLBACK_TITLES)} {len(pairs)}"
+        pairs.append((f"{title} working with Python, SQL and cloud data platforms", title))
+    return pairs
+
+
+async def client_loop(client: httpx.AsyncClient, queue: asyncio.Queue, latencies: list[float]) -> None:
+    while True:
+        try:
+            description, title = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        start = time.perf_counter()
+        response = await client.post(SEARCH_PATH, json={"description": description, "title": title, "limit": 10})
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_level(url: str, clients: int, workload: list[tuple[str, str]]) -> tuple[float, float, float]:
+    queue = asyncio.Queue()
+    for pair in workload:
+        queue.put_nowait(pair)
+    latencies = []
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=url, timeout=120.0, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*[client_loop(client, queue, latencies) for _ in range(clients)])
+        elapsed = time.perf_counter() - start
+    p99 = statistics.quantiles(latencies, n=100)[-1] if len(latencies) > 1 else latencies[0]
+    return len(latencies) / elapsed, statistics.median(latencies) * 1000, p99 * 1000
+
+
+async def main(args: argparse.Namespace) -> None:
+    rng = random.Random(0)
+    texts = load_texts(args.dataset, args.requests * len(args.clients))
+    print(f"{'clients':>7} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for level, clients in enumerate(args.clients):
+        # Fresh texts per level, so earlier levels do not warm the embedding cache for later ones
+        fresh = texts[level * args.requests:(level + 1) * args.requests]
+        workload = [rng.choice(fresh[:max(1, i)]) if rng.random() < args.repeat_share else pair
+                    for i, pair in enumerate(fresh)]
+        await run_level(args.superlinked_url, clients, workload[:clients])  # warm-up
+        rate, p50, p99 = await run_level(args.superlinked_url, clients, workload)
+        print(f"{clients:>7} {rate:>8.1f} {p50:>8.1f} {p99:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--superlinked-url", default="http://localhost:8080")
+    parser.add_argument("--dataset", default="data/jobs.csv", help="CSV with job_title/job_summary columns")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--requests", type=int, default=640, help="Searches per concurrency level")
+    parser.add_argument("--repeat-share", type=float, default=0.2, help="Share of searches reusing an earlier text")
+    asyncio.run(main(parser.parse_args()))
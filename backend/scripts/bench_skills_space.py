@@ -0,0 +1,142 @@
+"""Benchmark index size and CV search latency with and without the skills space.
+
+Two scratch collections shaped like the Superlinked job index are loaded into
+Qdrant with the same postings:
+- text: the two 384-d text spaces only; a CV's skills can only be applied as a
+  job_skills filter (any of the skills), as job_skills_include does today
+- text+skills: the text part plus the multi-hot skills space
+  (SKILLS_SPACE_SIZE categories), so skills rank results in the kNN itself
+For each it reports the vector size, the Qdrant memory delta, p50/p95 latency
+of CV-like queries with --cv-skills skills, and how many of those skills the
+top 10 results share on average.
+
+Usage (from the backend directory, against a scratch Qdrant):
+    python -m scripts.bench_skills_space --qdrant-url http://localhost:6333
+    python -m scripts.bench_skills_space --points 300000 --skills-space-size 256
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+import httpx
+import numpy as np
+
+from scripts.bench_qdrant_filters import (
+    CARDINALITY,
+    SKILLS,
+    field,
+    make_payload,
+    resident_mb,
+    wait_green,
+)
+
+VECTOR = "index"
+TEXT_DIM = 768
+
+
+def skill_id(skill: str) -> int:
+    return int(skill.rsplit("_", 1)[1])
+
+
+def skills_vector(skills: list[str], size: int) -> np.ndarray:
+    """Multi-hot over the `size` most frequent skills, L2-normalized like the categorical space."""
+    vector = np.zeros(size, dtype=np.float32)
+    for skill in skills:
+        if skill_id(skill) < size:
+            vector[skill_id(skill)] = 1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def point_vector(text: np.ndarray, skills: list[str], size: int, skills_weight: float) -> np.ndarray:
+    if not size:
+        return text
+    return np.concatenate([text, skills_weight * skills_vector(skills, size)])
+
+
+def load(client: httpx.Client, name: str, args: argparse.Namespace, size: int) -> list[list[str]]:
+    client.delete(f"/collections/{name}")
+    client.put(f"/collections/{name}", json={
+        "vectors": {VECTOR: {"size": TEXT_DIM + size, "distance": "Dot"}},
+    }).raise_for_status()
+    for payload_field in [*CARDINALITY, "job_skills"]:
+        client.put(f"/collections/{name}/index", params={"wait": "true"},
+                   json={"field_name": field(payload_field), "field_schema": "keyword"}).raise_for_status()
+    rng = random.Random(0)
+    np_rng = np.random.default_rng(0)
+    all_skills = []
+    for start in range(0, args.points, args.batch_size):
+        count = min(args.batch_size, args.points - start)
+        texts = np_rng.standard_normal((count, TEXT_DIM), dtype=np.float32)
+        texts /= np.linalg.norm(texts, axis=1, keepdims=True)
+        points = []
+        for i, text in enumerate(texts):
+            payload = make_payload(rng)
+            all_skills.append(payload[field("job_skills")])
+            vector = point_vector(text, payload[field("job_skills")], size, args.skills_weight)
+            points.append({"id": start + i, "vector": {VECTOR: vector.tolist()}, "payload": payload})
+        client.put(f"/collections/{name}/points", params={"wait": "true"},
+                   json={"points": points}).raise_for_status()
+    wait_green(client, name)
+    return all_skills
+
+
+def run_queries(client: httpx.Client, name: str, workload: list[tuple[np.ndarray, list[str]]], size: int,
+                args: argparse.Namespace) -> tuple[list[float], list[list[int]]]:
+    latencies, results = [], []
+    for text, skills in workload:
+        body = {"query": point_vector(text, skills, size, args.skills_weight).tolist(), "using": VECTOR,
+                "limit": 10, "with_payload": False}
+        if not size:
+            # Without the space the skills can only narrow the candidates
+            body["filter"] = {"must": [{"key": field("job_skills"), "match": {"any": skills}}]}
+        start = time.perf_counter()
+        response = client.post(f"/collections/{name}/points/query", json=body).raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append([point["id"] for point in response.json()["result"]["points"]])
+    return latencies, results
+
+
+def main(args: argparse.Namespace) -> None:
+    rng = random.Random(1)
+    np_rng = np.random.default_rng(1)
+    workload = []
+    for _ in range(args.queries):
+        text = np_rng.standard_normal(TEXT_DIM, dtype=np.float32)
+        skills = list(dict.fromkeys(f"skill_{int(rng.paretovariate(1.1)) % SKILLS}" for _ in range(args.cv_skills)))
+        workload.append((text / np.linalg.norm(text), skills))
+
+    print(f"{'setup':<12} {'dims':>5} {'vectors MB':>10} {'Qdrant RSS MB':>14} {'p50 ms':>8} {'p95 ms':>8} {'shared skills':>14}")
+    with httpx.Client(base_url=args.qdrant_url, timeout=httpx.Timeout(60.0, read=None)) as client:
+        for name, size in [("text", 0), ("text+skills", args.skills_space_size)]:
+            collection = f"bench_skills_{'space' if size else 'filter'}"
+            baseline_mb = resident_mb(client)
+            job_skills = load(client, collection, args, size)
+            memory = resident_mb(client)
+            run_queries(client, collection, workload[:20], size, args)  # warm-up
+            latencies, results = run_queries(client, collection, workload, size, args)
+            shared = statistics.mean(
+                len(set(job_skills[point]) & set(skills)) for (_, skills), found in zip(workload, results) for point in found
+            )
+            vectors_mb = args.points * (TEXT_DIM + size) * 4 / 2**20
+            memory_text = f"{memory - baseline_mb:.0f}" if memory is not None and baseline_mb is not None else "n/a"
+            p95 = statistics.quantiles(latencies, n=20)[-1]
+            print(f"{name:<12} {TEXT_DIM + size:>5} {vectors_mb:>10.0f} {memory_text:>14} "
+                  f"{statistics.median(latencies):>8.2f} {p95:>8.2f} {shared:>14.2f}")
+            if not args.keep:
+                client.delete(f"/collections/{collection}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--qdrant-url", default="http://localhost:6333")
+    parser.add_argument("--points", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--cv-skills", type=int, default=20, help="Skills per CV query")
+    parser.add_argument("--skills-space-size", type=int, default=256, help="Categories of the skills space")
+    parser.add_argument("--skills-weight", type=float, default=0.9, help="Weight of the skills space in the index vector")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch collections")
+    main(parser.parse_args())
@@ -0,0 +1,131 @@
+"""Benchmark the pooled Superlinked client against a per-request client.
+
+Starts a stand-in Superlinked server that answers every search after a fixed
+delay, then fires batches of concurrent searches twice: once opening a new
+`httpx.AsyncClient` per request (the old behaviour) and once through the
+shared SuperlinkedClientManager. Reports throughput, latency percentiles and
+how many TCP connections each run had to open.
+
+Usage (from the backend directory):
+    python -m scripts.bench_superlinked_pool --requests 500 --concurrency 1 10 50
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import threading
+import time
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+
+def build_stub_app(delay: float) -> FastAPI:
+    """Create a stand-in Superlinked search server."""
+    stub = FastAPI()
+    result = {
+        "entries": [
+            {"id": f"job-{i}", "fields": {"job_title": "Data Analyst"}, "metadata": {"score": 0.9}}
+            for i in range(25)
+        ],
+        "metadata": {"search_params": {}}
+    }
+
+    @stub.post("/api/v1/search/job")
+    async def search(body: dict) -> dict:
+        await asyncio.sleep(delay)
+        return result
+
+    return stub
+
+
+def start_stub_server(delay: float) -> str:
+    """Run the stand-in server in a background thread and return its base URL."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    config = uvicorn.Config(build_stub_app(delay), host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+async def run_batch(send, total: int, concurrency: int) -> tuple[float, list[float]]:
+    """Send `total` searches with at most `concurrency` in flight; return (req/s, latencies)."""
+    gate = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(i: int) -> None:
+        async with gate:
+            start = time.perf_counter()
+            response = await send({"natural_query": f"data analyst {i}", "limit": 25})
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return total / (time.perf_counter() - start), latencies
+
+
+def report(label: str, concurrency: int, throughput: float, latencies: list[float], connections: int) -> None:
+    latencies.sort()
+    p50 = 1000 * statistics.median(latencies)
+    p95 = 1000 * latencies[int(0.95 * (len(latencies) - 1))]
+    print(
+        f"{label:<11} concurrency={concurrency:>3}  throughput={throughput:8.1f} req/s  "
+        f"p50={p50:6.1f}ms  p95={p95:6.1f}ms  connections={connections}"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    # Settings are read at import time, so point them at the stub first
+    base_url = start_stub_server(args.delay)
+    os.environ["SUPERLINKED_URL"] = base_url
+
+    from app.superlinked_client import SuperlinkedClientManager
+
+    manager = SuperlinkedClientManager()
+    opened = 0
+
+    async def count_connections(event: str, info: dict) -> None:
+        nonlocal opened
+        if event == "connection.connect_tcp.complete":
+            opened += 1
+
+    async def per_request(payload: dict) -> httpx.Response:
+        async with httpx.AsyncClient() as client:
+            return await client.post(
+                f"{base_url}/api/v1/search/job",
+                json=payload,
+                extensions={"trace": count_connections}
+            )
+
+    async def pooled(payload: dict) -> httpx.Response:
+        return await manager.post("/api/v1/search/job", json=payload)
+
+    print(f"Stub latency: {1000 * args.delay:.1f}ms, requests per run: {args.requests}")
+    for concurrency in args.concurrency:
+        opened = 0
+        throughput, latencies = await run_batch(per_request, args.requests, concurrency)
+        report("per-request", concurrency, throughput, latencies, opened)
+
+        before = manager.connections_opened
+        throughput, latencies = await run_batch(pooled, args.requests, concurrency)
+        report("pooled", concurrency, throughput, latencies, manager.connections_opened - before)
+
+    print(f"Pool stats: {manager.stats()}")
+    await manager.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--delay", type=float, default=0.005, help="Stub search latency in seconds")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    asyncio.run(main(parser.parse_args()))
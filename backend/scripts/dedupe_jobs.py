@@ -0,0 +1,327 @@
+"""Drop near-duplicate job postings from jobs.csv before it is indexed.
+
+The LinkedIn datasets overlap: the same posting is scraped from several
+search cities, sometimes with small text edits, and every copy would be
+embedded and crowd search results. This stage streams jobs.csv twice:
+- Pass 1 hashes company + job_title + job_summary into 5-word shingles and
+  computes a 64-permutation MinHash signature per row. LSH (16 bands of 4)
+  proposes candidate pairs, which are kept when the estimated Jaccard
+  similarity is at least --threshold and the company is the same.
+- Pass 2 keeps the earliest row of every cluster. Its location values are
+  merged into list facets (job_locations, states, search_cities,
+  search_countries), so location filters still match every merged copy.
+The report (data/dedupe_report.json) has the duplicate rate and the
+embedding time saved. Rows with fewer than 5 words of text are never merged.
+
+Run after normalize_jobs.py (from the backend directory):
+    python scripts/dedupe_jobs.py
+    python scripts/dedupe_jobs.py --dry-run --threshold 0.7
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from downloader import CSVAppender, read_batches
+from jobs_parquet import LOCATION_FACETS, JobsParquetWriter
+
+# File paths
+data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
+jobs_csv_path = os.path.join(data_dir, 'jobs.csv')
+jobs_parquet_path = os.path.join(data_dir, 'jobs.parquet')
+report_json_path = os.path.join(data_dir, 'dedupe_report.json')
+
+SHINGLE_SIZE = 5
+NUM_PERM = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+# Texts embedded per posting: job_summary and job_title (superlinked_app/index.py)
+EMBEDDED_FIELDS = 2
+
+_rng = np.random.default_rng(0)
+# Odd multipliers: (a * h + b) >> 32 over uint64 is a universal hash family
+PERM_A = _rng.integers(1, 2**63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+PERM_B = _rng.integers(0, 2**63, NUM_PERM, dtype=np.uint64)
+MIX = np.uint64(0x9E3779B97F4A7C15)
+PUNCTUATION = ".,;:!?()[]{}<>\"'*-/|"
+
+
+class Vocabulary:
+    """Integer codes for the values of one column, consistent across batches."""
+
+    def __init__(self):
+        self.codes = {}
+
+    def encode(self, values: pa.Array) -> np.ndarray:
+        """Code per value; -1 for nulls."""
+        encoded = values.dictionary_encode()
+        lookup = np.array(
+            [self.codes.setdefault(value, len(self.codes)) for value in encoded.dictionary.to_pylist()], dtype=np.int64
+        )
+        indices = encoded.indices.fill_null(-1).to_numpy()
+        if not len(lookup):
+            return indices.astype(np.int64)
+        return np.where(indices >= 0, lookup[indices.clip(0)], -1)
+
+    def decode(self) -> list[str]:
+        return list(self.codes)
+
+
+def text_column(batch: pa.RecordBatch, name: str) -> pa.Array:
+    if name in batch.schema.names:
+        return batch.column(name)
+    return pa.nulls(batch.num_rows, pa.string())
+
+
+def shingles(texts: pa.Array) -> tuple[np.ndarray, np.ndarray]:
+    """Hash the word shingles of each text; returns (hashes, row of each hash), grouped by row."""
+    # Whitespace split plus punctuation trim: several times faster than a regex tokenizer
+    tokens = pc.utf8_split_whitespace(pc.utf8_lower(texts))
+    rows = pc.list_parent_indices(tokens).to_numpy()
+    words = pc.utf8_trim(pc.list_flatten(tokens), characters=PUNCTUATION)
+    non_empty = pc.not_equal(words, "")
+    words = words.filter(non_empty)
+    rows = rows[non_empty.to_numpy(zero_copy_only=False)]
+    encoded = words.dictionary_encode()
+    word_hashes = pd.util.hash_array(encoded.dictionary.to_numpy(zero_copy_only=False))[encoded.indices.to_numpy()]
+
+    count = len(word_hashes) - SHINGLE_SIZE + 1
+    if count <= 0:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64)
+    hashes = np.zeros(count, dtype=np.uint64)
+    for offset in range(SHINGLE_SIZE):
+        hashes = hashes * MIX + word_hashes[offset:offset + count]
+    # Drop windows that span two rows
+    same_row = rows[:count] == rows[SHINGLE_SIZE - 1:]
+    return hashes[same_row], rows[:count][same_row]
+
+
+def minhash(hashes: np.ndarray, rows: np.ndarray, num_rows: int) -> tuple[np.ndarray, np.ndarray]:
+    """MinHash signatures (num_rows x NUM_PERM) and whether each row had any shingle."""
+    signatures = np.full((num_rows, NUM_PERM), np.iinfo(np.uint32).max, dtype=np.uint32)
+    has_signature = np.zeros(num_rows, dtype=bool)
+    if not len(hashes):
+        return signatures, has_signature
+    starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+    present = rows[starts]
+    for j in range(NUM_PERM):
+        values = ((hashes * PERM_A[j] + PERM_B[j]) >> np.uint64(32)).astype(np.uint32)
+        signatures[present, j] = np.minimum.reduceat(values, starts)
+    has_signature[present] = True
+    return signatures, has_signature
+
+
+def facet_values(batch: pa.RecordBatch, facet: str, field: str) -> tuple[pa.Array, np.ndarray]:
+    """Location values of a batch with their row numbers: the facet list when present, else the single field."""
+    if facet in batch.schema.names:
+        lists = batch.column(facet).to_pandas().map(lambda value: json.loads(value) if value else [])
+        exploded = lists.explode().dropna()
+        return pa.array(exploded.to_numpy(), type=pa.string()), exploded.index.to_numpy()
+    values = text_column(batch, field)
+    present = pc.is_valid(values)
+    return values.filter(present), np.flatnonzero(present.to_numpy(zero_copy_only=False))
+
+
+def scan(path: str, block_size: int) -> dict:
+    """Pass 1: signatures, company codes and location (row, code) pairs for every row."""
+    companies = Vocabulary()
+    locations = {facet: Vocabulary() for facet in LOCATION_FACETS}
+    signatures, has_signature, company_codes = [], [], []
+    location_rows = {facet: [] for facet in LOCATION_FACETS}
+    location_codes = {facet: [] for facet in LOCATION_FACETS}
+    offset = 0
+    for batch in read_batches(path, block_size):
+        text = pc.binary_join_element_wise(
+            text_column(batch, 'company'), text_column(batch, 'job_title'), text_column(batch, 'job_summary'), ' ',
+            null_handling='replace', null_replacement='',
+        )
+        batch_signatures, batch_has = minhash(*shingles(text), batch.num_rows)
+        signatures.append(batch_signatures)
+        has_signature.append(batch_has)
+        company_codes.append(companies.encode(pc.utf8_lower(pc.utf8_trim_whitespace(text_column(batch, 'company')))))
+        for facet, field in LOCATION_FACETS.items():
+            values, rows = facet_values(batch, facet, field)
+            location_codes[facet].append(locations[facet].encode(values))
+            location_rows[facet].append(rows + offset)
+        offset += batch.num_rows
+    return {
+        'signatures': np.concatenate(signatures) if signatures else np.empty((0, NUM_PERM), dtype=np.uint32),
+        'has_signature': np.concatenate(has_signature) if has_signature else np.empty(0, dtype=bool),
+        'companies': np.concatenate(company_codes) if company_codes else np.empty(0, dtype=np.int64),
+        'locations': {
+            facet: (np.concatenate(location_rows[facet]), np.concatenate(location_codes[facet]), locations[facet].decode())
+            for facet in LOCATION_FACETS if location_rows[facet]
+        },
+    }
+
+
+def candidate_pairs(signatures: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """(earlier, later) row pairs that share at least one LSH band bucket."""
+    pairs = []
+    bands = signatures[rows].astype(np.uint64).reshape(len(rows), BANDS, ROWS_PER_BAND)
+    for band in range(BANDS):
+        keys = np.zeros(len(rows), dtype=np.uint64)
+        for r in range(ROWS_PER_BAND):
+            keys = keys * MIX + bands[:, band, r]
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        bucket_start = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]
+        # Pair every bucket member with the bucket's earliest row
+        first = order[np.maximum.accumulate(np.where(bucket_start, np.arange(len(order)), 0))]
+        earlier, later = rows[first[~bucket_start]].astype(np.uint64), rows[order[~bucket_start]].astype(np.uint64)
+        pairs.append(earlier << np.uint64(32) | later)
+    packed = np.sort(np.concatenate(pairs)) if pairs else np.empty(0, dtype=np.uint64)
+    packed = packed[np.r_[True, packed[1:] != packed[:-1]]] if len(packed) else packed
+    return np.stack([packed >> np.uint64(32), packed & np.uint64(0xFFFFFFFF)], axis=1).astype(np.int64)
+
+
+def cluster(scanned: dict, threshold: float) -> np.ndarray:
+    """Label every row with the earliest row of its near-duplicate cluster."""
+    signatures, companies = scanned['signatures'], scanned['companies']
+    labels = np.arange(len(signatures))
+    pairs = candidate_pairs(signatures, np.flatnonzero(scanned['has_signature']))
+    confirmed = []
+    for start in range(0, len(pairs), 1 << 20):
+        a, b = pairs[start:start + (1 << 20)].T
+        similar = ((signatures[a] == signatures[b]).mean(axis=1) >= threshold) & (companies[a] == companies[b])
+        confirmed.append(pairs[start:start + (1 << 20)][similar])
+    if not confirmed:
+        return labels
+    a, b = np.concatenate(confirmed).T
+    # Propagate the smallest row number through each connected cluster
+    while True:
+        low = np.minimum(labels[a], labels[b])
+        if (labels[a] == low).all() and (labels[b] == low).all():
+            return labels
+        np.minimum.at(labels, a, low)
+        np.minimum.at(labels, b, low)
+        labels = labels[labels]
+
+
+def merged_facets(scanned: dict, labels: np.ndarray) -> dict[str, dict[int, list[str]]]:
+    """Location values of every cluster with more than one row, keyed by its canonical row."""
+    duplicate = labels != np.arange(len(labels))
+    merged_roots = np.zeros(len(labels), dtype=bool)
+    merged_roots[labels[duplicate]] = True
+    facets = {}
+    for facet, (rows, codes, values) in scanned['locations'].items():
+        roots = labels[rows]
+        keep = merged_roots[roots] & (codes >= 0)
+        frame = pd.DataFrame({'root': roots[keep], 'code': codes[keep]}).drop_duplicates()
+        frame['value'] = np.array(values, dtype=object)[frame['code'].to_numpy()] if len(frame) else []
+        facets[facet] = frame.groupby('root', sort=False)['value'].agg(list).to_dict()
+    return facets
+
+
+def own_facet(chunk: pd.DataFrame, facet: str, field: str) -> pd.Series:
+    if facet in chunk.columns:
+        return chunk[facet].map(lambda value: json.loads(value) if value else [])
+    if field in chunk.columns:
+        return chunk[field].map(lambda value: [value] if isinstance(value, str) else [])
+    return pd.Series([[] for _ in range(len(chunk))], index=chunk.index)
+
+
+def write(args: argparse.Namespace, labels: np.ndarray, facets: dict) -> int:
+    """Pass 2: stream the canonical rows with merged facets to the CSV (and Parquet) outputs."""
+    tmp_csv_path = f"{args.output}.{os.getpid()}.tmp"
+    csv_writer = None
+    parquet_writer = JobsParquetWriter(args.parquet) if args.parquet else None
+    offset = written = 0
+    try:
+        for batch in read_batches(args.input, args.block_size_mb << 20):
+            rows = np.arange(offset, offset + batch.num_rows)
+            offset += batch.num_rows
+            keep = labels[rows] == rows
+            chunk = batch.to_pandas()[keep]
+            chunk = chunk.assign(**{
+                facet: [facets.get(facet, {}).get(row, value) for row, value in zip(rows[keep], own_facet(chunk, facet, field))]
+                for facet, field in LOCATION_FACETS.items()
+            })
+            text_chunk = chunk.assign(**{facet: chunk[facet].map(json.dumps) for facet in LOCATION_FACETS})
+            if csv_writer is None:
+                csv_writer = CSVAppender(tmp_csv_path)
+            csv_writer.write(text_chunk)
+            if parquet_writer:
+                parquet_writer.write(chunk)
+            written += len(chunk)
+        if csv_writer:
+            csv_writer.close()
+        if parquet_writer:
+            parquet_writer.close()
+    except BaseException:
+        if csv_writer:
+            csv_writer.close()
+        if parquet_writer:
+            parquet_writer.abort()
+        if os.path.exists(tmp_csv_path):
+            os.remove(tmp_csv_path)
+        raise
+    if csv_writer:
+        os.replace(tmp_csv_path, args.output)
+    return written
+
+
+def main(args: argparse.Namespace) -> None:
+    start = time.perf_counter()
+    print(f"Scanning {args.input} for near-duplicate postings...")
+    scanned = scan(args.input, args.block_size_mb << 20)
+    labels = cluster(scanned, args.threshold)
+    rows = len(labels)
+    canonical = labels == np.arange(rows)
+    cluster_sizes = np.bincount(labels, minlength=rows)[canonical] if rows else np.empty(0, dtype=np.int64)
+    duplicates = int(rows - canonical.sum())
+    detect_seconds = time.perf_counter() - start
+    print(f"  {duplicates} of {rows} rows are near-duplicates ({detect_seconds:.1f}s)")
+
+    if not args.dry_run and rows:
+        written = write(args, labels, merged_facets(scanned, labels))
+        print(f"Deduplicated CSV saved: {args.output} ({written} rows)")
+        if args.parquet:
+            print(f"Parquet copy saved: {args.parquet}")
+    elapsed = time.perf_counter() - start
+
+    embedding_seconds_saved = duplicates * EMBEDDED_FIELDS / args.embed_texts_per_sec
+    report = {
+        'rows': rows,
+        'unique_postings': rows - duplicates,
+        'duplicates': duplicates,
+        'duplicate_rate': duplicates / rows if rows else 0.0,
+        'merged_clusters': int((cluster_sizes > 1).sum()),
+        'largest_cluster': int(cluster_sizes.max()) if len(cluster_sizes) else 0,
+        'rows_without_shingles': int((~scanned['has_signature']).sum()),
+        'threshold': args.threshold,
+        'dedupe_seconds': elapsed,
+        'embeddings_avoided': duplicates * EMBEDDED_FIELDS,
+        'embed_texts_per_sec': args.embed_texts_per_sec,
+        'embedding_seconds_saved': embedding_seconds_saved,
+        'net_seconds_saved': embedding_seconds_saved - elapsed,
+        'dry_run': args.dry_run,
+    }
+    with open(args.report, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"Duplicate rate: {report['duplicate_rate']:.1%} ({report['merged_clusters']} clusters, largest {report['largest_cluster']})")
+    print(
+        f"Embeddings avoided: {report['embeddings_avoided']} "
+        f"(~{embedding_seconds_saved / 60:.1f} min at {args.embed_texts_per_sec:g} texts/s; stage took {elapsed:.1f}s)"
+    )
+    print(f"Report saved: {args.report}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Drop near-duplicate job postings (MinHash/LSH) and merge their locations.")
+    parser.add_argument('--input', default=jobs_csv_path)
+    parser.add_argument('--output', default=jobs_csv_path, help="Deduplicated CSV (may be the input file)")
+    parser.add_argument('--parquet', default=jobs_parquet_path, help="Columnar copy; empty to skip")
+    parser.add_argument('--report', default=report_json_path)
+    parser.add_argument('--threshold', type=float, default=0.8, help="Minimum estimated Jaccard similarity of shingles")
+    parser.add_argument('--embed-texts-per-sec', type=float, default=50.0, help="Embedding throughput used to estimate the time saved")
+    parser.add_argument('--block-size-mb', type=int, default=2, help="CSV bytes read per batch")
+    parser.add_argument('--dry-run', action='store_true', help="Only write the report")
+    main(parser.parse_args())
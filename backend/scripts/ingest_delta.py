@@ -0,0 +1,221 @@
+"""Incrementally sync data/jobs.csv (or jobs.parquet) into the Superlinked index.
+
+A manifest (SQLite) records a content hash per job_link. Each run streams
+the dataset in chunks (row groups for Parquet) and handles three kinds of rows:
+- New or changed rows are posted to the Superlinked RestSource ingest
+  endpoint in batches.
+- Rows no longer in the CSV are deleted from Qdrant, and from the lexical
+  (BM25) index of hybrid search when its directory is reachable.
+- Unchanged rows are skipped without being embedded.
+The manifest is only updated for rows whose ingest request succeeded, so an
+interrupted run is resumed by running it again.
+
+Ingest requests bump the index generation on the Superlinked side, which
+invalidates the backend search cache. When a run only deletes rows, one
+unchanged row is re-posted so the generation is bumped as well.
+
+Use --baseline once after a full data-loader run to record the current file
+without ingesting it.
+
+Usage (from the backend directory):
+    python -m scripts.ingest_delta --superlinked-url http://localhost:8080 --qdrant-url http://localhost:6333
+    python -m scripts.ingest_delta --baseline
+    python -m scripts.ingest_delta --dry-run
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import time
+import uuid
+
+import httpx
+import pandas as pd
+
+from scripts.jobs_parquet import LOCATION_FACETS, iter_jobs_parquet
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+# Superlinked names the ingest endpoint and entity ids after the schema class
+SCHEMA_NAME = "JobPosting"
+INGEST_PATH = "/api/v1/ingest/job_posting"
+# Fields of superlinked_app.index.JobPosting besides `id`
+FIELDS = [
+    "job_title", "job_summary", "company", "job_skills", "job_location", "state",
+    "search_city", "search_country", "job_level", "job_type", "job_category", "job_link",
+    "job_locations", "states", "search_cities", "search_countries",
+]
+
+
+def to_record(row: dict) -> dict:
+    """Build the ingest payload for a CSV row, parsed like the data loader does."""
+    row = {key: None if isinstance(value, float) and math.isnan(value) else value for key, value in row.items()}
+    record = {"id": str(row["id"] if row.get("id") is not None else row["job_link"])}
+    for field in FIELDS:
+        value = row.get(field)
+        if field == "job_skills":
+            if isinstance(value, str):
+                value = [skill.strip() for skill in value.split(",")]
+            else:
+                value = [str(skill) for skill in value] if value is not None else []
+        elif field in LOCATION_FACETS:
+            if isinstance(value, str):
+                value = json.loads(value)
+            elif value is not None:
+                value = [str(item) for item in value]
+            else:
+                value = [row[LOCATION_FACETS[field]]] if row.get(LOCATION_FACETS[field]) else []
+        record[field] = value
+    return record
+
+
+def read_chunks(path: str, chunk_size: int):
+    """Stream the dataset as DataFrames; Parquet is read row group by row group."""
+    if path.endswith(".parquet"):
+        yield from iter_jobs_parquet(path, chunk_size)
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype=str)
+
+
+def content_hash(record: dict) -> str:
+    return hashlib.sha256(json.dumps(record, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def qdrant_point_id(object_id: str) -> str:
+    """Point id Superlinked's Qdrant connector derives from an entity id."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, ":".join(sorted([SCHEMA_NAME, object_id]))))
+
+
+class Manifest:
+    """job_link -> (object id, content hash) of everything in the index."""
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS rows ("
+            "job_link TEXT PRIMARY KEY, object_id TEXT NOT NULL, content_hash TEXT NOT NULL)"
+        )
+
+    def hashes(self, job_links: list[str]) -> dict[str, str]:
+        found = {}
+        for start in range(0, len(job_links), 500):
+            batch = job_links[start:start + 500]
+            found.update(self.conn.execute(
+                f"SELECT job_link, content_hash FROM rows WHERE job_link IN ({','.join('?' * len(batch))})", batch
+            ))
+        return found
+
+    def upsert(self, records: list[dict], hashes: list[str]) -> None:
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO rows (job_link, object_id, content_hash) VALUES (?, ?, ?)",
+            [(r["job_link"], r["id"], h) for r, h in zip(records, hashes)]
+        )
+        self.conn.commit()
+
+    def stale(self, seen: set[str]) -> list[tuple[str, str]]:
+        return [row for row in self.conn.execute("SELECT job_link, object_id FROM rows") if row[0] not in seen]
+
+    def delete(self, job_links: list[str]) -> None:
+        self.conn.executemany("DELETE FROM rows WHERE job_link = ?", [(link,) for link in job_links])
+        self.conn.commit()
+
+
+def delete_from_lexical_index(path: str, object_ids: list[str]) -> int:
+    """Tombstone deleted rows in the BM25 index, which the Superlinked server only adds to."""
+    if not path or not os.path.isdir(path):
+        return 0
+    from app.lexical_index import delete_documents
+
+    try:
+        return delete_documents(path, object_ids)
+    except OSError as e:
+        # Vectors are already deleted; keyword search keeps returning the rows until the next rebuild
+        print(f"Lexical index not updated: {e}")
+        return 0
+
+
+def main(args: argparse.Namespace) -> None:
+    manifest = Manifest(args.manifest)
+    client = httpx.Client(timeout=args.timeout)
+    counts = {"rows": 0, "new": 0, "changed": 0, "unchanged": 0, "deleted": 0, "lexical_deleted": 0}
+    pending: list[tuple[dict, str]] = []
+    seen: set[str] = set()
+    last_unchanged = None
+    start = time.perf_counter()
+
+    def flush() -> None:
+        if not pending:
+            return
+        records = [record for record, _ in pending]
+        if not (args.dry_run or args.baseline):
+            client.post(f"{args.superlinked_url}{INGEST_PATH}", json=records).raise_for_status()
+        if not args.dry_run:
+            manifest.upsert(records, [h for _, h in pending])
+        pending.clear()
+
+    for chunk in read_chunks(args.dataset, args.chunk_size):
+        chunk = chunk.rename(columns={"job level": "job_level"})
+        records = [to_record(row) for row in chunk.to_dict("records") if isinstance(row.get("job_link"), str)]
+        # The first occurrence of a job_link wins, as with repeated ids in the data loader
+        records = [r for r in records if not (r["job_link"] in seen or seen.add(r["job_link"]))]
+        counts["rows"] += len(records)
+        known = manifest.hashes([r["job_link"] for r in records])
+        for record in records:
+            digest = content_hash(record)
+            previous = known.get(record["job_link"])
+            if previous == digest:
+                counts["unchanged"] += 1
+                last_unchanged = record
+                continue
+            counts["changed" if previous else "new"] += 1
+            pending.append((record, digest))
+            if len(pending) >= args.batch_size:
+                flush()
+    flush()
+
+    ingested = counts["new"] + counts["changed"]
+    stale = manifest.stale(seen)
+    counts["deleted"] = len(stale)
+    if not args.dry_run:
+        for offset in range(0, len(stale), args.batch_size):
+            batch = stale[offset:offset + args.batch_size]
+            if not args.baseline:
+                client.post(
+                    f"{args.qdrant_url}/collections/{args.collection}/points/delete",
+                    params={"wait": "true"},
+                    json={"points": [qdrant_point_id(object_id) for _, object_id in batch]},
+                    headers={"api-key": args.qdrant_api_key} if args.qdrant_api_key else None,
+                ).raise_for_status()
+                counts["lexical_deleted"] += delete_from_lexical_index(args.lexical_index, [object_id for _, object_id in batch])
+            manifest.delete([job_link for job_link, _ in batch])
+        if stale and not ingested and last_unchanged and not args.baseline:
+            # Re-posting an unchanged row is a no-op write that bumps the index generation
+            client.post(f"{args.superlinked_url}{INGEST_PATH}", json=[last_unchanged]).raise_for_status()
+
+    elapsed = time.perf_counter() - start
+    mode = " (dry run)" if args.dry_run else " (baseline)" if args.baseline else ""
+    print(
+        f"Synced {counts['rows']} rows in {elapsed:.1f}s{mode}: {counts['new']} new, {counts['changed']} changed, "
+        f"{counts['unchanged']} unchanged, {counts['deleted']} deleted "
+        f"({counts['lexical_deleted']} from the lexical index)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", default=os.path.join(DATA_DIR, "jobs.csv"), help="jobs.csv or jobs.parquet")
+    parser.add_argument("--manifest", default=os.path.join(DATA_DIR, "ingest_manifest.sqlite3"))
+    parser.add_argument("--superlinked-url", default=os.getenv("SUPERLINKED_URL", "http://localhost:8080"))
+    parser.add_argument("--qdrant-url", default=os.getenv("QDRANT_URL", "http://localhost:6333"))
+    parser.add_argument("--qdrant-api-key", default=os.getenv("QDRANT_API_KEY", ""))
+    parser.add_argument("--lexical-index", default=os.getenv("LEXICAL_INDEX_PATH", "state/lexical"),
+                        help="Lexical index directory shared with the Superlinked server; empty to skip")
+    parser.add_argument("--collection", default=os.getenv("APP_ID", "default"), help="Superlinked APP_ID (Qdrant collection)")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=600.0)
+    parser.add_argument("--baseline", action="store_true", help="Record the current file without ingesting it")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would change")
+    main(parser.parse_args())
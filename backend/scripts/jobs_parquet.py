@@ -0,0 +1,149 @@
+"""Columnar (Parquet) copy of the jobs dataset.
+
+jobs.parquet holds the same rows as jobs.csv, with four differences:
+- `job_skills` is stored as a list column, already split.
+- Categorical fields are dictionary-encoded.
+- Merged location facets (scripts/dedupe_jobs.py) are list columns.
+- There is one row group per Superlinked ingest chunk.
+Loaders then skip the per-row CSV converter and can stream row groups.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+CATEGORICAL_FIELDS = [
+    "job_location", "state", "search_city", "search_country", "job_level", "job_type", "job_category",
+]
+# List column -> the single-valued field it merges across near-duplicate postings
+LOCATION_FACETS = {
+    "job_locations": "job_location", "states": "state", "search_cities": "search_city", "search_countries": "search_country",
+}
+DEFAULT_ROW_GROUP_SIZE = 1000
+
+
+def split_skills(value) -> list[str]:
+    """Split a comma-separated skills cell like the Superlinked CSV converter does."""
+    if isinstance(value, str):
+        return [skill.strip() for skill in value.split(",")]
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [str(skill) for skill in value]
+    return []
+
+
+def facet_list(value) -> list[str]:
+    """Parse a location facet cell: a list, or a JSON array as stored in jobs.csv."""
+    if isinstance(value, str):
+        return json.loads(value) if value else []
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [str(item) for item in value]
+    return []
+
+
+def to_arrow(df: pd.DataFrame) -> pa.Table:
+    """
+    Convert a jobs DataFrame (as read from jobs.csv) to an Arrow table.
+
+    Args:
+        df: Jobs DataFrame
+
+    Returns:
+        Table with list-typed `job_skills` and location facets, dictionary-encoded categoricals
+        and an `id` column (job_link when missing)
+    """
+    df = df.rename(columns={"job level": "job_level"})
+    if "id" not in df.columns and "job_link" in df.columns:
+        df = df.assign(id=df["job_link"])
+    if "id" in df.columns:
+        df = df.assign(id=df["id"].astype(str))
+    # No dtype check: pandas 3 reads text as StringDtype, not object, and
+    # split_skills passes lists through
+    if "job_skills" in df.columns:
+        df = df.assign(job_skills=df["job_skills"].map(split_skills))
+    for facet in LOCATION_FACETS:
+        if facet in df.columns:
+            df[facet] = df[facet].map(facet_list)
+    for field in CATEGORICAL_FIELDS:
+        if field in df.columns:
+            df[field] = df[field].astype("category")
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def jobs_arrow_schema(columns: list[str]) -> pa.Schema:
+    """Fixed column types, so every chunk of a streamed file has the same schema."""
+    fields = []
+    for name in columns:
+        if name == "job_skills" or name in LOCATION_FACETS:
+            fields.append(pa.field(name, pa.list_(pa.string())))
+        elif name in CATEGORICAL_FIELDS:
+            fields.append(pa.field(name, pa.dictionary(pa.int32(), pa.string())))
+        else:
+            fields.append(pa.field(name, pa.string()))
+    return pa.schema(fields)
+
+
+class JobsParquetWriter:
+    """Append jobs DataFrame chunks to a Parquet file that is published atomically on close."""
+
+    def __init__(self, path: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE):
+        self.path = path
+        self.tmp_path = f"{path}.{os.getpid()}.tmp"
+        self.row_group_size = row_group_size
+        self._schema = None
+        self._writer = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        """Convert and append one chunk."""
+        table = to_arrow(df)
+        if self._writer is None:
+            self._schema = jobs_arrow_schema(table.column_names)
+            self._writer = pq.ParquetWriter(self.tmp_path, self._schema, compression="zstd")
+        table = table.select(self._schema.names).cast(self._schema)
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+
+    def close(self) -> None:
+        """Finish the file and move it into place."""
+        if self._writer is not None:
+            self._writer.close()
+            os.replace(self.tmp_path, self.path)
+
+    def abort(self) -> None:
+        """Discard the partially written file."""
+        if self._writer is not None:
+            self._writer.close()
+            os.remove(self.tmp_path)
+
+
+def write_jobs_parquet(df: pd.DataFrame, path: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> None:
+    """
+    Write a jobs DataFrame to Parquet atomically.
+
+    Args:
+        df: Jobs DataFrame
+        path: Output path
+        row_group_size: Rows per row group
+    """
+    writer = JobsParquetWriter(path, row_group_size)
+    writer.write(df)
+    writer.close()
+
+
+def iter_jobs_parquet(path: str, batch_size: int = DEFAULT_ROW_GROUP_SIZE, columns: list[str] | None = None):
+    """
+    Stream a Parquet jobs file as DataFrames without loading it whole.
+
+    Args:
+        path: Parquet file
+        batch_size: Rows per yielded DataFrame
+        columns: Columns to read (all if None)
+
+    Yields:
+        DataFrame chunks
+    """
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+        yield batch.to_pandas()
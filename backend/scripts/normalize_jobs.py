@@ -1,81 +1,174 @@
-import pandas as pd
+import argparse
+import csv
 import json
 import os
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+from downloader import CSVAppender, read_header
+from jobs_parquet import JobsParquetWriter
 
 # File paths
 data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
 jobs_csv_path = os.path.join(data_dir, 'jobs.csv')
+jobs_parquet_path = os.path.join(data_dir, 'jobs.parquet')
 schema_json_path = os.path.join(data_dir, 'schema.json')
 
-# Read jobs.csv
-print("Reading jobs.csv...")
-df = pd.read_csv(jobs_csv_path)
-print(f"Total number of rows: {len(df)}")
-
-# Rename 'job level' to 'job_level'
-df.rename(columns={'job level': 'job_level'}, inplace=True)
-
-# Create job_category column if it doesn't exist
-if 'job_category' not in df.columns:
-    print("job_category column not found, extracting from job_title...")
-    # Simple mapping: categorize based on keywords in job_title
-    def categorize_job(title):
-        title_lower = str(title).lower()
-        if 'data analyst' in title_lower or 'data analysis' in title_lower:
-            return 'data_analyst'
-        elif 'software engineer' in title_lower or 'software development' in title_lower:
-            return 'software_engineer'
-        elif 'data engineer' in title_lower or 'data engineering' in title_lower:
-            return 'data_engineer'
-        elif 'data scientist' in title_lower or 'data science' in title_lower:
-            return 'data_scientist'
-        else:
-            return 'other'  # For others
-
-    df['job_category'] = df['job_title'].apply(categorize_job)
-    print("job_category column added.")
-else:
-    print("job_category column exists, normalizing...")
-    # Normalize: standardize existing values
-    mapping = {
-        # Example mapping, can be expanded by user
-        'data analyst': 'data_analyst',
-        'data_analyst': 'data_analyst',
-        'software engineer': 'software_engineer',
-        'software_engineer': 'software_engineer',
-        'data engineer': 'data_engineer',
-        'data_engineer': 'data_engineer',
-        'data scientist': 'data_scientist',
-        'data_scientist': 'data_scientist',
-        # Other variations can be added
-    }
-    df['job_category'] = df['job_category'].str.lower().map(mapping).fillna(df['job_category'])
-
-# Save the normalized CSV
-normalized_csv_path = os.path.join(data_dir, 'jobs.csv')
-df.to_csv(normalized_csv_path, index=False)
-print(f"Normalized CSV saved: {normalized_csv_path}")
-
-# Extract categorical field options for schema.json
-# Read existing schema.json or create new one
-if os.path.exists(schema_json_path):
-    with open(schema_json_path, 'r') as f:
-        schema = json.load(f)
-else:
-    schema = {}
-
 categorical_fields = ['job_location', 'state', 'search_city', 'search_country', 'job_level', 'job_type', 'job_category']
-for field in categorical_fields:
-    if field in df.columns:
-        values = sorted(df[field].dropna().str.strip().unique().tolist())
-        schema[field] = values
-        print(f"{field} options: {values}")
+
+# Keyword rules for job_title, checked in order; the first match wins
+category_rules = [
+    ('data_analyst', r'data analyst|data analysis'),
+    ('software_engineer', r'software engineer|software development'),
+    ('data_engineer', r'data engineer|data engineering'),
+    ('data_scientist', r'data scientist|data science'),
+]
+
+# Standardize existing job_category values
+category_mapping = {
+    # Example mapping, can be expanded by user
+    'data analyst': 'data_analyst',
+    'data_analyst': 'data_analyst',
+    'software engineer': 'software_engineer',
+    'software_engineer': 'software_engineer',
+    'data engineer': 'data_engineer',
+    'data_engineer': 'data_engineer',
+    'data scientist': 'data_scientist',
+    'data_scientist': 'data_scientist',
+    # Other variations can be added
+}
+
+
+def categorize_jobs(titles: pd.Series) -> np.ndarray:
+    """Categorize a whole column of job titles at once."""
+    lowered = titles.fillna('').str.lower()
+    conditions = [lowered.str.contains(pattern, regex=True) for _, pattern in category_rules]
+    return np.select(conditions, [category for category, _ in category_rules], default='other')
+
+
+def normalize_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    """Rename columns and fill or normalize job_category for one chunk."""
+    df = df.rename(columns={'job level': 'job_level'})
+    if 'job_category' not in df.columns:
+        df['job_category'] = categorize_jobs(df['job_title'])
     else:
-        print(f"{field} column not found in CSV.")
+        df['job_category'] = df['job_category'].str.lower().map(category_mapping).fillna(df['job_category'])
+    return df
+
+
+def read_chunks(path: str, block_size: int):
+    """Stream a CSV as DataFrames of roughly block_size bytes, every column read as text."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        header = next(csv.reader(f))
+    reader = pa_csv.open_csv(
+        path,
+        read_options=pa_csv.ReadOptions(block_size=block_size, use_threads=False),
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.string() for name in header}, strings_can_be_null=True
+        ),
+    )
+    for batch in reader:
+        yield batch.to_pandas()
+
+
+def main(args: argparse.Namespace) -> None:
+    start = time.perf_counter()
+    tmp_csv_path = f"{args.output}.{os.getpid()}.tmp"
+    counts = {field: Counter() for field in [*categorical_fields, 'skills_list']}
+    present = set()
+    rows = 0
+
+    # Stream: every block is normalized, counted and appended, so memory stays bounded by the block size
+    print(f"Normalizing {args.input} in blocks of {args.block_size_mb} MB...")
+    csv_writer = None
+    parquet_writer = JobsParquetWriter(args.parquet) if args.parquet else None
+    try:
+        for i, chunk in enumerate(read_chunks(args.input, args.block_size_mb << 20)):
+            chunk = normalize_chunk(chunk)
+            for field in categorical_fields:
+                if field in chunk.columns:
+                    present.add(field)
+                    counts[field].update(chunk[field].dropna().str.strip().value_counts().to_dict())
+            if 'job_skills' in chunk.columns:
+                # Comma-separated skills; their frequencies pick the Superlinked skills space categories
+                present.add('skills_list')
+                skills = chunk['job_skills'].dropna().str.split(',').explode().str.strip()
+                counts['skills_list'].update(skills[skills != ''].value_counts().to_dict())
+            if csv_writer is None:
+                csv_writer = CSVAppender(tmp_csv_path)
+            csv_writer.write(chunk)
+            if parquet_writer:
+                parquet_writer.write(chunk)
+            rows += len(chunk)
+            if (i + 1) % 10 == 0:
+                print(f"  {rows} rows ({rows / (time.perf_counter() - start):.0f} rows/s)")
+        if csv_writer is None:
+            # A header-only input has no blocks; its outputs still get the normalized columns
+            empty = normalize_chunk(pd.DataFrame(columns=read_header(args.input)))
+            csv_writer = CSVAppender(tmp_csv_path)
+            csv_writer.write(empty)
+            if parquet_writer:
+                parquet_writer.write(empty)
+        csv_writer.close()
+        if parquet_writer:
+            parquet_writer.close()
+    except BaseException:
+        if csv_writer:
+            csv_writer.close()
+        if parquet_writer:
+            parquet_writer.abort()
+        if os.path.exists(tmp_csv_path):
+            os.remove(tmp_csv_path)
+        raise
+    os.replace(tmp_csv_path, args.output)
+    print(f"Normalized CSV saved: {args.output}")
+    if args.parquet:
+        print(f"Parquet copy saved: {args.parquet}")
+
+    # Extract categorical field options for schema.json
+    # Read existing schema.json or create new one
+    if os.path.exists(args.schema):
+        with open(args.schema, 'r') as f:
+            schema = json.load(f)
+    else:
+        schema = {}
+
+    for field in [*categorical_fields, 'skills_list']:
+        if field in present:
+            if field == 'skills_list':
+                # Only the most frequent skills become options; the long tail (typos, one-off phrasings)
+                # would slow the backend skill matcher and stays in schema_counts.json only
+                schema[field] = sorted(skill for skill, _ in counts[field].most_common(args.max_skills))
+                print(f"{field}: {len(schema[field])} of {len(counts[field])} options")
+            else:
+                schema[field] = sorted(counts[field])
+                print(f"{field}: {len(schema[field])} options")
+        else:
+            print(f"{field} column not found in CSV.")
+
+    with open(args.schema, 'w') as f:
+        json.dump(schema, f, indent=2)
+    # Value frequencies, most common first
+    with open(os.path.splitext(args.schema)[0] + '_counts.json', 'w') as f:
+        json.dump({field: dict(counts[field].most_common()) for field in present}, f, indent=2)
+
+    elapsed = time.perf_counter() - start
+    print(f"Schema.json updated: {args.schema}")
+    print(f"Process completed: {rows} rows in {elapsed:.1f}s ({rows / elapsed:.0f} rows/s).")
 
-# Save schema.json
-with open(schema_json_path, 'w') as f:
-    json.dump(schema, f, indent=2)
 
-print(f"Schema.json updated: {schema_json_path}")
-print("Process completed.")
\ No newline at end of file
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Normalize jobs.csv and extract schema.json vocabularies.")
+    parser.add_argument('--input', default=jobs_csv_path)
+    parser.add_argument('--output', default=jobs_csv_path, help="Normalized CSV (may be the input file)")
+    parser.add_argument('--parquet', default=jobs_parquet_path, help="Columnar copy; empty to skip")
+    parser.add_argument('--schema', default=schema_json_path, help="Vocabularies; frequencies go next to it (*_counts.json)")
+    parser.add_argument('--max-skills', type=int, default=1000, help="Most frequent skills kept in schema.json skills_list")
+    parser.add_argument('--block-size-mb', type=int, default=8, help="CSV bytes read per chunk; peak memory is roughly 60x this (reader read-ahead)")
+    main(parser.parse_args())
@@ -0,0 +1,124 @@
+"""Report NLQ prompt size and latency with full vs pruned filter option lists.
+
+The instructor prompt Superlinked sends to the NLQ model is rebuilt from
+superlinked_app.query twice, in subprocesses with different
+NLQ_MAX_FILTER_OPTIONS values: once with every option list inlined and once
+with high-cardinality lists pruned. The pruned run uses queries carrying the
+backend's "Matching ... values" hints, as the search route sends them.
+
+With --llm, the sample queries are also run through Superlinked's NLQ
+handler against the configured model to time parameter extraction.
+
+Requires the Superlinked server dependencies and data/schema.json.
+
+Usage (from the backend directory):
+    python -m scripts.report_nlq_prompt
+    python -m scripts.report_nlq_prompt --llm --repeat 3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+QUERIES_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "nlq_queries.txt")
+UNLIMITED = 10 ** 9
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English text)."""
+    return max(1, len(text) // 4)
+
+
+def load_queries(path: str) -> list[str]:
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+async def measure(queries: list[str], use_llm: bool, repeat: int) -> dict:
+    """Build the job search instructor prompt and optionally time NLQ calls."""
+    from superlinked.framework.dsl.query.nlq.nlq_clause_collector import NLQClauseCollector
+    from superlinked.framework.dsl.query.nlq.nlq_handler import NLQHandler
+    from superlinked.framework.dsl.query.nlq.param_filler.query_param_prompt_builder import (
+        QueryParamPromptBuilder,
+    )
+
+    from superlinked_app.nlq import openai_config, system_prompt
+    from superlinked_app.query import query
+
+    collector = NLQClauseCollector(query.clauses, query._space_weight_param_info)
+    prompt = QueryParamPromptBuilder.calculate_instructor_prompt(collector, system_prompt)
+    report = {
+        "prompt_chars": len(prompt),
+        "prompt_tokens": estimate_tokens(prompt),
+        "query_tokens": statistics.mean(estimate_tokens(q) for q in queries),
+    }
+    if use_llm:
+        handler = NLQHandler(openai_config)
+        latencies = []
+        for natural_query in queries:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                await handler.fill_params(
+                    natural_query, query.clauses, query._space_weight_param_info, system_prompt
+                )
+                latencies.append(time.perf_counter() - start)
+        report["median_latency_ms"] = 1000 * statistics.median(latencies)
+    return report
+
+
+def run_variant(max_options: int, queries: list[str], args: argparse.Namespace) -> dict:
+    """Measure one variant in a fresh interpreter so the filter params are rebuilt."""
+    command = [sys.executable, "-m", "scripts.report_nlq_prompt", "--worker", "--repeat", str(args.repeat)]
+    if args.llm:
+        command.append("--llm")
+    completed = subprocess.run(
+        command,
+        input=json.dumps(queries),
+        env={**os.environ, "NLQ_MAX_FILTER_OPTIONS": str(max_options)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main(args: argparse.Namespace) -> None:
+    if args.worker:
+        queries = json.loads(sys.stdin.read())
+        print(json.dumps(asyncio.run(measure(queries, args.llm, args.repeat))))
+        return
+
+    os.environ["NLQ_MAX_FILTER_OPTIONS"] = str(args.max_options)
+    from app.option_index import get_option_hints
+
+    queries = load_queries(args.queries)
+    hinted = [get_option_hints().with_hints({"natural_query": q})["natural_query"] for q in queries]
+    variants = {
+        "full": run_variant(UNLIMITED, queries, args),
+        f"pruned (>{args.max_options})": run_variant(args.max_options, hinted, args),
+    }
+
+    print(f"{'variant':<16} {'prompt chars':>12} {'~tokens':>8} {'~query tokens':>13} {'median ms':>10}")
+    for name, report in variants.items():
+        latency = f"{report['median_latency_ms']:10.1f}" if "median_latency_ms" in report else f"{'-':>10}"
+        print(
+            f"{name:<16} {report['prompt_chars']:>12} {report['prompt_tokens']:>8} "
+            f"{report['query_tokens']:>13.1f} {latency}"
+        )
+    full, pruned = variants.values()
+    print(f"Prompt tokens reduced by {100 * (1 - pruned['prompt_tokens'] / full['prompt_tokens']):.1f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", default=QUERIES_PATH)
+    parser.add_argument("--max-options", type=int, default=50)
+    parser.add_argument("--llm", action="store_true", help="Time NLQ parameter extraction with the configured model")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    main(parser.parse_args())
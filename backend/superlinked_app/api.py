@@ -1,30 +1,55 @@
+import json
+
 from superlinked import framework as sl
 
-from superlinked_app.index import index, job_schema
+from superlinked_app.index import LOCATION_FACETS, index, job_schema
 from superlinked_app.query import query, cv_query
 from superlinked_app.config import settings
+from superlinked_app.generation import TrackedDataLoaderSource, TrackedRestSource
+from superlinked_app.partitions import install_partition_router
+from superlinked_app.qdrant import tune_qdrant_collection
+from superlinked_app.snapshot import restore_bundled_snapshot
 
 # Setup the executor
-rest_source = sl.RestSource(job_schema)
+# Tracked sources bump the index generation on every ingest
+rest_source = TrackedRestSource(job_schema)
+
+# An empty Qdrant is bulk-loaded from the bundled snapshot instead of re-embedding the dataset
+restore_bundled_snapshot()
+tune_qdrant_collection()
+# Searches filtered to a few (country, category) partitions only visit those
+install_partition_router()
 
 vector_database = sl.QdrantVectorDatabase(
     url=settings.qdrant_url, 
     api_key=settings.qdrant_api_key,
+    search_algorithm=sl.SearchAlgorithm[settings.qdrant_search_algorithm.upper()],
     prefer_grpc=True
 )
 
-config = sl.DataLoaderConfig(
-    path=settings.path_dataset,
-    format=sl.DataFormat.CSV,
-    name="job_postings",
-    pandas_read_kwargs={
-        "chunksize": settings.chunk_size,
-        "converters": {
-            "job_skills": lambda x: [skill.strip() for skill in str(x).split(',')] if x and str(x) != 'nan' else []
-        }
-    },
-)
-loader_source = sl.DataLoaderSource(job_schema, config)
+if settings.path_dataset.endswith(".parquet"):
+    # jobs.parquet (scripts/normalize_jobs.py) already stores job_skills as a list
+    config = sl.DataLoaderConfig(
+        path=settings.path_dataset,
+        format=sl.DataFormat.PARQUET,
+        name="job_postings",
+        pandas_read_kwargs={"engine": "pyarrow"},
+    )
+else:
+    config = sl.DataLoaderConfig(
+        path=settings.path_dataset,
+        format=sl.DataFormat.CSV,
+        name="job_postings",
+        pandas_read_kwargs={
+            "chunksize": settings.chunk_size,
+            "converters": {
+                "job_skills": lambda x: [skill.strip() for skill in str(x).split(',')] if x and str(x) != 'nan' else [],
+                # Location facets written by scripts/dedupe_jobs.py are JSON arrays
+                **{facet: lambda x: json.loads(x) if x else [] for facet in LOCATION_FACETS},
+            }
+        },
+    )
+loader_source = TrackedDataLoaderSource(job_schema, config)
 
 executor = sl.RestExecutor(
     sources=[
@@ -12,19 +12,62 @@ class Settings(BaseSettings):
     # Embedding settings
     text_embedder_name: str = "ibm-granite/granite-embedding-small-english-r2"
     chunk_size: int = 1000
+    # Persistent embedding cache directory (empty disables it)
+    embedding_cache_dir: str = "cache/embeddings"
+    # Categories of the skills space: the most frequent skills (0 leaves the space out)
+    skills_space_size: int = 256
+    # "torch" runs the embedder in PyTorch; "onnx" runs its int8 ONNX export on CPU
+    # (python -m superlinked_app.onnx_embedder export writes it)
+    embedding_backend: str = "torch"
+    onnx_model_dir: str = "cache/onnx"
+    # Dynamic int8 quantization target: avx512_vnni, avx512, avx2 or arm64
+    onnx_quantization: str = "avx512_vnni"
+    # ONNX Runtime intra-op threads per server worker (0 uses every core)
+    onnx_threads: int = 0
+    # Query-time micro-batching (superlinked_app/query_batcher.py): texts of concurrent
+    # searches wait up to this many ms, or until max items are pending, deduplicated in a
+    # queue of their own (0 leaves only Superlinked's 5 ms batching)
+    query_batch_window_ms: float = 5
+    query_batch_max_items: int = 32
 
-    # Path to the dataset
+    # Path to the dataset (.csv, or .parquet written by scripts/normalize_jobs.py)
     path_dataset: str = "data/jobs.csv"
     path_categories: str = "data/schema.json"
     
+    # Index generation file, shared with the backend to invalidate its result cache
+    path_index_generation: str = "state/index_generation"
+    # BM25 index of titles, summaries and skills for the backend's hybrid search, written
+    # on every ingest to the same shared volume (empty disables it)
+    path_lexical_index: str = "state/lexical"
+
+    # Qdrant snapshot of the populated index, restored into an empty collection at startup
+    # (python -m superlinked_app.snapshot export writes it; empty disables the restore)
+    path_index_snapshot: str = "snapshots/jobs_index.snapshot"
+    
     # OpenAI for Natural Language Query
     openai_model: str = "meta-llama/llama-4-maverick-17b-128e-instruct"
     openai_api_key: SecretStr = SecretStr("")
     openai_base_url: str = "https://api.groq.com/openai/v1"
+    # Option lists longer than this are left out of the NLQ prompt
+    nlq_max_filter_options: int = 50
     
     # Qdrant vector database
     qdrant_url: str = "http://qdrant:6333"
     qdrant_api_key: str = ""
+    # "hnsw" searches the HNSW graph (approximate); "flat" scores every matching point exactly
+    qdrant_search_algorithm: str = "hnsw"
+    # Collection tuning at startup (superlinked_app/qdrant.py): keyword payload
+    # indexes for the filter fields, HNSW parameters and optional int8 quantization
+    qdrant_tune_collection: bool = True
+    qdrant_hnsw_m: int = 16
+    qdrant_hnsw_ef_construct: int = 100
+    qdrant_quantization: bool = False
+    qdrant_quantization_quantile: float = 0.99
+    # Partitioned index (superlinked_app/partitions.py): points are tagged with their
+    # (search country, job category) pairs, stored together per pair in Qdrant, and
+    # searches whose filters allow at most partition_max_fanout pairs visit only those
+    partitioned_index: bool = False
+    partition_max_fanout: int = 4
     
     model_config = SettingsConfigDict(
         env_file=DEFAULT_ENV_FILENAME, env_file_encoding="utf-8"
@@ -0,0 +1,128 @@
+import asyncio
+import fcntl
+import hashlib
+import json
+import os
+
+import numpy as np
+from superlinked.framework.common.space.embedding.model_based.engine.sentence_transformers_engine import (
+    SentenceTransformersEngine,
+)
+
+from superlinked_app.config import settings
+
+DIGEST_SIZE = 16
+
+
+# Persistent embedding cache - one directory per embedding engine holding an
+# append-only float32 matrix (vectors.f32, memory-mapped for reads) and the
+# matching row keys (keys.bin, 16-byte hashes of the input text).
+# Rows are only ever appended, under a lock file shared by all server workers;
+# vectors are written before their keys, so a key always points at a complete row.
+class EmbeddingStore:
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self.keys_path = os.path.join(directory, "keys.bin")
+        self.meta_path = os.path.join(directory, "meta.json")
+        self.dimension = None
+        self.rows: dict[bytes, int] = {}
+        self._matrix = None
+        self.hits = 0
+        self.misses = 0
+        self._refresh()
+
+    def get_many(self, keys: list[bytes]) -> list[np.ndarray | None]:
+        if any(key not in self.rows for key in keys):
+            # Other workers may have appended the missing rows
+            self._refresh()
+        found = [self._matrix[self.rows[key]] if key in self.rows else None for key in keys]
+        hits = sum(vector is not None for vector in found)
+        self.hits += hits
+        self.misses += len(keys) - hits
+        return found
+
+    def put_many(self, keys: list[bytes], vectors: list[list[float]]) -> None:
+        if not keys:
+            return
+        matrix = np.asarray(vectors, dtype=np.float32)
+        with open(os.path.join(self.directory, ".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self._refresh()
+            if self.dimension is None:
+                self.dimension = matrix.shape[1]
+                with open(self.meta_path, "w", encoding="utf-8") as f:
+                    json.dump({"dimension": self.dimension}, f)
+            new = {}
+            for key, vector in zip(keys, matrix):
+                if key not in self.rows:
+                    new.setdefault(key, vector)
+            if not new:
+                return
+            row_count = len(self.rows)
+            # Writing at the end of the last complete row drops any torn write
+            with open(self.vectors_path, "ab+") as f:
+                f.truncate(row_count * self.dimension * 4)
+                f.write(np.stack(list(new.values())).astype(np.float32).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            with open(self.keys_path, "ab+") as f:
+                f.truncate(row_count * DIGEST_SIZE)
+                f.write(b"".join(new))
+            self._refresh()
+
+    def _refresh(self) -> None:
+        if self.dimension is None:
+            try:
+                with open(self.meta_path, encoding="utf-8") as f:
+                    self.dimension = json.load(f)["dimension"]
+            except (OSError, ValueError, KeyError):
+                return
+        try:
+            keys_size = os.path.getsize(self.keys_path)
+            vectors_size = os.path.getsize(self.vectors_path)
+        except OSError:
+            return
+        row_count = min(keys_size // DIGEST_SIZE, vectors_size // (self.dimension * 4))
+        if row_count == len(self.rows):
+            return
+        with open(self.keys_path, "rb") as f:
+            f.seek(len(self.rows) * DIGEST_SIZE)
+            data = f.read((row_count - len(self.rows)) * DIGEST_SIZE)
+        for offset in range(0, len(data), DIGEST_SIZE):
+            self.rows.setdefault(data[offset:offset + DIGEST_SIZE], len(self.rows))
+        self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(row_count, self.dimension))
+
+
+class CachedSentenceTransformersEngine(SentenceTransformersEngine):
+    # Text inputs are looked up in the store first; only misses reach the model
+    def __init__(self, model_name, model_cache_dir, config) -> None:
+        super().__init__(model_name, model_cache_dir, config)
+        store_name = hashlib.sha256(self.key.encode()).hexdigest()[:16]
+        self._store = EmbeddingStore(os.path.join(embedding_cache_dir(), store_name))
+
+    async def embed(self, inputs, is_query_context: bool) -> list[np.ndarray]:
+        if not all(isinstance(input_, str) for input_ in inputs):
+            return await super().embed(inputs, is_query_context)
+        # Query prompts change the vector; without one, ingest and query share rows
+        prefix = f"{self.key}\0{is_query_context and self.is_query_prompt_supported()}\0"
+        keys = [hashlib.blake2b((prefix + text).encode(), digest_size=DIGEST_SIZE).digest() for text in inputs]
+        found = self._store.get_many(keys)
+        missing = [i for i, vector in enumerate(found) if vector is None]
+        if missing:
+            missing_inputs = list(dict.fromkeys(inputs[i] for i in missing))
+            computed = dict(zip(missing_inputs, await super().embed(missing_inputs, is_query_context)))
+            # Appending locks, writes and fsyncs the store files, so it runs off the event loop
+            await asyncio.to_thread(
+                self._store.put_many, [keys[i] for i in missing], [computed[inputs[i]] for i in missing]
+            )
+            for i in missing:
+                found[i] = computed[inputs[i]]
+        # Copies detach the rows from the memory map
+        return [np.array(vector, dtype=np.float32) for vector in found]
+
+
+def embedding_cache_dir() -> str:
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(current_dir, '..', settings.embedding_cache_dir)
@@ -2,6 +2,7 @@ from collections import namedtuple
 
 from superlinked import framework as sl
 
+from superlinked_app.config import settings
 from superlinked_app.index import job_schema, load_categories
 from superlinked_app.nlq import (
     company_description,
@@ -18,17 +19,18 @@ CategoryFilter = namedtuple(
 )
 
 # Define all filters
+# Location filters match the merged facets, so a deduplicated posting is found from any of its locations
 filters = [
     # State filters - available in categories.json
     CategoryFilter(
-        operator=job_schema.state.in_,
+        operator=job_schema.states.contains,
         param_name="states_include",
         field_name="state",
         description="States that should be included. Available: CA, TX, FL, NY, IL, etc.",
         options=job_categories.get("state", []),
     ),
     CategoryFilter(
-        operator=job_schema.state.not_in_,
+        operator=job_schema.states.not_contains,
         param_name="states_exclude",
         field_name="state",
         description="States that should be excluded.",
@@ -36,14 +38,14 @@ filters = [
     ),
     # Search city filters - dynamic values (many unique search cities)
     CategoryFilter(
-        operator=job_schema.search_city.in_,
+        operator=job_schema.search_cities.contains,
         param_name="search_cities_include",
         field_name="search_city",
         description="Search cities that should be included.",
         options=job_categories.get("search_city", []),
     ),
     CategoryFilter(
-        operator=job_schema.search_city.not_in_,
+        operator=job_schema.search_cities.not_contains,
         param_name="search_cities_exclude",
         field_name="search_city",
         description="Search cities that should be excluded.",
@@ -51,14 +53,14 @@ filters = [
     ),
     # Search country filters - available in categories.json
     CategoryFilter(
-        operator=job_schema.search_country.in_,
+        operator=job_schema.search_countries.contains,
         param_name="search_countries_include",
         field_name="search_country",
         description="Search countries that should be included. Available: United States, United Kingdom, Canada, Australia.",
         options=job_categories.get("search_country", []),
     ),
     CategoryFilter(
-        operator=job_schema.search_country.not_in_,
+        operator=job_schema.search_countries.not_contains,
         param_name="search_countries_exclude",
         field_name="search_country",
         description="Search countries that should be excluded. Available: United States, United Kingdom, Canada, Australia.",
@@ -146,10 +148,20 @@ def apply_filters(query):
     for filter_item in filters:
         # For dynamic fields (city, company, job_location, search_city) options may be empty
         # but we still want to enable the filtering capability
+        options = filter_item.options if filter_item.options else None
+        description = filter_item.description
+        # Thousands of companies or cities would dominate the NLQ prompt; the backend
+        # appends the few values that match the query to the query text instead
+        if options and len(options) > settings.nlq_max_filter_options:
+            options = None
+            description += (
+                f" Use exact values from the 'Matching {filter_item.field_name} values' line"
+                " of the query when present."
+            )
         param = sl.Param(
             filter_item.param_name,
-            description=filter_item.description,
-            options=filter_item.options if filter_item.options else None,
+            description=description,
+            options=options,
         )
         query = query.filter(filter_item.operator(param))
     
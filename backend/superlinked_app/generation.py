@@ -0,0 +1,92 @@
+import asyncio
+import fcntl
+import logging
+import os
+import time
+
+from superlinked import framework as sl
+
+from superlinked_app.config import settings
+from superlinked_app.index import fill_location_facets, fill_record_location_facets
+from superlinked_app.lexical import lexical_index, to_frame
+from superlinked_app.partitions import fill_partitions, fill_record_partitions
+from superlinked_app.qdrant import is_tuned, tune_qdrant_collection
+
+logger = logging.getLogger(__name__)
+
+
+# Index generation - a counter bumped on every write to the index.
+# It lives in a file on a volume shared with the backend, which keys its
+# search result cache on it, so results cached before an ingest are never served after it.
+class IndexGeneration:
+    def __init__(self, path: str):
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        self.path = os.path.join(current_dir, '..', path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+    def bump(self) -> int:
+        # The lock file serializes bumps across server workers
+        with open(self.path + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    current = int(f.read().strip() or 0)
+            except (OSError, ValueError):
+                current = 0
+            # Start from the clock so a deleted file never repeats an old generation
+            generation = max(current + 1, time.time_ns())
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(str(generation))
+            os.replace(tmp_path, self.path)
+        return generation
+
+
+index_generation = IndexGeneration(settings.path_index_generation)
+
+
+def add_to_lexical_index(data) -> None:
+    # Hybrid search is an add-on; the vector ingest has already succeeded
+    if lexical_index is None:
+        return
+    try:
+        lexical_index.add(to_frame(data))
+    except (OSError, ValueError) as e:
+        logger.error("Lexical index update failed: %s", e)
+
+
+class GenerationTrackingMixin:
+    async def put_async(self, data) -> None:
+        # A fresh collection is tuned before its first points arrive
+        if not is_tuned():
+            await asyncio.to_thread(tune_qdrant_collection)
+        # Bump before writing so cached results stop being served,
+        # and again after so results cached mid-write are dropped too
+        index_generation.bump()
+        try:
+            await super().put_async(data)
+            await asyncio.to_thread(add_to_lexical_index, data)
+        finally:
+            index_generation.bump()
+
+
+class TrackedRestSource(GenerationTrackingMixin, sl.RestSource):
+    async def put_async(self, data) -> None:
+        # Posted records get their location facets, then their partitions from their
+        # countries and category
+        if isinstance(data, list):
+            data = [fill_record_partitions(fill_record_location_facets(record)) for record in data]
+        else:
+            data = fill_record_partitions(fill_record_location_facets(data))
+        await super().put_async(data)
+
+
+class TrackedDataLoaderSource(GenerationTrackingMixin, sl.DataLoaderSource):
+    async def put_async(self, data) -> None:
+        # The server only streams CSV and JSON; Parquet arrives as one frame,
+        # which is ingested chunk_size rows at a time like CSV chunks
+        frames = data if isinstance(data, list) else [data]
+        for frame in frames:
+            frame = fill_partitions(fill_location_facets(frame))
+            for start in range(0, len(frame), settings.chunk_size):
+                await super().put_async([frame.iloc[start:start + settings.chunk_size]])
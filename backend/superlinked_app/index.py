@@ -2,7 +2,17 @@ from superlinked import framework as sl
 import json
 import os
 
+import numpy as np
+
 from superlinked_app.config import settings
+from superlinked_app.onnx_embedder import install_embedding_engine
+from superlinked_app.query_batcher import install_query_batcher
+
+# Embed through the persistent cache so re-ingestion and repeated queries skip the model,
+# and with the int8 ONNX model when EMBEDDING_BACKEND=onnx
+install_embedding_engine()
+# Search texts arriving within a few ms of each other are encoded as one batch
+install_query_batcher()
 
 # Load categories from JSON file
 def load_categories():
@@ -15,6 +25,19 @@ def load_categories():
 categories = load_categories()
 
 
+def load_skills_vocabulary(size: int) -> list[str]:
+    # Most frequent skills first, from the counts written next to schema.json
+    # by scripts/normalize_jobs.py; schema.json order when they are missing
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    counts_path = os.path.join(current_dir, '..', os.path.splitext(settings.path_categories)[0] + '_counts.json')
+    try:
+        with open(counts_path, 'r', encoding='utf-8') as f:
+            skills = list(json.load(f).get("skills_list", {}))
+    except (OSError, ValueError):
+        skills = []
+    return (skills or categories.get("skills_list", []))[:size]
+
+
 class JobPosting(sl.Schema):
     # `id` is obligatory field - using job_link as unique identifier
     id: sl.IdField
@@ -36,12 +59,55 @@ class JobPosting(sl.Schema):
     job_type: sl.String | None        # Job type (Onsite, Remote, Hybrid)
     job_category: sl.String | None    # Job category (data_analyst, data_engineer, etc.)
 
+    # Location facets - every value of the near-duplicate postings merged into this one
+    # (scripts/dedupe_jobs.py); filled from the single-valued fields when absent
+    job_locations: sl.StringList | None
+    states: sl.StringList | None
+    search_cities: sl.StringList | None
+    search_countries: sl.StringList | None
+
+    # "search country|job category" pairs of the posting, filled at ingest when
+    # PARTITIONED_INDEX is on (superlinked_app/partitions.py)
+    partitions: sl.StringList | None
+
     # Job link
     job_link: sl.String | None 
 
 
 job_schema = JobPosting()
 
+# List facet -> single-valued field it merges
+LOCATION_FACETS = {
+    "job_locations": "job_location",
+    "states": "state",
+    "search_cities": "search_city",
+    "search_countries": "search_country",
+}
+
+
+def fill_location_facets(frame):
+    # Rows that were not deduplicated carry only the single-valued fields
+    frame = frame.copy()
+    for facet, field in LOCATION_FACETS.items():
+        if field not in frame.columns:
+            continue
+        own = frame[field].map(lambda value: [value] if isinstance(value, str) and value else [])
+        if facet in frame.columns:
+            own = frame[facet].where(frame[facet].map(lambda value: isinstance(value, (list, np.ndarray))), own)
+        frame[facet] = own
+    return frame
+
+
+def fill_record_location_facets(record: dict) -> dict:
+    # Posted records (scripts/ingest_delta.py) may carry only the single-valued fields
+    missing = {
+        facet: [record[field]] if isinstance(record.get(field), str) and record[field] else []
+        for facet, field in LOCATION_FACETS.items()
+        if record.get(facet) is None
+    }
+    return {**record, **missing} if missing else record
+
+
 # Most important field: Job summary/description - for semantic search
 description_space = sl.TextSimilaritySpace(
     text=job_schema.job_summary,
@@ -54,12 +120,21 @@ title_space = sl.TextSimilaritySpace(
     model=settings.text_embedder_name,
 )
 
+# Job skills - one dimension per frequent skill, so a set of skills ranks jobs
+# by overlap (cosine of the multi-hot vectors); rarer skills are ignored
+skills_vocabulary = load_skills_vocabulary(settings.skills_space_size)
+skills_space = sl.CategoricalSimilaritySpace(
+    category_input=job_schema.job_skills,
+    categories=skills_vocabulary,
+    uncategorized_as_category=False,
+) if skills_vocabulary else None
+
 # Index - composition of spaces and filtering fields
 index = sl.Index(
     spaces=[
         description_space,         # Job description (most important)
         title_space,               # Job title
-        # skills_space,              # Job skills
+        *([skills_space] if skills_space else []),  # Job skills
     ],
     # The fields below are used for hard-filtering
     # Users can apply exact filters based on these criteria
@@ -68,11 +143,16 @@ index = sl.Index(
         job_schema.state,               # State filter
         job_schema.search_city,         # Search city filter
         job_schema.search_country,      # Search country filter
+        job_schema.states,              # Merged state facet (state filters)
+        job_schema.search_cities,       # Merged search city facet (search city filters)
+        job_schema.search_countries,    # Merged search country facet (search country filters)
+        job_schema.job_locations,       # Merged full locations
         job_schema.job_level,           # Experience level (Associate, Mid Senior)
         job_schema.job_type,            # Work type (Onsite, Remote, Hybrid)
         job_schema.job_category,        # Job category (data_analyst, etc.)
         job_schema.company,             # Company name
         job_schema.job_link,            # Job link
         job_schema.job_skills,          # Job skills (hard-coded filter)
+        *([job_schema.partitions] if settings.partitioned_index else []),  # Query routing
     ],
 )
\ No newline at end of file
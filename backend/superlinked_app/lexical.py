@@ -0,0 +1,289 @@
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from superlinked_app.config import settings
+from superlinked_app.index import LOCATION_FACETS, fill_location_facets, job_schema
+
+FORMAT_VERSION = 1
+# Lowercased words, keeping the symbols of names like C#, C++ and Node.js
+TOKEN_PATTERN = r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]"
+# Term frequencies count a title word three times and a skill twice
+FIELD_WEIGHTS = {"job_title": 3, "job_skills": 2, "job_summary": 1}
+BM25_K1 = 1.2
+BM25_B = 0.75
+MANIFEST = "segments.json"
+
+
+# Lexical (BM25) index - written on every ingest, next to the index generation on the
+# volume shared with the backend, which memory-maps it for hybrid search.
+# The index is a list of immutable segments, oldest first; a newer segment replaces
+# the postings of any id it repeats or deletes. Each segment directory holds flat arrays:
+#   terms.u64        sorted 8-byte hashes of the terms
+#   offsets.u64      postings of terms[i] are postings_*[offsets[i]:offsets[i + 1]]
+#   postings_doc.u32 segment-local document numbers, ascending within a term
+#   postings_tf.u16  field-weighted term frequencies
+#   doc_len.u32      field-weighted document lengths
+#   ids.u64          8-byte hashes of the document ids
+#   docs.jsonl       stored fields per document, byte ranges in docs_offsets.u64
+#   deletes.u64      optional, sorted id hashes removed from older segments; a segment
+#                    with only deletes is a tombstone (app/lexical_index.py writes them
+#                    for scripts/ingest_delta.py), folded into the next merge
+# segments.json lists the live segments with the tokenizer and BM25 settings the
+# backend must use; it is replaced atomically after every change.
+def hash64(values) -> np.ndarray:
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "little") for value in values],
+        dtype=np.uint64,
+    )
+
+
+def stored_fields() -> list[str]:
+    return [field.name for field in job_schema.schema_fields]
+
+
+def field_text(values: pd.Series) -> pd.Series:
+    # job_skills arrives as a list (or an array from Parquet), the other fields as text
+    return values.map(lambda value: ", ".join(value) if isinstance(value, (list, np.ndarray)) else value).fillna("").astype(str)
+
+
+class Segment:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.terms = self._load("terms.u64", np.uint64)
+        self.offsets = self._load("offsets.u64", np.uint64)
+        self.postings_doc = self._load("postings_doc.u32", np.uint32)
+        self.postings_tf = self._load("postings_tf.u16", np.uint16)
+        self.doc_len = self._load("doc_len.u32", np.uint32)
+        self.ids = self._load("ids.u64", np.uint64)
+        self.docs_offsets = self._load("docs_offsets.u64", np.uint64)
+        self.deletes = self._load("deletes.u64", np.uint64, optional=True)
+
+    def _load(self, name: str, dtype, optional: bool = False) -> np.ndarray:
+        path = os.path.join(self.directory, name)
+        if (optional and not os.path.exists(path)) or os.path.getsize(path) == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def term_per_posting(self) -> np.ndarray:
+        return np.repeat(self.terms, np.diff(self.offsets).astype(np.int64))
+
+    def doc_lines(self, docs: np.ndarray) -> list[bytes]:
+        with open(os.path.join(self.directory, "docs.jsonl"), "rb") as f:
+            data = f.read()
+        return [data[self.docs_offsets[doc]:self.docs_offsets[doc + 1]] for doc in docs]
+
+
+def write_segment(directory: str, ids: np.ndarray, term: np.ndarray, doc: np.ndarray, tf: np.ndarray,
+                  doc_len: np.ndarray, doc_lines: list[bytes], deletes: np.ndarray | None = None) -> None:
+    # Postings must arrive sorted by (term, doc)
+    os.makedirs(directory)
+    starts = np.flatnonzero(np.r_[True, term[1:] != term[:-1]]) if len(term) else np.empty(0, dtype=np.int64)
+    arrays = {
+        "terms.u64": term[starts].astype(np.uint64),
+        "offsets.u64": np.r_[starts, len(term)].astype(np.uint64),
+        "postings_doc.u32": doc.astype(np.uint32),
+        "postings_tf.u16": np.minimum(tf, np.iinfo(np.uint16).max).astype(np.uint16),
+        "doc_len.u32": doc_len.astype(np.uint32),
+        "ids.u64": ids.astype(np.uint64),
+        "docs_offsets.u64": np.r_[0, np.cumsum([len(line) for line in doc_lines])].astype(np.uint64),
+    }
+    if deletes is not None and len(deletes):
+        arrays["deletes.u64"] = np.unique(deletes).astype(np.uint64)
+    for name, array in arrays.items():
+        array.tofile(os.path.join(directory, name))
+    with open(os.path.join(directory, "docs.jsonl"), "wb") as f:
+        f.writelines(doc_lines)
+
+
+def build_segment(directory: str, frame: pd.DataFrame) -> int:
+    id_column = "id" if "id" in frame.columns else "job_link"
+    # Within one batch the last row of an id wins, as it does in the vector index
+    frame = frame[~frame[id_column].astype(str).duplicated(keep="last")].reset_index(drop=True)
+    ids = frame[id_column].astype(str)
+
+    parts = []
+    for name, weight in FIELD_WEIGHTS.items():
+        if name not in frame.columns:
+            continue
+        tokens = field_text(frame[name]).str.lower().str.findall(TOKEN_PATTERN).explode().dropna()
+        parts.append(pd.DataFrame({"doc": tokens.index.to_numpy(), "token": tokens.to_numpy(), "tf": weight}))
+    postings = pd.concat(parts) if parts else pd.DataFrame({"doc": [], "token": [], "tf": []})
+    postings = postings.groupby(["token", "doc"], sort=False, as_index=False)["tf"].sum()
+    vocabulary = postings["token"].unique()
+    term_by_token = dict(zip(vocabulary, hash64(vocabulary)))
+    term = postings["token"].map(term_by_token).to_numpy(dtype=np.uint64)
+    doc = postings["doc"].to_numpy(dtype=np.int64)
+    tf = postings["tf"].to_numpy(dtype=np.int64)
+    order = np.lexsort((doc, term))
+    doc_len = np.bincount(doc, weights=tf, minlength=len(frame))
+
+    fields = [name for name in stored_fields() if name in frame.columns and name != "id"]
+    records = frame[fields].copy()
+    records.insert(0, "id", ids)
+    lines = records.to_json(orient="records", lines=True, force_ascii=False).splitlines()
+    write_segment(directory, hash64(ids), term[order], doc[order], tf[order], doc_len,
+                  [(line + "\n").encode() for line in lines])
+    return len(frame)
+
+
+def merge_segments(directory: str, older: Segment, newer: Segment, keep_deletes: bool) -> int:
+    # Documents of the older segment that the newer one repeats or deletes are dropped.
+    # Deletes still apply to the segments before the merged one, unless there are none.
+    newer_ids = np.sort(np.concatenate([newer.ids, newer.deletes]))
+    positions = np.searchsorted(newer_ids, older.ids).clip(max=max(len(newer_ids) - 1, 0))
+    live = ~(newer_ids[positions] == older.ids) if len(newer_ids) else np.ones(len(older), dtype=bool)
+    remap = np.cumsum(live) - 1
+
+    older_doc = older.postings_doc.astype(np.int64)
+    keep = live[older_doc]
+    term = np.concatenate([older.term_per_posting()[keep], newer.term_per_posting()])
+    doc = np.concatenate([remap[older_doc[keep]], newer.postings_doc.astype(np.int64) + int(live.sum())])
+    tf = np.concatenate([older.postings_tf[keep], newer.postings_tf]).astype(np.int64)
+    order = np.lexsort((doc, term))
+    lines = older.doc_lines(np.flatnonzero(live)) + newer.doc_lines(np.arange(len(newer)))
+    write_segment(
+        directory,
+        np.concatenate([older.ids[live], newer.ids]),
+        term[order], doc[order], tf[order],
+        np.concatenate([older.doc_len[live], newer.doc_len]),
+        lines,
+        np.concatenate([older.deletes, newer.deletes]) if keep_deletes else None,
+    )
+    return len(lines)
+
+
+class LexicalIndexWriter:
+    def __init__(self, path: str):
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        self.directory = os.path.join(current_dir, '..', path)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def add(self, frame: pd.DataFrame) -> None:
+        if frame.empty:
+            return
+        # Server workers ingest in parallel; one at a time changes the segment list
+        with open(os.path.join(self.directory, ".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            segments = self._read_manifest()
+            name = self._new_name()
+            docs = build_segment(os.path.join(self.directory, name), frame)
+            segments.append({"name": name, "docs": docs})
+            # Merging the newest segments while they are at least half the size of the one
+            # before keeps the count logarithmic and every document rewritten O(log n) times;
+            # tombstones (no documents) are merged into the next added segment
+            while len(segments) >= 2 and segments[-1]["docs"] * 2 >= segments[-2]["docs"]:
+                newer, older = segments.pop(), segments.pop()
+                name = self._new_name()
+                docs = merge_segments(
+                    os.path.join(self.directory, name),
+                    Segment(os.path.join(self.directory, older["name"])),
+                    Segment(os.path.join(self.directory, newer["name"])),
+                    keep_deletes=bool(segments),
+                )
+                segments.append(self._entry(name, docs))
+            self._write_manifest(segments)
+            self._remove_unlisted(segments)
+
+    def clear(self) -> None:
+        with open(os.path.join(self.directory, ".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self._write_manifest([])
+            self._remove_unlisted([])
+
+    def _entry(self, name: str, docs: int) -> dict:
+        deletes = os.path.join(self.directory, name, "deletes.u64")
+        entry = {"name": name, "docs": docs}
+        if os.path.exists(deletes):
+            entry["deletes"] = os.path.getsize(deletes) // 8
+        return entry
+
+    def _new_name(self) -> str:
+        return f"seg-{time.time_ns()}-{os.getpid()}"
+
+    def _read_manifest(self) -> list[dict]:
+        try:
+            with open(os.path.join(self.directory, MANIFEST), encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return []
+        return manifest["segments"] if manifest.get("version") == FORMAT_VERSION else []
+
+    def _write_manifest(self, segments: list[dict]) -> None:
+        manifest = {
+            "version": FORMAT_VERSION,
+            "token_pattern": TOKEN_PATTERN,
+            "field_weights": FIELD_WEIGHTS,
+            "k1": BM25_K1,
+            "b": BM25_B,
+            "segments": segments,
+        }
+        path = os.path.join(self.directory, MANIFEST)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, path)
+
+    def _remove_unlisted(self, segments: list[dict]) -> None:
+        # Readers that still map a removed segment keep their view until they reload
+        listed = {segment["name"] for segment in segments}
+        for name in os.listdir(self.directory):
+            if name.startswith("seg-") and name not in listed:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+
+def to_frame(data) -> pd.DataFrame:
+    # Data loader batches are DataFrames, REST ingestion sends one or more dicts
+    items = data if isinstance(data, list) else [data]
+    if items and all(isinstance(item, pd.DataFrame) for item in items):
+        return pd.concat(items, ignore_index=True)
+    return pd.DataFrame(items)
+
+
+def read_dataset(path: str, rows: int):
+    # The dataset as api.py loads it: skills as lists, location facets filled
+    if path.endswith(".parquet"):
+        frame = pd.read_parquet(path, engine="pyarrow")
+        chunks = (frame.iloc[start:start + rows] for start in range(0, len(frame), rows))
+    else:
+        chunks = pd.read_csv(path, chunksize=rows, dtype=str, keep_default_na=False)
+    for chunk in chunks:
+        if "job_skills" in chunk.columns:
+            chunk = chunk.assign(job_skills=chunk["job_skills"].map(
+                lambda value: [skill.strip() for skill in value.split(",")] if isinstance(value, str) and value else value
+            ))
+        for facet in LOCATION_FACETS:
+            if facet in chunk.columns:
+                chunk = chunk.assign(**{facet: chunk[facet].map(lambda value: json.loads(value) if isinstance(value, str) and value else value)})
+        yield fill_location_facets(chunk)
+
+
+lexical_index = LexicalIndexWriter(settings.path_lexical_index) if settings.path_lexical_index else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the lexical (BM25) index from the dataset.")
+    parser.add_argument("--dataset", default=settings.path_dataset)
+    parser.add_argument("--rows", type=int, default=20000, help="Rows per segment before merging")
+    args = parser.parse_args()
+    if lexical_index is None:
+        raise SystemExit("PATH_LEXICAL_INDEX is empty; the lexical index is disabled")
+    # Vectors restored from a snapshot never pass through ingestion, so their terms are indexed here
+    start = time.perf_counter()
+    lexical_index.clear()
+    rows = 0
+    for chunk in read_dataset(args.dataset, args.rows):
+        lexical_index.add(chunk)
+        rows += len(chunk)
+        print(f"  {rows} rows ({rows / (time.perf_counter() - start):.0f} rows/s)")
+    print(f"Lexical index rebuilt in {time.perf_counter() - start:.1f}s: {lexical_index.directory}")
@@ -237,4 +237,6 @@ cv_system_prompt = (
     "- title_weight: Default 0.8\n"
     "- similar_description_weight: Default 0.9\n"
     "- similar_title_weight: Default 0.8\n"
+    "- skills_weight: Default 0.9 (ranks jobs by how many CV skills they list)\n"
+    "- similar_skills_weight: Default 0.9\n"
 )
\ No newline at end of file
@@ -0,0 +1,188 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sentence_transformers import SentenceTransformer
+from superlinked.framework.common.space.embedding.model_based import embedding_engine_manager
+from superlinked.framework.common.space.embedding.model_based.engine.sentence_transformers_engine import (
+    SentenceTransformersEngine,
+)
+from superlinked.framework.common.space.embedding.model_based.model_handler import (
+    ModelHandler,
+    TextModelHandler,
+)
+
+from superlinked_app.config import settings
+from superlinked_app.embedding_cache import CachedSentenceTransformersEngine
+
+
+# ONNX embedding backend - the text embedder exported to ONNX and dynamically
+# quantized to int8 weights, run by ONNX Runtime on CPU. Tokenization, pooling,
+# normalization and prompts stay those of the sentence-transformers model.
+def onnx_model_path(model_name: str) -> str:
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(current_dir, '..', settings.onnx_model_dir, model_name.replace("/", "__"))
+
+
+def onnx_file_name() -> str:
+    # Name given by sentence-transformers' export_dynamic_quantized_onnx_model
+    return f"model_qint8_{settings.onnx_quantization}.onnx"
+
+
+def load_onnx_model(model_name: str) -> SentenceTransformer:
+    import onnxruntime
+
+    path = onnx_model_path(model_name)
+    if not os.path.exists(os.path.join(path, "onnx", onnx_file_name())):
+        raise FileNotFoundError(
+            f"No {onnx_file_name()} export of {model_name} in {path}; "
+            "run python -m superlinked_app.onnx_embedder export"
+        )
+    options = onnxruntime.SessionOptions()
+    options.intra_op_num_threads = settings.onnx_threads
+    return SentenceTransformer(
+        path,
+        backend="onnx",
+        trust_remote_code=True,
+        local_files_only=True,
+        model_kwargs={"file_name": onnx_file_name(), "provider": "CPUExecutionProvider", "session_options": options},
+    )
+
+
+class OnnxModelMixin:
+    # The engine class name is part of the engine key, so cached ONNX vectors
+    # never mix with PyTorch ones
+    def _initialize_model(self) -> SentenceTransformer:
+        return load_onnx_model(self._model_name)
+
+
+class OnnxSentenceTransformersEngine(OnnxModelMixin, SentenceTransformersEngine):
+    pass
+
+
+class CachedOnnxSentenceTransformersEngine(OnnxModelMixin, CachedSentenceTransformersEngine):
+    pass
+
+
+def install_embedding_engine() -> None:
+    # Engines are created lazily by the embedding engine manager from this mapping
+    if settings.embedding_backend not in ("torch", "onnx"):
+        raise ValueError(f"Unknown embedding_backend '{settings.embedding_backend}' (expected torch or onnx)")
+    onnx = settings.embedding_backend == "onnx"
+    if settings.embedding_cache_dir:
+        engine = CachedOnnxSentenceTransformersEngine if onnx else CachedSentenceTransformersEngine
+    elif onnx:
+        engine = OnnxSentenceTransformersEngine
+    else:
+        return
+    for handler in (TextModelHandler.SENTENCE_TRANSFORMERS, ModelHandler.SENTENCE_TRANSFORMERS):
+        embedding_engine_manager.ENGINE_BY_HANDLER[handler] = engine
+
+
+def export_onnx_model(model_name: str) -> str:
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    path = onnx_model_path(model_name)
+    # Loading with the ONNX backend exports the float32 graph when the hub repo has none
+    model = SentenceTransformer(
+        model_name, backend="onnx", trust_remote_code=True, model_kwargs={"provider": "CPUExecutionProvider"}
+    )
+    model.save(path)
+    export_dynamic_quantized_onnx_model(
+        model, settings.onnx_quantization, path, file_suffix=f"qint8_{settings.onnx_quantization}"
+    )
+    return os.path.join(path, "onnx", onnx_file_name())
+
+
+def reference_model(model_name: str) -> SentenceTransformer:
+    return SentenceTransformer(model_name, trust_remote_code=True, device="cpu")
+
+
+def sample_texts(count: int) -> tuple[list[str], list[str]]:
+    # Titles and descriptions from the dataset - the inputs of title_space and description_space
+    columns = ["job_title", "job_summary"]
+    if settings.path_dataset.endswith(".parquet"):
+        frame = pd.read_parquet(settings.path_dataset, columns=columns).head(count)
+    else:
+        frame = pd.read_csv(settings.path_dataset, usecols=columns, nrows=count)
+    frame = frame.fillna("")
+    return frame["job_title"].astype(str).tolist(), frame["job_summary"].astype(str).tolist()
+
+
+def encode(model: SentenceTransformer, texts: list[str], is_query: bool, batch_size: int = 32) -> np.ndarray:
+    # Same prompt choice as SentenceTransformersEngine
+    prompt_name = "query" if is_query and "query" in model.prompts else model.default_prompt_name
+    return model.encode(
+        texts, prompt_name=prompt_name, batch_size=batch_size, normalize_embeddings=True, show_progress_bar=False
+    )
+
+
+def check_parity(args: argparse.Namespace) -> bool:
+    titles, descriptions = sample_texts(args.samples)
+    reference = reference_model(settings.text_embedder_name)
+    onnx = load_onnx_model(settings.text_embedder_name)
+    passed = True
+    print(f"{'inputs':<22} {'mean cos':>9} {'p1 cos':>9} {'min cos':>9}")
+    vectors = {}
+    for name, texts, is_query in [
+        ("titles (query)", titles, True),
+        ("titles", titles, False),
+        ("descriptions", descriptions, False),
+    ]:
+        expected = encode(reference, texts, is_query)
+        found = encode(onnx, texts, is_query)
+        vectors[name] = expected, found
+        cosines = np.sum(expected * found, axis=1)
+        print(f"{name:<22} {cosines.mean():>9.5f} {np.percentile(cosines, 1):>9.5f} {cosines.min():>9.5f}")
+        passed &= bool(cosines.min() >= args.min_cosine)
+
+    # Ranking drift: top-10 descriptions per title query, ONNX vs reference
+    queries, onnx_queries = vectors["titles (query)"]
+    corpus, onnx_corpus = vectors["descriptions"]
+    k = min(10, len(corpus))
+    expected_top = np.argsort(-(queries @ corpus.T), axis=1)[:, :k]
+    found_top = np.argsort(-(onnx_queries @ onnx_corpus.T), axis=1)[:, :k]
+    overlap = statistics.mean(len(set(a) & set(b)) / k for a, b in zip(expected_top, found_top))
+    print(f"top-{k} overlap: {overlap:.3f}")
+    return passed
+
+
+def benchmark(args: argparse.Namespace) -> None:
+    titles, descriptions = sample_texts(args.samples)
+    print(f"{'backend':<8} {'batch sent/s':>13} {'single sent/s':>14} {'single p50 ms':>14}")
+    for backend in args.backends:
+        model = load_onnx_model(settings.text_embedder_name) if backend == "onnx" else reference_model(settings.text_embedder_name)
+        encode(model, descriptions[:args.batch_size], False, args.batch_size)  # warm-up
+        start = time.perf_counter()
+        encode(model, descriptions, False, args.batch_size)
+        batch_rate = len(descriptions) / (time.perf_counter() - start)
+
+        # Query time: one title at a time, as a search request embeds it
+        latencies = []
+        for title in titles[:args.queries]:
+            start = time.perf_counter()
+            encode(model, [title], True)
+            latencies.append(time.perf_counter() - start)
+        single_rate = len(latencies) / sum(latencies)
+        print(f"{backend:<8} {batch_rate:>13.1f} {single_rate:>14.1f} {statistics.median(latencies) * 1000:>14.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export, check and benchmark the int8 ONNX text embedder.")
+    parser.add_argument("command", choices=["export", "check", "bench"])
+    parser.add_argument("--samples", type=int, default=1000, help="Dataset rows used by check and bench")
+    parser.add_argument("--min-cosine", type=float, default=0.98, help="check fails below this cosine for any input")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--queries", type=int, default=200, help="Single-query encodes timed by bench")
+    parser.add_argument("--backends", nargs="+", choices=["torch", "onnx"], default=["torch", "onnx"])
+    args = parser.parse_args()
+    if args.command == "export":
+        print(export_onnx_model(settings.text_embedder_name))
+    elif args.command == "check":
+        sys.exit(0 if check_parity(args) else 1)
+    else:
+        benchmark(args)
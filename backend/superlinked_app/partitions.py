@@ -0,0 +1,221 @@
+import argparse
+import dataclasses
+import heapq
+import logging
+
+import httpx
+from qdrant_client.conversions.common_types import QueryResponse
+from qdrant_client.models import FieldCondition, Filter, MatchAny, MatchValue, QueryRequest, SearchParams
+from superlinked.framework.common.storage.search_index.search_algorithm import SearchAlgorithm
+from superlinked.framework.common.storage_manager.storage_naming import StorageNaming
+from superlinked.framework.storage.qdrant import qdrant_vdb_connector
+from superlinked.framework.storage.qdrant.query.qdrant_search import QdrantSearch
+
+from superlinked_app.config import settings
+from superlinked_app.index import job_schema
+from superlinked_app.qdrant import COLLECTION, qdrant_client
+
+logger = logging.getLogger(__name__)
+
+
+# Partitioned index - every point is tagged with the (search country, job category)
+# pairs it belongs to in the `partitions` field, whose Qdrant keyword index is a tenant
+# index, so each partition's points are stored together. A search that includes a few
+# countries and categories explicitly is routed to their partitions: one partition is
+# searched with the partition condition added, several are searched as one batch
+# request and the hits merged by score. The original filters stay on every request, so
+# results are unchanged; searches only read less of the collection. Every other search
+# is global, so postings missing a country or category are never lost to routing.
+CATCH_ALL = "*"
+
+
+def partition_key(country: str, category: str) -> str:
+    return f"{country.strip()}|{category.strip()}"
+
+
+def point_partitions(countries, category) -> list[str]:
+    # A deduplicated posting belongs to a partition per search country it was found in;
+    # without a country or category it gets the catch-all partition, which no search is
+    # routed to
+    if not isinstance(category, str) or not category.strip():
+        return [CATCH_ALL]
+    partitions = [
+        partition_key(country, category) for country in countries or [] if isinstance(country, str) and country.strip()
+    ]
+    return list(dict.fromkeys(partitions)) or [CATCH_ALL]
+
+
+def fill_partitions(frame):
+    # Location facets must be filled first (fill_location_facets)
+    if not settings.partitioned_index or "job_category" not in frame.columns:
+        return frame
+    countries = frame["search_countries"] if "search_countries" in frame.columns else [[]] * len(frame)
+    frame = frame.copy()
+    frame["partitions"] = [point_partitions(c, category) for c, category in zip(countries, frame["job_category"])]
+    return frame
+
+
+def fill_record_partitions(record: dict) -> dict:
+    # REST ingests (scripts/ingest_delta.py) send the facets with every record
+    if not settings.partitioned_index or record.get("partitions") is not None:
+        return record
+    countries = record.get("search_countries") or ([record["search_country"]] if record.get("search_country") else [])
+    return {**record, "partitions": point_partitions(countries, record.get("job_category"))}
+
+
+def payload_field(field) -> str:
+    return StorageNaming.generate_field_name_from_schema_field(field)
+
+
+PARTITIONS_FIELD = payload_field(job_schema.partitions)
+# Payload keys of the routing dimensions: search country, then job category
+DIMENSIONS = (payload_field(job_schema.search_countries), payload_field(job_schema.job_category))
+
+
+def required_values(query_filter: Filter | None) -> tuple[dict[str, set], dict[str, set]]:
+    # Values the include and exclude filters set per routing dimension. Superlinked compiles
+    # filters to Filter(must=[group Filter(must=[clause Filter(must=[...], must_not=[...])])]);
+    # conditions in `should` (OR) groups do not narrow the partitions.
+    allowed, excluded = {}, {}
+    if query_filter is None:
+        return allowed, excluded
+    for group in query_filter.must or []:
+        if not isinstance(group, Filter) or group.should:
+            continue
+        for clause in group.must or []:
+            if not isinstance(clause, Filter):
+                continue
+            for conditions, values_by_key in ((clause.must, allowed), (clause.must_not, excluded)):
+                for condition in conditions or []:
+                    if (
+                        isinstance(condition, FieldCondition)
+                        and condition.key in DIMENSIONS
+                        and isinstance(condition.match, MatchAny)
+                    ):
+                        values = set(condition.match.any)
+                        if values_by_key is allowed and condition.key in allowed:
+                            values &= allowed[condition.key]
+                        elif values_by_key is excluded:
+                            values |= excluded.get(condition.key, set())
+                        values_by_key[condition.key] = values
+    return allowed, excluded
+
+
+def route(query_filter: Filter | None) -> list[str] | None:
+    # Partitions a search must visit; None searches the whole collection. Only values the
+    # filters include explicitly are routed: expanding an unfiltered dimension to the values
+    # known from schema.json would miss postings with values added since, or none at all.
+    allowed, excluded = required_values(query_filter)
+    dimensions = []
+    for key in DIMENSIONS:
+        if key not in allowed:
+            return None
+        values = sorted(allowed[key] - excluded.get(key, set()))
+        # Blank values match postings in the catch-all partition
+        if not values or not all(isinstance(value, str) and value.strip() for value in values):
+            return None
+        dimensions.append(values)
+    countries, job_categories = dimensions
+    partitions = [partition_key(country, category) for country in countries for category in job_categories]
+    return partitions if len(partitions) <= settings.partition_max_fanout else None
+
+
+def with_partition(query_filter: Filter, partition: str) -> Filter:
+    condition = FieldCondition(key=PARTITIONS_FIELD, match=MatchValue(value=partition))
+    return Filter(must=[*(query_filter.must or []), condition], should=query_filter.should,
+                  must_not=query_filter.must_not)
+
+
+def merge(responses: list[QueryResponse], limit: int) -> QueryResponse:
+    # Scores are comparable across partitions (same vectors and metric); a posting found
+    # in several partitions keeps its first hit
+    seen = set()
+    points = []
+    for point in heapq.merge(*(response.points for response in responses), key=lambda p: -p.score):
+        if point.id not in seen:
+            seen.add(point.id)
+            points.append(point)
+            if len(points) == limit:
+                break
+    return QueryResponse(points=points)
+
+
+class PartitionedQdrantSearch(QdrantSearch):
+    async def knn_search(self, index_config, query) -> QueryResponse:
+        partitions = route(query.filter_)
+        if partitions is None:
+            return await super().knn_search(index_config, query)
+        if len(partitions) == 1:
+            query = dataclasses.replace(query, filter_=with_partition(query.filter_, partitions[0]))
+            return await super().knn_search(index_config, query)
+        is_exact_search = index_config.vector_field_descriptor.search_algorithm == SearchAlgorithm.FLAT
+        requests = [
+            QueryRequest(
+                query=query.vector.value,
+                using=index_config.vector_field_descriptor.field_name,
+                filter=with_partition(query.filter_, partition),
+                limit=query.limit,
+                score_threshold=query.score_treshold,
+                params=SearchParams(exact=is_exact_search),
+                with_vector=query.with_vector,
+                with_payload=query.returned_payload_fields,
+            )
+            for partition in partitions
+        ]
+        # One round trip; Qdrant runs the searches of a batch in parallel
+        responses = self._client.query_batch_points(collection_name=query.collection_name, requests=requests)
+        return merge(responses, query.limit)
+
+
+def install_partition_router() -> None:
+    # The connector builds its QdrantSearch when the vector database is created
+    if settings.partitioned_index:
+        qdrant_vdb_connector.QdrantSearch = PartitionedQdrantSearch
+
+
+def backfill(args: argparse.Namespace) -> None:
+    # Tags points ingested before PARTITIONED_INDEX was enabled, without re-embedding
+    countries_field = payload_field(job_schema.search_countries)
+    country_field = payload_field(job_schema.search_country)
+    category_field = payload_field(job_schema.job_category)
+    updated = 0
+    offset = None
+    with qdrant_client() as client:
+        while True:
+            response = client.post(f"/collections/{COLLECTION}/points/scroll", json={
+                "limit": args.batch_size,
+                "offset": offset,
+                "with_payload": [countries_field, country_field, category_field, PARTITIONS_FIELD],
+                "with_vector": False,
+            })
+            response.raise_for_status()
+            result = response.json()["result"]
+            operations = []
+            for point in result["points"]:
+                payload = point.get("payload") or {}
+                countries = payload.get(countries_field) or (
+                    [payload[country_field]] if payload.get(country_field) else []
+                )
+                partitions = point_partitions(countries, payload.get(category_field))
+                if partitions != payload.get(PARTITIONS_FIELD):
+                    operations.append({"set_payload": {"payload": {PARTITIONS_FIELD: partitions},
+                                                       "points": [point["id"]]}})
+            if operations:
+                client.post(f"/collections/{COLLECTION}/points/batch", params={"wait": "true"},
+                            json={"operations": operations}).raise_for_status()
+                updated += len(operations)
+            offset = result.get("next_page_offset")
+            if offset is None:
+                break
+    print(f"Tagged {updated} points with their partitions")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tag indexed points with their (country, category) partitions")
+    parser.add_argument("command", choices=["backfill"])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    try:
+        backfill(parser.parse_args())
+    except httpx.HTTPError as e:
+        logger.error("Partition backfill failed: %s", e)
+        raise SystemExit(1)
@@ -0,0 +1,113 @@
+import logging
+import os
+
+import httpx
+from superlinked.framework.common.schema.schema_object import String, StringList
+from superlinked.framework.common.storage_manager.storage_naming import StorageNaming
+
+from superlinked_app.config import settings
+from superlinked_app.index import index, job_schema
+
+logger = logging.getLogger(__name__)
+
+# Superlinked stores every app in the Qdrant collection named after APP_ID
+COLLECTION = os.getenv("APP_ID", "default")
+TIMEOUT = httpx.Timeout(30.0, read=None, write=None)
+
+_tuned = False
+
+
+def qdrant_client() -> httpx.Client:
+    headers = {"api-key": settings.qdrant_api_key} if settings.qdrant_api_key else {}
+    return httpx.Client(base_url=settings.qdrant_url, headers=headers, timeout=TIMEOUT)
+
+
+def collection_info(client: httpx.Client) -> dict | None:
+    # None when the collection does not exist yet
+    response = client.get(f"/collections/{COLLECTION}")
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return response.json()["result"]
+
+
+def keyword_payload_fields() -> list[str]:
+    # Qdrant payload keys of the index's filter fields (index.fields in index.py)
+    return [
+        StorageNaming.generate_field_name_from_schema_field(field)
+        for field in index._fields
+        if isinstance(field, (String, StringList))
+    ]
+
+
+def payload_index_schema(field_name: str) -> dict:
+    # The partitions field (superlinked_app/partitions.py) is a tenant index, so Qdrant
+    # stores the points of each partition together
+    if settings.partitioned_index and field_name == StorageNaming.generate_field_name_from_schema_field(
+        job_schema.partitions
+    ):
+        return {"type": "keyword", "is_tenant": True}
+    return {"type": "keyword"}
+
+
+def quantization_config() -> dict | None:
+    if not settings.qdrant_quantization:
+        return None
+    # int8 copies stay in RAM for scoring; the top candidates are rescored with the originals
+    return {"scalar": {"type": "int8", "quantile": settings.qdrant_quantization_quantile, "always_ram": True}}
+
+
+# Collection tuning on top of what Superlinked creates. Superlinked only adds payload
+# indexes with INIT_SEARCH_INDICES, and restored or older collections can miss newer
+# fields, so every filter field gets a keyword index here; without one each filtered
+# search scans payloads. With PARTITIONED_INDEX the partitions field gets a tenant
+# index. HNSW and quantization are collection-level settings, which leave the
+# per-vector params Superlinked checks at startup untouched.
+def tune_collection(client: httpx.Client) -> bool:
+    # Returns False when the collection does not exist yet
+    info = collection_info(client)
+    if info is None:
+        return False
+    existing = info.get("payload_schema") or {}
+    for field_name in keyword_payload_fields():
+        schema = payload_index_schema(field_name)
+        current = existing.get(field_name)
+        if current is None or bool((current.get("params") or {}).get("is_tenant")) != bool(schema.get("is_tenant")):
+            response = client.put(
+                f"/collections/{COLLECTION}/index",
+                params={"wait": "true"},
+                json={"field_name": field_name, "field_schema": schema},
+            )
+            response.raise_for_status()
+            logger.info("Created keyword payload index %s", field_name)
+
+    config = info["config"]
+    update = {}
+    hnsw = {"m": settings.qdrant_hnsw_m, "ef_construct": settings.qdrant_hnsw_ef_construct}
+    if any(config.get("hnsw_config", {}).get(key) != value for key, value in hnsw.items()):
+        update["hnsw_config"] = hnsw
+    quantization = quantization_config()
+    if quantization != config.get("quantization_config"):
+        update["quantization_config"] = quantization or "Disabled"
+    if update:
+        # Qdrant rebuilds the affected segments in the background
+        client.patch(f"/collections/{COLLECTION}", json=update).raise_for_status()
+        logger.info("Updated collection %s: %s", COLLECTION, update)
+    return True
+
+
+def tune_qdrant_collection() -> None:
+    # Runs at startup and again before the first ingest, since on a fresh
+    # deployment Superlinked creates the collection after this module is loaded
+    global _tuned
+    if _tuned or not settings.qdrant_tune_collection:
+        return
+    try:
+        with qdrant_client() as client:
+            _tuned = tune_collection(client)
+    except httpx.HTTPError as e:
+        logger.error("Qdrant collection tuning failed: %s", e)
+
+
+def is_tuned() -> bool:
+    return _tuned or not settings.qdrant_tune_collection
@@ -5,6 +5,7 @@ from superlinked_app.index import (
     description_space,
     index,
     job_schema,
+    skills_space,
     title_space,
 )
 from superlinked_app.nlq import (
@@ -16,14 +17,33 @@ from superlinked_app.nlq import (
     title_description,
 )
 
+
+def with_skills(weights: dict, default: float) -> dict:
+    # The skills space is left out of the index when there is no skills vocabulary
+    if skills_space is None:
+        return weights
+    return {**weights, skills_space: sl.Param("skills_weight", default=default)}
+
+
+def similar_skills(query, default: float):
+    # Jobs sharing more of the requested skills rank higher, in the same kNN pass
+    if skills_space is None:
+        return query
+    return query.similar(
+        skills_space.category,
+        sl.Param("skills", description=skills_description),
+        weight=sl.Param("similar_skills_weight", default=default),
+    )
+
+
 # Let's define a main query that will be used for multi-modal semantic search:
 query = (
     sl.Query(
         index,
-        weights={
+        weights=with_skills({
             description_space: sl.Param("description_weight", default=0.8),
             title_space: sl.Param("title_weight", default=1.0),
-        },
+        }, default=0.9),
     )
     .find(job_schema)
     .similar(
@@ -38,6 +58,8 @@ query = (
     )
 )
 
+query = similar_skills(query, default=0.9)
+
 # We can specify number of retrieved results like this:
 query = query.limit(sl.Param("limit", default=10))
 
@@ -63,10 +85,10 @@ query = query.with_natural_query(
 cv_query = (
     sl.Query(
         index,
-        weights={
+        weights=with_skills({
             description_space: sl.Param("description_weight", default=0.9),
             title_space: sl.Param("title_weight", default=0.8),
-        },
+        }, default=0.9),
     )
     .find(job_schema)
     .similar(
@@ -81,6 +103,8 @@ cv_query = (
     )
 )
 
+cv_query = similar_skills(cv_query, default=0.9)
+
 # We can specify number of retrieved results like this:
 cv_query = cv_query.limit(sl.Param("limit", default=10))
 
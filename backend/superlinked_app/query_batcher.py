@@ -0,0 +1,101 @@
+import asyncio
+import logging
+
+from superlinked.framework.common.delayed_evaluator import DelayedEvaluator
+from superlinked.framework.common.space.embedding.model_based.singleton_embedding_engine_manager import (
+    SingletonEmbeddingEngineManager,
+)
+from superlinked.framework.common.util.singleton_meta import SingletonMeta
+
+from superlinked_app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Query-time embedding batching. Superlinked already micro-batches every embed call
+# through a DelayedEvaluator per engine (BATCHED_EMBEDDING_WAIT_TIME_MS, 5 ms). For
+# query texts this adds three things on top of it:
+# - texts repeated within a batch (popular titles, the same CV searched twice) are
+#   encoded once
+# - a batch is encoded as soon as query_batch_max_items texts are pending, instead of
+#   always waiting out the window
+# - queries get their own evaluator per engine. Superlinked only separates them for
+#   models with a query prompt, so otherwise a search waits behind ingestion chunks.
+def deduplicated(eval_fn):
+    async def evaluate(inputs) -> list:
+        unique = list(dict.fromkeys(inputs))
+        by_input = dict(zip(unique, await eval_fn(unique)))
+        return [by_input[input_] for input_ in inputs]
+
+    return evaluate
+
+
+class QueryDelayedEvaluator(DelayedEvaluator):
+    def __init__(self, delay_ms: float, eval_fn, max_items: int, task_name: str | None = None) -> None:
+        super().__init__(delay_ms, deduplicated(eval_fn), task_name)
+        self._max_items = max_items
+        self._batch_full = asyncio.Event()
+
+    async def evaluate(self, inputs) -> list:
+        if self._delay_ms > 0 and sum(len(r.inputs) for r in self._pending_requests) + len(inputs) >= self._max_items:
+            self._batch_full.set()
+        return await super().evaluate(inputs)
+
+    async def _process_batch_after_delay(self) -> None:
+        # DelayedEvaluator's batch task, with a wait that ends early once the batch is full
+        try:
+            await asyncio.wait_for(self._batch_full.wait(), self._delay_ms / 1000)
+        except asyncio.TimeoutError:
+            pass
+        self._batch_full.clear()
+        async with self._lock:
+            if not self._pending_requests:
+                return
+            requests = self._pending_requests.copy()
+            self._pending_requests.clear()
+        try:
+            await self._process_batch_requests(requests)
+        except Exception as e:
+            for request in requests:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            raise
+        await self._handle_when_other_request_arrived_during_sleep()
+
+
+class BatchingEmbeddingEngineManager(SingletonEmbeddingEngineManager):
+    def __init__(self) -> None:
+        super().__init__()
+        self._key_to_query_evaluator: dict[str, QueryDelayedEvaluator] = {}
+
+    def _create_delayed_evaluators(self, engine, engine_key: str) -> None:
+        super()._create_delayed_evaluators(engine, engine_key)
+        self._key_to_query_evaluator[engine_key] = QueryDelayedEvaluator(
+            settings.query_batch_window_ms,
+            self._create_engine_embed_fn(engine, True),
+            settings.query_batch_max_items,
+            task_name=f"{engine._model_name} query embed",
+        )
+
+    def _get_delayed_evaluator(self, engine, is_query_context: bool) -> DelayedEvaluator:
+        # The engine picks the query prompt itself, so prompt-less models embed the same either way
+        if is_query_context and (evaluator := self._key_to_query_evaluator.get(engine.key)) is not None:
+            return evaluator
+        return super()._get_delayed_evaluator(engine, is_query_context)
+
+
+def install_query_batcher() -> None:
+    # Text spaces get their engine manager by calling SingletonEmbeddingEngineManager(),
+    # and SingletonMeta keys instances by class with no way to register a subclass, so the
+    # batching manager is stored under that key. It must happen before any space is built
+    # (index.py installs it first); a manager that already exists is left in place.
+    if settings.query_batch_window_ms <= 0:
+        return
+    # Built outside SingletonMeta.__call__, which takes SingletonMeta._lock itself (not reentrant)
+    manager = object.__new__(BatchingEmbeddingEngineManager)
+    manager.__init__()
+    with SingletonMeta._lock:
+        if SingletonEmbeddingEngineManager in SingletonMeta._instances:
+            logger.warning("Embedding engine manager already created; query batching is not installed")
+            return
+        SingletonMeta._instances[SingletonEmbeddingEngineManager] = manager
@@ -0,0 +1,140 @@
+import argparse
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import time
+from importlib.metadata import version
+
+import httpx
+
+from superlinked_app.config import settings
+from superlinked_app.generation import index_generation
+from superlinked_app.index import index, job_schema
+from superlinked_app.qdrant import COLLECTION, collection_info, qdrant_client
+
+logger = logging.getLogger(__name__)
+
+
+# Bundled index snapshot - a native Qdrant snapshot of the populated collection
+# (vectors, payloads and HNSW graph) plus a manifest stamped with the fingerprint
+# of the index definition that produced it. Restoring it into an empty Qdrant is a
+# bulk file load instead of re-embedding the whole dataset.
+def index_fingerprint() -> str:
+    # Changes whenever the stored vectors or payloads would: the index node id
+    # covers the spaces and their embedding models, plus indexed and schema fields
+    definition = {
+        "index_node": index._node_id,
+        "embedder": settings.text_embedder_name,
+        "fields": sorted(field.name for field in index._fields),
+        "schema": sorted(f"{field.name}:{type(field).__name__}" for field in job_schema.schema_fields),
+    }
+    return hashlib.sha256(json.dumps(definition, sort_keys=True).encode()).hexdigest()
+
+
+def snapshot_path() -> str:
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(current_dir, '..', settings.path_index_snapshot)
+
+
+def points_count(client: httpx.Client) -> int | None:
+    # None when the collection does not exist yet
+    info = collection_info(client)
+    return None if info is None else info["points_count"] or 0
+
+
+def export_snapshot(path: str) -> dict:
+    with qdrant_client() as client:
+        points = points_count(client)
+        if not points:
+            raise RuntimeError(f"Collection '{COLLECTION}' is empty; load the data before exporting it")
+        response = client.post(f"/collections/{COLLECTION}/snapshots", params={"wait": "true"})
+        response.raise_for_status()
+        description = response.json()["result"]
+        name = description["name"]
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            sha256 = hashlib.sha256()
+            with client.stream("GET", f"/collections/{COLLECTION}/snapshots/{name}") as download, open(tmp_path, "wb") as f:
+                download.raise_for_status()
+                for block in download.iter_bytes(1 << 20):
+                    sha256.update(block)
+                    f.write(block)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            client.delete(f"/collections/{COLLECTION}/snapshots/{name}", params={"wait": "true"})
+
+    manifest = {
+        "fingerprint": index_fingerprint(),
+        "collection": COLLECTION,
+        "points": points,
+        "sha256": sha256.hexdigest(),
+        "superlinked": version("superlinked"),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    with open(path + ".json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def restore_snapshot(path: str) -> bool:
+    # Loads the snapshot when the collection is missing or empty and the manifest
+    # matches the current index definition; returns whether it was restored
+    try:
+        with open(path + ".json", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except OSError:
+        return False
+    if manifest.get("fingerprint") != index_fingerprint():
+        logger.warning("Index snapshot %s was exported from a different index definition; not restoring it", path)
+        return False
+
+    # Server workers start together; the first one restores, the others find the collection filled
+    lock_path = os.path.join(os.path.dirname(index_generation.path), "snapshot_restore.lock")
+    with open(lock_path, "w") as lock, qdrant_client() as client:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if points_count(client):
+            return False
+        start = time.perf_counter()
+        with open(path, "rb") as f:
+            response = client.post(
+                f"/collections/{COLLECTION}/snapshots/upload",
+                params={"priority": "snapshot", "checksum": manifest["sha256"], "wait": "true"},
+                files={"snapshot": (os.path.basename(path), f, "application/octet-stream")},
+            )
+        response.raise_for_status()
+        restored = points_count(client)
+    if restored != manifest["points"]:
+        logger.error("Index snapshot restored %s points, manifest lists %s", restored, manifest["points"])
+    logger.info("Restored %s points from %s in %.1fs", restored, path, time.perf_counter() - start)
+    # Results cached against an empty index must not be served
+    index_generation.bump()
+    return True
+
+
+def restore_bundled_snapshot() -> None:
+    if not settings.path_index_snapshot or not os.path.exists(snapshot_path()):
+        return
+    try:
+        restore_snapshot(snapshot_path())
+    except (OSError, httpx.HTTPError) as e:
+        # Serving still works; the collection is then filled by the data loader as before
+        logger.error("Index snapshot restore failed: %s", e)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export or restore the bundled Qdrant snapshot of the job index.")
+    parser.add_argument("command", choices=["export", "restore", "fingerprint"])
+    parser.add_argument("--path", default=None, help="Snapshot file (default: settings.path_index_snapshot)")
+    args = parser.parse_args()
+    path = args.path or snapshot_path()
+    if args.command == "export":
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        print(json.dumps(export_snapshot(path), indent=2))
+    elif args.command == "restore":
+        print("restored" if restore_snapshot(path) else "not restored (collection not empty, or no matching snapshot)")
+    else:
+        print(index_fingerprint())
@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("superlinked")
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_fresh(code: str) -> subprocess.CompletedProcess:
+    # A fresh interpreter, so no embedding engine manager exists yet; a deadlock fails on the timeout
+    env = {**os.environ, "QUERY_BATCH_WINDOW_MS": "5"}
+    try:
+        return subprocess.run(
+            [sys.executable, "-c", code], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=60
+        )
+    except subprocess.TimeoutExpired:
+        pytest.fail("install_query_batcher did not return (SingletonMeta lock deadlock?)")
+
+
+def test_install_registers_batching_manager():
+    result = run_fresh(
+        "from superlinked.framework.common.space.embedding.model_based.singleton_embedding_engine_manager "
+        "import SingletonEmbeddingEngineManager\n"
+        "from superlinked_app.query_batcher import BatchingEmbeddingEngineManager, install_query_batcher\n"
+        "install_query_batcher()\n"
+        "assert isinstance(SingletonEmbeddingEngineManager(), BatchingEmbeddingEngineManager)\n"
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_install_keeps_existing_manager():
+    result = run_fresh(
+        "from superlinked.framework.common.space.embedding.model_based.singleton_embedding_engine_manager "
+        "import SingletonEmbeddingEngineManager\n"
+        "from superlinked_app.query_batcher import BatchingEmbeddingEngineManager, install_query_batcher\n"
+        "existing = SingletonEmbeddingEngineManager()\n"
+        "install_query_batcher()\n"
+        "assert SingletonEmbeddingEngineManager() is existing\n"
+        "assert not isinstance(existing, BatchingEmbeddingEngineManager)\n"
+    )
+    assert result.returncode == 0, result.stderr